@@ -0,0 +1,140 @@
+"""Benchmark checkpoint throughput of the available checkpointers.
+
+Runs a 15-step linear graph (one message appended per step, like an agent
+hop) repeatedly against MemorySaver and the SQLite backend with and without
+batched commits and compact serialization, and reports runs/s, mean cost per
+checkpointed step and, for SQLite, bytes stored per run.
+
+Usage:
+    uv run python benchmarks/checkpoint_throughput.py [--runs 50] [--json out.json]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Annotated, Any, TypedDict
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage  # noqa: E402
+from langgraph.checkpoint.memory import MemorySaver  # noqa: E402
+from langgraph.graph import END, START, StateGraph  # noqa: E402
+from langgraph.graph.message import add_messages  # noqa: E402
+
+STEPS = 15
+PAYLOAD = "x" * 1024
+# Stand-in for the static project registry/context carried in state
+PROJECT_CONTEXT = {
+    "info": {"name": "bench", "conventions": [f"convention {i}" for i in range(50)]},
+    "examples": {"developer": [{"input": f"example {i}", "output": PAYLOAD} for i in range(8)]},
+}
+
+
+class BenchState(TypedDict):
+    """State shaped like MultiProjectState's hot fields."""
+
+    messages: Annotated[list[AnyMessage], add_messages]
+    next_agent: str
+    project_context: dict[str, Any]
+
+
+def build_linear_graph(checkpointer: Any, steps: int = STEPS) -> Any:
+    """Build a graph of `steps` nodes that each append one message."""
+    workflow = StateGraph(BenchState)
+    names = [f"step_{i}" for i in range(steps)]
+    for name in names:
+        workflow.add_node(
+            name,
+            lambda state, name=name: {
+                "messages": [AIMessage(content=f"{name}: {PAYLOAD}")],
+                "next_agent": name,
+            },
+        )
+    workflow.add_edge(START, names[0])
+    for current, following in zip(names, names[1:], strict=False):
+        workflow.add_edge(current, following)
+    workflow.add_edge(names[-1], END)
+    return workflow.compile(checkpointer=checkpointer)
+
+
+def run_benchmark(
+    name: str, checkpointer: Any, runs: int, db_path: Path | None = None
+) -> dict[str, Any]:
+    """Time `runs` complete 15-step executions, each in its own thread."""
+    graph = build_linear_graph(checkpointer)
+    flush = getattr(checkpointer, "flush", lambda: None)
+    initial_state = {
+        "messages": [HumanMessage(content="task")],
+        "next_agent": "",
+        "project_context": PROJECT_CONTEXT,
+    }
+
+    start = time.perf_counter()
+    for i in range(runs):
+        config = {"configurable": {"thread_id": f"bench_{i}"}}
+        graph.invoke(initial_state, config)
+        flush()
+    elapsed = time.perf_counter() - start
+
+    stored_kb_per_run = None
+    if db_path is not None:
+        checkpointer.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        stored_kb_per_run = round(db_path.stat().st_size / runs / 1024, 1)
+
+    return {
+        "backend": name,
+        "runs": runs,
+        "steps": STEPS,
+        "seconds": round(elapsed, 4),
+        "runs_per_sec": round(runs / elapsed, 2),
+        "ms_per_step": round(elapsed / (runs * STEPS) * 1000, 3),
+        "stored_kb_per_run": stored_kb_per_run,
+    }
+
+
+def main() -> int:
+    """Run the benchmark and print a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=50, help="15-step runs per backend")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = [run_benchmark("memory", MemorySaver(), args.runs)]
+
+    try:
+        from src.graph.sqlite_saver import BatchedSqliteSaver
+    except ImportError:
+        print("langgraph-checkpoint-sqlite not installed; skipping SQLite backends")
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            variants = (
+                ("sqlite (commit per write)", 1, False),
+                ("sqlite (batched)", 32, False),
+                ("sqlite (batched, compact)", 32, True),
+            )
+            for label, batch_size, compact in variants:
+                db_path = Path(tmp) / f"batch{batch_size}_{compact}.db"
+                saver = BatchedSqliteSaver.from_path(
+                    db_path, batch_size=batch_size, flush_interval=60, compact=compact
+                )
+                results.append(run_benchmark(label, saver, args.runs, db_path))
+                saver.conn.close()
+
+    print(f"{'backend':<30}{'runs/s':>10}{'ms/step':>10}{'KB/run':>10}")
+    for result in results:
+        stored = result["stored_kb_per_run"] if result["stored_kb_per_run"] is not None else "-"
+        print(
+            f"{result['backend']:<30}{result['runs_per_sec']:>10}"
+            f"{result['ms_per_step']:>10}{stored:>10}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
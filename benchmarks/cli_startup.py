@@ -0,0 +1,116 @@
+"""Benchmark CLI cold-start time.
+
+Runs `python -X importtime -m src.main` for a few argument sets in fresh
+interpreters and reports median wall time, total import time and the
+slowest top-level imports. Every run is a new process, so module imports are
+cold; the OS page cache stays warm after the first run.
+
+Usage:
+    uv run python benchmarks/cli_startup.py [--runs 5] [--top 8] [--json out.json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).parent.parent
+
+# Argument sets that must not pay for LangGraph/LangChain/Anthropic imports
+SCENARIOS = {
+    "--help": ["--help"],
+    "--list-projects": ["--list-projects"],
+    "bad argument": ["--no-such-flag"],
+}
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """Parse `-X importtime` output.
+
+    Args:
+        stderr: Captured stderr of the interpreter
+
+    Returns:
+        List of (module, cumulative microseconds, nesting level)
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), int(cumulative_us), level))
+    return imports
+
+
+def run_scenario(label: str, argv: list[str], runs: int, top: int) -> dict[str, Any]:
+    """Start the CLI `runs` times and summarize.
+
+    Args:
+        label: Scenario name
+        argv: CLI arguments
+        runs: Number of fresh interpreters to start
+        top: Number of slowest top-level imports to report
+
+    Returns:
+        Result summary
+    """
+    wall_ms = []
+    imports: list[tuple[str, int, int]] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", "src.main", *argv],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        )
+        wall_ms.append((time.perf_counter() - start) * 1000)
+        imports = parse_importtime(proc.stderr)
+
+    # Top-level imports of the last run; their cumulative times include children
+    top_level = sorted((i for i in imports if i[2] == 0), key=lambda i: i[1], reverse=True)
+    return {
+        "scenario": label,
+        "median_ms": round(statistics.median(wall_ms), 1),
+        "import_ms": round(sum(i[1] for i in top_level) / 1000, 1),
+        "heavy_imports": sorted(
+            {i[0].split(".")[0] for i in imports} & {"langgraph", "langchain_core", "anthropic"}
+        ),
+        "slowest": [(name, round(us / 1000, 1)) for name, us, _level in top_level[:top]],
+    }
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Interpreter starts per scenario")
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports to list")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = [run_scenario(label, argv, args.runs, args.top) for label, argv in SCENARIOS.items()]
+
+    print(f"{'scenario':<20}{'median ms':>12}{'import ms':>12}  heavy imports")
+    for result in results:
+        heavy = ", ".join(result["heavy_imports"]) or "-"
+        print(
+            f"{result['scenario']:<20}{result['median_ms']:>12}"
+            f"{result['import_ms']:>12}  {heavy}"
+        )
+    for result in results:
+        print(f"\nSlowest imports ({result['scenario']}):")
+        for name, ms in result["slowest"]:
+            print(f"  {ms:>8} ms  {name}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Scripted chat models for offline graph benchmarks.
+
+Each agent role gets a script of responses that is played back in order
+(the last one repeats), so a task takes the same route through the graph
+on every run. Responses are plain text or messages with canned tool calls,
+and every call sleeps for a fixed latency standing in for the network.
+Token usage is derived from message lengths, so budgets and metrics see
+deterministic numbers.
+"""
+
+import threading
+import time
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+# A scripted response: text, or a dict with 'content' and 'tool_calls'
+Response = str | dict[str, Any]
+
+
+def _text_length(message: BaseMessage) -> int:
+    content = message.content
+    if isinstance(content, str):
+        return len(content)
+    return sum(len(str(part)) for part in content)
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model playing back a script of responses after a fixed latency."""
+
+    role: str
+    script: list[Response]
+    latency: float = 0.0
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _calls: int = PrivateAttr(default=0)
+    _spans: list[tuple[float, float]] | None = PrivateAttr(default=None)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    @property
+    def calls(self) -> int:
+        """Number of calls made so far."""
+        return self._calls
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "ScriptedChatModel":
+        return self
+
+    def _next(self) -> Response:
+        with self._lock:
+            response = self.script[min(self._calls, len(self.script) - 1)]
+            self._calls += 1
+        return response
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        start = time.perf_counter()
+        response = self._next()
+        if self.latency:
+            time.sleep(self.latency)
+        if isinstance(response, str):
+            response = {"content": response}
+
+        content = response.get("content", "")
+        input_tokens = sum(_text_length(m) for m in messages) // 4
+        output_tokens = max(len(content) // 4, 1)
+        message = AIMessage(
+            content=content,
+            tool_calls=response.get("tool_calls", []),
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        )
+        if self._spans is not None:
+            self._spans.append((start, time.perf_counter()))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class ScriptedLLMClient:
+    """Stand-in for LLMClient handing each role its scripted model.
+
+    Scripts start over with every client, so create one per task.
+    """
+
+    def __init__(self, scripts: dict[str, list[Response]], latency: float = 0.0) -> None:
+        """Initialize scripted client.
+
+        Args:
+            scripts: Responses by agent role; roles without a script answer 'end'
+            latency: Seconds each model call takes
+        """
+        self.spans: list[tuple[float, float]] = []
+        self.models: dict[str, ScriptedChatModel] = {}
+        for role, script in scripts.items():
+            model = ScriptedChatModel(role=role, script=script, latency=latency)
+            model._spans = self.spans
+            self.models[role] = model
+        self.default = ScriptedChatModel(role="default", script=["end"], latency=latency)
+        self.default._spans = self.spans
+
+    def get_chat_model(self, role: str | None = None, overrides: Any = None) -> ScriptedChatModel:
+        """Get the scripted model of a role (the default model without one)."""
+        return self.models.get(role or "", self.default)
+
+    def role_models(self, models: Any = None) -> dict[str, str]:
+        """Get the model each scripted role resolves to."""
+        return {role: f"scripted-{role}" for role in self.models}
+
+    def calls(self) -> int:
+        """Number of model calls made through this client."""
+        return self.default.calls + sum(model.calls for model in self.models.values())
+
+    def model_seconds(self) -> float:
+        """Wall-clock seconds during which at least one model call was in flight."""
+        busy = 0.0
+        end = float("-inf")
+        for span_start, span_end in sorted(self.spans):
+            if span_end <= end:
+                continue
+            busy += span_end - max(span_start, end)
+            end = span_end
+        return busy
+
+
+def write_file_call(path: str, content: str, project_path: str, call_id: str) -> dict[str, Any]:
+    """Build a canned write_file tool call.
+
+    Args:
+        path: Project-relative file path
+        content: File content
+        project_path: Project root
+        call_id: Tool call ID
+
+    Returns:
+        Tool call dict for an AIMessage
+    """
+    return {
+        "name": "write_file",
+        "args": {"file_path": path, "content": content, "project_path": project_path},
+        "id": call_id,
+        "type": "tool_call",
+    }
@@ -0,0 +1,112 @@
+"""Benchmark graph compilation against per-task overhead.
+
+Compares building and compiling the workflow for every task with reusing
+the cached compiled graph. Each task runs the real workflow with a fake LLM
+that routes straight to the end, so timings cover LangGraph overhead
+(state setup, one supervisor step, checkpointing) and not model latency.
+
+Usage:
+    uv run python benchmarks/graph_compile.py [--tasks 200] [--json out.json]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel  # noqa: E402
+from langchain_core.messages import HumanMessage  # noqa: E402
+from langgraph.checkpoint.memory import MemorySaver  # noqa: E402
+
+from src.config.context import ProjectContextStore  # noqa: E402
+from src.graph.builder import build_graph, clear_graph_cache, create_graph  # noqa: E402
+
+
+def run_task(graph: Any, store: ProjectContextStore, ref: str, index: int) -> None:
+    """Run one task that the supervisor ends immediately."""
+    config = {
+        "configurable": {
+            "llm": FakeListChatModel(responses=["end"]),
+            "tools": [],
+            "project_contexts": store,
+            "thread_id": f"bench-{index}",
+        }
+    }
+    state = {
+        "messages": [HumanMessage(content="benchmark task")],
+        "current_project": "bench",
+        "project_ref": ref,
+        "next_agent": "",
+        "task": "benchmark task",
+    }
+    graph.invoke(state, config)
+
+
+def timed(fn: Any, count: int) -> list[float]:
+    """Call fn(index) count times and return per-call milliseconds."""
+    samples = []
+    for index in range(count):
+        start = time.perf_counter()
+        fn(index)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(label: str, samples: list[float]) -> dict[str, Any]:
+    """Summarize per-call timings."""
+    return {
+        "case": label,
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(sorted(samples)[int(len(samples) * 0.95) - 1], 3),
+    }
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=200, help="Tasks per case")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    store = ProjectContextStore()
+    info = {"name": "bench", "type": "python", "description": "Benchmark project"}
+    ref = store.put("bench", {"info": info, "examples": {}})  # type: ignore[typeddict-item]
+    saver = MemorySaver()
+
+    # Warm imports and LangGraph internals before timing
+    run_task(build_graph(saver), store, ref, -1)
+    clear_graph_cache()
+
+    results = [
+        summarize("compile only", timed(lambda _i: build_graph(saver), args.tasks)),
+        summarize("cached lookup", timed(lambda _i: create_graph(saver), args.tasks)),
+        summarize(
+            "task, compile each time",
+            timed(lambda i: run_task(build_graph(saver), store, ref, i), args.tasks),
+        ),
+        summarize(
+            "task, cached graph",
+            timed(lambda i: run_task(create_graph(saver), store, ref, i), args.tasks),
+        ),
+    ]
+
+    print(f"{'case':<28}{'mean ms':>10}{'median ms':>12}{'p95 ms':>10}")
+    for result in results:
+        print(
+            f"{result['case']:<28}{result['mean_ms']:>10}"
+            f"{result['median_ms']:>12}{result['p95_ms']:>10}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
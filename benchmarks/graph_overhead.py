@@ -0,0 +1,422 @@
+"""Benchmark graph overhead per hop with scripted models, offline.
+
+Runs complete tasks through build_graph and stream_task with every agent
+role answering from a fixed script (benchmarks/fake_llm.py), so each run
+takes the same route and the only time spent outside the graph is the
+configured model latency. Scenarios:
+
+    review-loop   supervisor -> architect -> developer (canned write_file
+                  call) -> reviewer -> developer -> tester -> end
+    plan-fanout   the architect returns a plan block; one developer worker
+                  per file, then merge -> end
+
+each under the default and parallel topologies, on MemorySaver and SQLite
+checkpointers, over synthetic projects of increasing size (source files,
+conventions and examples). Per case it reports task time, framework
+overhead per hop (wall time with no model call in flight), checkpoint write
+time per hop and peak traced memory per task. Tool latency is measured
+separately by invoking the file tools on each synthetic project, since the
+graph binds tools but does not execute them.
+
+Usage:
+    uv run python benchmarks/graph_overhead.py [--runs 10] [--latency-ms 0]
+        [--sizes small,medium,large] [--json out.json] [--baseline old.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+# Fixed behavior: nothing speculative, hedged, traced or profiled
+for _name in ("SPECULATIVE_ROUTING", "LLM_HEDGE", "TRACE", "PROFILE", "METRICS_FILE"):
+    os.environ.pop(_name, None)
+
+from fake_llm import Response, ScriptedLLMClient, write_file_call  # noqa: E402
+
+from src import metrics as metrics_module  # noqa: E402
+from src.config.projects import ProjectRegistry  # noqa: E402
+from src.graph.builder import build_graph, get_all_tools  # noqa: E402
+from src.graph.checkpointer import create_checkpointer  # noqa: E402
+from src.metrics import MetricsRegistry  # noqa: E402
+from src.runner import stream_task  # noqa: E402
+
+PROJECT = "bench"
+
+# name -> (source files, conventions, examples per task type)
+SIZES: dict[str, tuple[int, int, int]] = {
+    "small": (20, 5, 2),
+    "medium": (200, 40, 10),
+    "large": (1000, 200, 40),
+}
+
+TOPOLOGIES = ("default", "parallel")
+
+PLAN_FILES = ("app/api.py", "app/models.py", "app/service.py", "tests/test_api.py")
+
+CHECKPOINT_WRITE = "langgraphx_checkpoint_write_duration_seconds"
+
+
+def _module_source(index: int) -> str:
+    lines = [f'"""Synthetic module {index}."""', ""]
+    for fn in range(12):
+        lines += [
+            f"def handler_{index}_{fn}(value: int) -> int:",
+            f'    """Handle case {fn}."""',
+            f"    return value * {fn + 1} + {index}",
+            "",
+        ]
+    if index % 10 == 0:
+        lines.append("# TODO: split this module")
+    return "\n".join(lines) + "\n"
+
+
+def make_project(root: Path, size: str) -> tuple[Path, Path]:
+    """Write a synthetic project checkout and its config.
+
+    Args:
+        root: Directory to create the project in
+        size: Key of SIZES
+
+    Returns:
+        Projects directory (for ProjectRegistry) and source checkout
+    """
+    files, conventions, examples = SIZES[size]
+    source = root / f"{size}_src"
+    for index in range(files):
+        module = source / "pkg" / f"sub{index // 50}" / f"module_{index}.py"
+        module.parent.mkdir(parents=True, exist_ok=True)
+        module.write_text(_module_source(index))
+
+    project_dir = root / f"{size}_projects" / PROJECT
+    project_dir.mkdir(parents=True)
+    config = {
+        "name": PROJECT,
+        "type": "python",
+        "description": f"Synthetic {size} project for benchmarks",
+        "path": str(source),
+        "tech_stack": {"language": "python", "version": "3.11"},
+        "tools": {"test": "pytest", "lint": "ruff"},
+        "conventions": [f"Convention {i}: keep handlers pure" for i in range(conventions)],
+        "coding_standards": {"line_length": 100},
+        "test_framework": "pytest",
+        "coverage_target": 80,
+    }
+    (project_dir / "config.yaml").write_text(yaml.safe_dump(config))
+    example_list = [
+        {"input": f"Add handler {i}", "output": _module_source(i)[:400]} for i in range(examples)
+    ]
+    task_types = ("implement_feature", "fix_bug")
+    (project_dir / "examples.yaml").write_text(
+        yaml.safe_dump({"developer": dict.fromkeys(task_types, example_list)})
+    )
+    return project_dir.parent, source
+
+
+def scenario_scripts(scenario: str, source: Path) -> dict[str, list[Response]]:
+    """Get the per-role scripts of a scenario.
+
+    Args:
+        scenario: 'review-loop' or 'plan-fanout'
+        source: Project checkout the canned tool calls write into
+
+    Returns:
+        Responses by agent role
+    """
+    change = {
+        "content": "Implemented the handler.",
+        "tool_calls": [
+            write_file_call("pkg/feature.py", _module_source(0), str(source), "call_write")
+        ],
+    }
+    if scenario == "review-loop":
+        return {
+            "supervisor": ["architect", "developer", "reviewer", "developer", "tester", "end"],
+            "architect": ["Add pkg/feature.py with a pure handler and a unit test."],
+            "developer": [change],
+            "reviewer": ["Looks good. Approved."],
+            "tester": ["All tests pass."],
+        }
+    if scenario == "plan-fanout":
+        plan = [{"file": path, "instructions": f"Implement {path}"} for path in PLAN_FILES]
+        return {
+            "supervisor": ["architect", "developer", "end"],
+            "architect": [f"Four independent files.\n```plan\n{json.dumps(plan)}\n```"],
+            "developer": [change],
+        }
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Mean, median and p95 of millisecond samples."""
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))]
+    return {
+        "mean_ms": round(statistics.mean(ordered), 3),
+        "median_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(p95, 3),
+    }
+
+
+def _checkpoint_seconds(metrics: MetricsRegistry) -> tuple[float, float]:
+    ops = ("put", "put_writes")
+    return (
+        sum(metrics.total(CHECKPOINT_WRITE, op=op) for op in ops),
+        sum(metrics.value(CHECKPOINT_WRITE, op=op) for op in ops),
+    )
+
+
+def run_task(
+    graph: Any,
+    registry: ProjectRegistry,
+    scripts: dict[str, list[Response]],
+    latency: float,
+    tools: list[Any],
+) -> tuple[float, int, ScriptedLLMClient]:
+    """Run one task to completion.
+
+    Returns:
+        Wall-clock seconds, hops (node events) and the task's scripted client
+
+    Raises:
+        RuntimeError: If the task did not finish with a 'done' event
+    """
+    client = ScriptedLLMClient(scripts, latency)
+    start = time.perf_counter()
+    events = list(
+        stream_task(
+            "Add a handler",
+            PROJECT,
+            registry=registry,
+            graph=graph,
+            llm_client=client,  # type: ignore[arg-type]
+            tools=tools,
+        )
+    )
+    elapsed = time.perf_counter() - start
+    if events[-1]["event"] != "done":
+        raise RuntimeError(f"Task ended with {events[-1]}")
+    return elapsed, sum(1 for e in events if e["event"] == "node"), client
+
+
+def run_case(
+    scenario: str,
+    topology: str,
+    backend: str,
+    size: str,
+    projects: Path,
+    source: Path,
+    args: argparse.Namespace,
+    tmp: Path,
+) -> dict[str, Any]:
+    """Benchmark one scenario/topology/backend/size combination."""
+    metrics = metrics_module.get_metrics()
+    os.environ["CHECKPOINT_BACKEND"] = backend
+    os.environ["CHECKPOINT_SQLITE_PATH"] = str(tmp / f"{scenario}-{topology}-{size}.db")
+    graph = build_graph(create_checkpointer(), topology=topology)
+    registry = ProjectRegistry(projects, use_cache=False)
+    scripts = scenario_scripts(scenario, source)
+    latency = args.latency_ms / 1000
+    tools = get_all_tools()
+
+    # Warm up imports, prompt caches and the checkpoint database
+    run_task(graph, registry, scripts, latency, tools)
+
+    task_ms: list[float] = []
+    overhead_ms: list[float] = []
+    checkpoint_ms: list[float] = []
+    hops = writes = calls = 0
+    for _ in range(args.runs):
+        before_seconds, before_writes = _checkpoint_seconds(metrics)
+        elapsed, hops, client = run_task(graph, registry, scripts, latency, tools)
+        after_seconds, after_writes = _checkpoint_seconds(metrics)
+        calls = client.calls()
+        writes = int(after_writes - before_writes)
+        task_ms.append(elapsed * 1000)
+        overhead_ms.append((elapsed - client.model_seconds()) * 1000 / hops)
+        checkpoint_ms.append((after_seconds - before_seconds) * 1000 / hops)
+
+    peaks: list[float] = []
+    tracemalloc.start()
+    try:
+        for _ in range(args.memory_runs):
+            tracemalloc.reset_peak()
+            run_task(graph, registry, scripts, latency, tools)
+            peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "case": f"{scenario}/{topology}/{backend}/{size}",
+        "scenario": scenario,
+        "topology": topology,
+        "backend": backend,
+        "size": size,
+        "hops": hops,
+        "model_calls": calls,
+        "checkpoint_writes": writes,
+        "task": summarize(task_ms),
+        "overhead_per_hop": summarize(overhead_ms),
+        "checkpoint_per_hop": summarize(checkpoint_ms),
+        "peak_kb": round(statistics.median(peaks), 1) if peaks else None,
+    }
+
+
+def run_tools(size: str, source: Path, runs: int) -> list[dict[str, Any]]:
+    """Time the file tools on a synthetic project checkout."""
+    tools = {tool.name: tool for tool in get_all_tools()}
+    project_path = str(source)
+    calls = {
+        "read_file": ("read_file", {"file_path": "pkg/sub0/module_1.py"}),
+        "write_file": (
+            "write_file",
+            {"file_path": "bench_out/out.py", "content": _module_source(1)},
+        ),
+        "search_code (hits)": ("search_code", {"query": "TODO", "file_extension": ".py"}),
+        "search_code (miss)": ("search_code", {"query": "no_such_symbol"}),
+    }
+    results = []
+    for label, (name, tool_args) in calls.items():
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            result = tools[name].invoke({**tool_args, "project_path": project_path})
+            samples.append((time.perf_counter() - start) * 1000)
+            if isinstance(result, dict) and "error" in result:
+                raise RuntimeError(f"{label} failed: {result['error']}")
+        results.append(
+            {"case": f"tool/{label}/{size}", "tool": label, "size": size, **summarize(samples)}
+        )
+    return results
+
+
+def _backends() -> list[str]:
+    try:
+        import src.graph.sqlite_saver  # noqa: F401
+    except ImportError:
+        print("langgraph-checkpoint-sqlite not installed; skipping the SQLite backend")
+        return ["memory"]
+    return ["memory", "sqlite"]
+
+
+def print_results(results: list[dict[str, Any]], tool_results: list[dict[str, Any]]) -> None:
+    """Print the graph and tool results as tables."""
+    print(
+        f"{'case':<40}{'hops':>5}{'task ms':>10}{'p95 ms':>9}{'ovh/hop':>9}"
+        f"{'ckpt/hop':>10}{'peak KB':>10}"
+    )
+    for r in results:
+        print(
+            f"{r['case']:<40}{r['hops']:>5}{r['task']['median_ms']:>10.2f}"
+            f"{r['task']['p95_ms']:>9.2f}{r['overhead_per_hop']['median_ms']:>9.3f}"
+            f"{r['checkpoint_per_hop']['median_ms']:>10.3f}{r['peak_kb'] or 0:>10.0f}"
+        )
+    print()
+    print(f"{'tool':<40}{'mean ms':>10}{'median ms':>11}{'p95 ms':>9}")
+    for r in tool_results:
+        print(f"{r['case']:<40}{r['mean_ms']:>10.3f}{r['median_ms']:>11.3f}{r['p95_ms']:>9.3f}")
+
+
+def compare(results: list[dict[str, Any]], meta: dict[str, Any], baseline_path: str) -> None:
+    """Print median changes against an earlier --json output."""
+    baseline = json.loads(Path(baseline_path).read_text())
+    before = {r["case"]: r for r in baseline["results"] + baseline["tools"]}
+    print(f"\nChange vs {baseline_path} (median):")
+    if baseline["meta"]["latency_ms"] != meta["latency_ms"]:
+        print(f"  (baseline ran with --latency-ms {baseline['meta']['latency_ms']})")
+    for r in results:
+        old = before.get(r["case"])
+        if old is None:
+            continue
+        if "task" in r:
+            pairs = [
+                ("task", r["task"], old["task"]),
+                ("ovh/hop", r["overhead_per_hop"], old["overhead_per_hop"]),
+            ]
+        else:
+            pairs = [("tool", r, old)]
+        changes = "  ".join(
+            f"{label} {(new['median_ms'] / prev['median_ms'] - 1) * 100:+.1f}%"
+            for label, new, prev in pairs
+            if prev["median_ms"]
+        )
+        print(f"  {r['case']:<40}{changes}")
+
+
+def main() -> int:
+    """Run the benchmark and print summary tables."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Timed tasks per case")
+    parser.add_argument("--memory-runs", type=int, default=3, help="Traced tasks per case")
+    parser.add_argument("--tool-runs", type=int, default=20, help="Calls per tool and size")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Scripted model latency")
+    parser.add_argument("--sizes", default=",".join(SIZES), help="Comma-separated SIZES keys")
+    parser.add_argument(
+        "--scenarios", default="review-loop,plan-fanout", help="Comma-separated scenarios"
+    )
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Earlier --json output to compare against")
+    args = parser.parse_args()
+
+    # Checkpoint write latency is read from the metrics registry
+    metrics_module._registry = MetricsRegistry(enabled=True)
+
+    sizes = args.sizes.split(",")
+    unknown = set(sizes) - set(SIZES)
+    if unknown:
+        parser.error(f"Unknown sizes: {', '.join(sorted(unknown))}")
+
+    results: list[dict[str, Any]] = []
+    tool_results: list[dict[str, Any]] = []
+    backends = _backends()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        for size in sizes:
+            projects, source = make_project(tmp, size)
+            for scenario in args.scenarios.split(","):
+                for topology in TOPOLOGIES:
+                    for backend in backends:
+                        results.append(
+                            run_case(
+                                scenario, topology, backend, size, projects, source, args, tmp
+                            )
+                        )
+            tool_results.extend(run_tools(size, source, args.tool_runs))
+
+    print_results(results, tool_results)
+
+    meta = {
+        "python": platform.python_version(),
+        "langgraph": version("langgraph"),
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "latency_ms": args.latency_ms,
+    }
+    if args.baseline:
+        compare(results + tool_results, meta, args.baseline)
+
+    if args.json:
+        output = {
+            "meta": meta,
+            "results": results,
+            "tools": tool_results,
+        }
+        Path(args.json).write_text(json.dumps(output, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""Load test LLMClient against the mock proxy (or a real one).
+
+Runs N tasks on C threads. Each task makes --hops model calls through
+LLMClient, one per agent role in turn, on a conversation that grows with
+every answer, like an agent loop. Calls therefore go through the shared
+governor (concurrency and rate limits, retries with backoff) and the pooled
+HTTP client. With --stream, answers are read as server-sent events and time
+to first token is reported as well.
+
+By default a mock proxy (benchmarks/mock_proxy.py) is started in-process;
+--url targets a running proxy instead. Governor limits come from the usual
+env settings (LLM_MAX_CONCURRENCY, LLM_REQUESTS_PER_SECOND, ...).
+
+Usage:
+    uv run python benchmarks/load_test.py [--tasks 40] [--concurrency 8]
+        [--hops 5] [--stream] [--latency-ms 800] [--error-429 0.05]
+        [--url http://127.0.0.1:4000/anthropic] [--json out.json]
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage  # noqa: E402
+from mock_proxy import add_mock_arguments, mock_from_args  # noqa: E402
+
+from src.llm.governor import get_governor  # noqa: E402
+from src.llm.proxy_client import LLMClient  # noqa: E402
+from src.llm.roles import ROLES  # noqa: E402
+
+SYSTEM_PROMPT = "You are one agent of a software team. " * 40
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """p50, p95, p99 and max of millisecond samples."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def at(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, round(q * (len(ordered) - 1)))], 1)
+
+    return {"p50_ms": at(0.5), "p95_ms": at(0.95), "p99_ms": at(0.99), "max_ms": at(1.0)}
+
+
+class LoadRecorder:
+    """Thread-safe latency samples and failures of a load test."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.calls: list[float] = []
+        self.ttft: list[float] = []
+        self.tasks: list[float] = []
+        self.errors: dict[str, int] = {}
+
+    def add(self, samples: list[float], value: float) -> None:
+        """Append a sample to one of the sample lists."""
+        with self._lock:
+            samples.append(value)
+
+    def fail(self, error: BaseException) -> None:
+        """Count a failed task by error type."""
+        name = type(error).__name__
+        with self._lock:
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+
+def stream_call(model: Any, messages: list[Any], recorder: LoadRecorder) -> AIMessage:
+    """Make a streamed call through the governor, recording time to first token.
+
+    The graph's agents make plain calls, which GovernedChatAnthropic routes
+    through the governor itself; streamed calls are routed here.
+    """
+
+    def call() -> AIMessage:
+        start = time.perf_counter()
+        chunks = None
+        for chunk in model.stream(messages):
+            if chunks is None:
+                recorder.add(recorder.ttft, (time.perf_counter() - start) * 1000)
+                chunks = chunk
+            else:
+                chunks += chunk
+        return AIMessage(content=chunks.content if chunks is not None else "")
+
+    return get_governor().call(call)
+
+
+def run_task(
+    index: int, client: LLMClient, args: argparse.Namespace, recorder: LoadRecorder
+) -> None:
+    """Run one task's model calls, one hop per role in turn."""
+    messages: list[Any] = [
+        SystemMessage(content=SYSTEM_PROMPT),
+        HumanMessage(content=f"Task {index}"),
+    ]
+    start = time.perf_counter()
+    try:
+        for hop in range(args.hops):
+            model = client.get_chat_model(ROLES[hop % len(ROLES)])
+            call_start = time.perf_counter()
+            if args.stream:
+                response = stream_call(model, messages, recorder)
+            else:
+                response = model.invoke(messages)
+            recorder.add(recorder.calls, (time.perf_counter() - call_start) * 1000)
+            messages += [AIMessage(content=response.content), HumanMessage(content="Continue")]
+    except Exception as e:
+        recorder.fail(e)
+        return
+    recorder.add(recorder.tasks, (time.perf_counter() - start) * 1000)
+
+
+def main() -> int:
+    """Run the load test and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=40, help="Tasks to run")
+    parser.add_argument("--concurrency", type=int, default=8, help="Tasks running at once")
+    parser.add_argument("--hops", type=int, default=5, help="Model calls per task")
+    parser.add_argument("--stream", action="store_true", help="Stream answers (SSE)")
+    parser.add_argument("--url", help="Proxy to load instead of an in-process mock")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    mock = None if args.url else mock_from_args(args)
+    url = args.url or mock.start()  # type: ignore[union-attr]
+    client = LLMClient(proxy_url=url)
+    recorder = LoadRecorder()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for index in range(args.tasks):
+            pool.submit(run_task, index, client, args, recorder)
+    elapsed = time.perf_counter() - start
+
+    results: dict[str, Any] = {
+        "tasks": args.tasks,
+        "concurrency": args.concurrency,
+        "hops": args.hops,
+        "stream": args.stream,
+        "seconds": round(elapsed, 3),
+        "tasks_per_sec": round(len(recorder.tasks) / elapsed, 2),
+        "calls_per_sec": round(len(recorder.calls) / elapsed, 2),
+        "failed_tasks": sum(recorder.errors.values()),
+        "errors": recorder.errors,
+        "call_latency": percentiles(recorder.calls),
+        "ttft": percentiles(recorder.ttft),
+        "task_latency": percentiles(recorder.tasks),
+        "governor": get_governor().stats(),
+        "proxy": mock.stats() if mock is not None else None,
+    }
+    if mock is not None:
+        mock.stop()
+
+    print(
+        f"{results['tasks']} tasks x {args.hops} hops on {args.concurrency} threads "
+        f"in {results['seconds']}s: {results['tasks_per_sec']} tasks/s, "
+        f"{results['calls_per_sec']} calls/s, {results['failed_tasks']} failed "
+        f"{recorder.errors or ''}"
+    )
+    for label in ("call_latency", "ttft", "task_latency"):
+        if results[label]:
+            row = "  ".join(f"{key[:-3]} {value:>8.1f}" for key, value in results[label].items())
+            print(f"{label:<14}{row}  ms")
+    governor = results["governor"]
+    print(
+        f"governor      attempts {governor['attempts']}  retries {governor['retries']}  "
+        f"rate-limited {governor['rate_limited']}  "
+        f"queue wait p95 {governor['queue_wait_p95_ms']:.1f} ms"
+    )
+    if mock is not None:
+        proxy = results["proxy"]
+        print(
+            f"proxy         requests {proxy['requests']}  statuses {proxy['statuses']}  "
+            f"tokens in {proxy['input_tokens']} / out {proxy['output_tokens']}  "
+            f"peak in flight {proxy['peak_in_flight']}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    return 1 if results["failed_tasks"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,371 @@
+"""Local stand-in for vscode-lm-proxy speaking the Anthropic messages API.
+
+Serves POST .../v1/messages, plain or streamed as server-sent events, with a
+lognormal time to first token, a per-token generation delay, injected 429
+and 500 errors, and a limit on concurrent requests beyond which it answers
+429 like an overloaded proxy. Input tokens are estimated at four characters
+per token; GET /stats returns request, status and token counts.
+
+Point the client at it with LM_PROXY_URL=http://127.0.0.1:4000/anthropic.
+load_test.py starts one in-process.
+
+Usage:
+    uv run python benchmarks/mock_proxy.py [--listen 127.0.0.1:4000]
+        [--latency-ms 800] [--latency-sigma 0.5] [--token-ms 10]
+        [--error-429 0.05] [--error-500 0.01] [--max-concurrent 8]
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, TypedDict
+
+WORDS = ("the", "change", "keeps", "handlers", "pure", "and", "typed", "so", "tests", "pass")
+
+
+class MockStats(TypedDict):
+    """Requests and tokens served so far."""
+
+    requests: int
+    streamed: int
+    statuses: dict[str, int]
+    input_tokens: int
+    output_tokens: int
+    in_flight: int
+    peak_in_flight: int
+
+
+def _text(value: Any) -> str:
+    """Flatten message content (a string or content blocks) to text."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return "".join(_text(item) for item in value)
+    if isinstance(value, dict):
+        if "text" in value:
+            return str(value["text"])
+        if "input" in value:
+            return json.dumps(value["input"])
+        return _text(value.get("content", ""))
+    return ""
+
+
+def count_input_tokens(request: dict[str, Any]) -> int:
+    """Estimate a request's input tokens (about four characters per token)."""
+    chars = len(_text(request.get("system", "")))
+    chars += sum(len(_text(m.get("content", ""))) for m in request.get("messages", []))
+    chars += sum(len(json.dumps(t)) for t in request.get("tools", []))
+    return chars // 4 + 1
+
+
+class MockProxy:
+    """Anthropic messages API stand-in with configurable latency and failures."""
+
+    def __init__(
+        self,
+        latency_ms: float = 800,
+        latency_sigma: float = 0.5,
+        token_ms: float = 10,
+        output_tokens: int = 60,
+        error_429: float = 0.0,
+        error_500: float = 0.0,
+        retry_after_ms: int = 500,
+        max_concurrent: int = 0,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize mock proxy.
+
+        Args:
+            latency_ms: Median time to first token
+            latency_sigma: Sigma of the lognormal time to first token (0 for fixed)
+            token_ms: Delay per generated token
+            output_tokens: Tokens per answer (capped by the request's max_tokens)
+            error_429: Fraction of requests rejected with 429 and a Retry-After
+            error_500: Fraction of requests failing with 500
+            retry_after_ms: Retry-After sent with 429 responses
+            max_concurrent: Requests served at once before answering 429 (0 for no limit)
+            seed: Random seed for latencies and injected errors
+        """
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.token_ms = token_ms
+        self.output_tokens = output_tokens
+        self.error_429 = error_429
+        self.error_500 = error_500
+        self.retry_after_ms = retry_after_ms
+        self.max_concurrent = max_concurrent
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = MockStats(
+            requests=0,
+            streamed=0,
+            statuses={},
+            input_tokens=0,
+            output_tokens=0,
+            in_flight=0,
+            peak_in_flight=0,
+        )
+        self._server: ThreadingHTTPServer | None = None
+
+    def time_to_first_token(self) -> float:
+        """Draw a time to first token in seconds."""
+        with self._lock:
+            return self.latency_ms * math.exp(self._random.gauss(0, self.latency_sigma)) / 1000
+
+    def count_status(self, status: int) -> None:
+        """Count a response status."""
+        with self._lock:
+            key = str(status)
+            self._stats["statuses"][key] = self._stats["statuses"].get(key, 0) + 1
+
+    def admit(self, stream: bool) -> int | None:
+        """Count a request in flight, or pick the error status it fails with."""
+        with self._lock:
+            roll = self._random.random()
+            self._stats["requests"] += 1
+            self._stats["streamed"] += int(stream)
+            if self.max_concurrent and self._stats["in_flight"] >= self.max_concurrent:
+                return 429
+            if roll < self.error_429:
+                return 429
+            if roll < self.error_429 + self.error_500:
+                return 500
+            self._stats["in_flight"] += 1
+            self._stats["peak_in_flight"] = max(
+                self._stats["peak_in_flight"], self._stats["in_flight"]
+            )
+            return None
+
+    def release(self, input_tokens: int, output_tokens: int) -> None:
+        """Count a finished request's tokens."""
+        with self._lock:
+            self._stats["in_flight"] -= 1
+            self._stats["input_tokens"] += input_tokens
+            self._stats["output_tokens"] += output_tokens
+
+    def answer(self, request: dict[str, Any]) -> list[str]:
+        """Get the answer's text chunks, one per token."""
+        count = max(min(self.output_tokens, int(request.get("max_tokens", 4096))), 1)
+        return [("" if i == 0 else " ") + WORDS[i % len(WORDS)] for i in range(count)]
+
+    def stats(self) -> MockStats:
+        """Get a snapshot of request and token counts."""
+        with self._lock:
+            return MockStats(**{**self._stats, "statuses": dict(self._stats["statuses"])})
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve on a background thread.
+
+        Args:
+            host: Interface to bind
+            port: Port (0 picks a free one)
+
+        Returns:
+            Base URL to use as LM_PROXY_URL
+        """
+        self._server = ThreadingHTTPServer((host, port), _handler(self))
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="mock-proxy", daemon=True).start()
+        return f"http://{host}:{self._server.server_address[1]}/anthropic"
+
+    def stop(self) -> None:
+        """Stop serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def _handler(proxy: MockProxy) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        # Keep-alive, so the client's connection pool is exercised
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def _send_json(self, status: int, body: Any, headers: dict[str, str] | None = None) -> None:
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+            proxy.count_status(status)
+
+        def _send_error(self, status: int) -> None:
+            if status == 429:
+                self._send_json(
+                    429,
+                    {
+                        "type": "error",
+                        "error": {"type": "rate_limit_error", "message": "Mock rate limit"},
+                    },
+                    {"retry-after-ms": str(proxy.retry_after_ms)},
+                )
+            else:
+                self._send_json(
+                    status,
+                    {"type": "error", "error": {"type": "api_error", "message": "Mock failure"}},
+                )
+
+        def do_HEAD(self) -> None:
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def do_GET(self) -> None:
+            if self.path.rstrip("/").endswith("/stats"):
+                self._send_json(200, proxy.stats())
+            else:
+                self._send_json(200, {"status": "ok"})
+
+        def do_POST(self) -> None:
+            length = int(self.headers.get("Content-Length", "0"))
+            try:
+                request = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError:
+                self._send_json(400, {"type": "error", "error": {"type": "invalid_request_error"}})
+                return
+            if not self.path.split("?")[0].endswith("/v1/messages"):
+                self._send_json(404, {"type": "error", "error": {"type": "not_found_error"}})
+                return
+
+            stream = bool(request.get("stream"))
+            error = proxy.admit(stream)
+            if error is not None:
+                self._send_error(error)
+                return
+
+            input_tokens = count_input_tokens(request)
+            chunks = proxy.answer(request)
+            try:
+                time.sleep(proxy.time_to_first_token())
+                if stream:
+                    self._stream(request, chunks, input_tokens)
+                else:
+                    time.sleep(len(chunks) * proxy.token_ms / 1000)
+                    self._send_json(200, self._message(request, chunks, input_tokens))
+            finally:
+                proxy.release(input_tokens, len(chunks))
+
+        def _message(
+            self, request: dict[str, Any], chunks: list[str], input_tokens: int
+        ) -> dict[str, Any]:
+            return {
+                "id": f"msg_{uuid.uuid4().hex[:24]}",
+                "type": "message",
+                "role": "assistant",
+                "model": request.get("model", "mock"),
+                "content": [{"type": "text", "text": "".join(chunks)}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": input_tokens, "output_tokens": len(chunks)},
+            }
+
+        def _event(self, name: str, data: dict[str, Any]) -> None:
+            payload = f"event: {name}\ndata: {json.dumps(data)}\n\n".encode()
+            self.wfile.write(f"{len(payload):x}\r\n".encode() + payload + b"\r\n")
+            self.wfile.flush()
+
+        def _stream(self, request: dict[str, Any], chunks: list[str], input_tokens: int) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            proxy.count_status(200)
+
+            message = self._message(request, [], input_tokens)
+            message["stop_reason"] = None
+            message["usage"]["output_tokens"] = 1
+            self._event("message_start", {"type": "message_start", "message": message})
+            block = {"type": "text", "text": ""}
+            self._event(
+                "content_block_start",
+                {"type": "content_block_start", "index": 0, "content_block": block},
+            )
+            for i, chunk in enumerate(chunks):
+                if i:
+                    time.sleep(proxy.token_ms / 1000)
+                delta = {"type": "text_delta", "text": chunk}
+                self._event(
+                    "content_block_delta",
+                    {"type": "content_block_delta", "index": 0, "delta": delta},
+                )
+            self._event("content_block_stop", {"type": "content_block_stop", "index": 0})
+            self._event(
+                "message_delta",
+                {
+                    "type": "message_delta",
+                    "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                    "usage": {"output_tokens": len(chunks)},
+                },
+            )
+            self._event("message_stop", {"type": "message_stop"})
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+
+    return Handler
+
+
+def add_mock_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the mock proxy's latency and failure options to a parser."""
+    parser.add_argument("--latency-ms", type=float, default=800, help="Median time to first token")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Lognormal sigma")
+    parser.add_argument("--token-ms", type=float, default=10, help="Delay per output token")
+    parser.add_argument("--output-tokens", type=int, default=60, help="Tokens per answer")
+    parser.add_argument("--error-429", type=float, default=0.0, help="Fraction answered 429")
+    parser.add_argument("--error-500", type=float, default=0.0, help="Fraction answered 500")
+    parser.add_argument("--retry-after-ms", type=int, default=500, help="Retry-After of 429s")
+    parser.add_argument(
+        "--max-concurrent", type=int, default=0, help="Requests served at once before 429 (0: any)"
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+
+
+def mock_from_args(args: argparse.Namespace) -> MockProxy:
+    """Create a mock proxy from add_mock_arguments options."""
+    return MockProxy(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        token_ms=args.token_ms,
+        output_tokens=args.output_tokens,
+        error_429=args.error_429,
+        error_500=args.error_500,
+        retry_after_ms=args.retry_after_ms,
+        max_concurrent=args.max_concurrent,
+        seed=args.seed,
+    )
+
+
+def main() -> int:
+    """Serve until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--listen", default="127.0.0.1:4000", help="host:port to bind")
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    host, _, port = args.listen.rpartition(":")
+    proxy = mock_from_args(args)
+    url = proxy.start(host or "127.0.0.1", int(port))
+    print(f"Mock proxy at {url} (GET /stats for counts); Ctrl-C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(json.dumps(proxy.stats(), indent=2))
+        proxy.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
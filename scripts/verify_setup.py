@@ -25,8 +25,15 @@ def main() -> None:
         print(f"\n✅ Check 1/5: Project Registry")
         print(f"   Found {len(projects)} projects: {', '.join(projects)}")
         
+        # Report projects with invalid configuration
+        errors = registry.errors()
+        for name, error in errors.items():
+            print(f"   ✗ {name}: {error}")
+
         # Validate each project path
         for name in projects:
+            if name in errors:
+                continue
             proj = registry.get(name)
             # proj is a ProjectInfo object with .path attribute
             proj_path = getattr(proj, 'path', proj.get('path') if isinstance(proj, dict) else None)
@@ -86,8 +93,7 @@ def main() -> None:
     checks_total += 1
     try:
         from src.graph.builder import create_graph
-        llm = create_llm_client()
-        graph = create_graph(llm)
+        graph = create_graph()
         print(f"\n✅ Check 5/5: Graph")
         print(f"   Graph compiled successfully")
         checks_passed += 1
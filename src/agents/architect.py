@@ -1,43 +1,29 @@
 """Architect agent for system design and technical decisions."""
 
+from typing import Any
+
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 
-from src.graph.state import MultiProjectState
+from src.agents.plan import PLAN_INSTRUCTIONS, parse_plan
+from src.agents.prompt_cache import prompt_cache
+from src.agents.speculation import invoke_agent
+from src.config.context import get_project_context
+from src.graph.budget import usage_of
+from src.graph.state import MultiProjectState, ProjectInfo
+from src.llm.roles import get_role_llm
 
 
-def architect_node(state: MultiProjectState, config: RunnableConfig) -> dict[str, list]:
-    """Architect agent that handles system design and architecture decisions.
+def _build_system_prompt(project_info: ProjectInfo, examples: dict[str, Any]) -> str:
+    """Render the architect system prompt for a project.
 
     Args:
-        state: Current workflow state
-        config: Runnable configuration
+        project_info: Project metadata
+        examples: Few-shot examples for this role
 
     Returns:
-        Dictionary with 'messages' to add to state
+        System prompt text
     """
-    # Get LLM and tools from config
-    llm = config["configurable"]["llm"]
-    tools = config["configurable"].get("tools", [])
-
-    # Bind tools to LLM
-    llm_with_tools = llm.bind_tools(tools)
-
-    # Get project context
-    project_context = state.get("project_context")
-    if not project_context:
-        return {
-            "messages": [
-                AIMessage(
-                    content="Error: No project context available. Please select a project first."
-                )
-            ]
-        }
-
-    project_info = project_context["info"]
-    examples = project_context.get("examples", {}).get("architect", {})
-
-    # Build system prompt
     system_prompt = f"""You are a software architect working on the {project_info['name']} project.
 
 Project Context:
@@ -63,7 +49,7 @@ Conventions to follow:
 
 Coding Standards:
 {chr(10).join(f"- {k}: {v}" for k, v in project_info.get('coding_standards', {}).items())}
-"""
+{PLAN_INSTRUCTIONS}"""
 
     # Add few-shot examples if available
     if examples:
@@ -75,6 +61,39 @@ Coding Standards:
                 system_prompt += f"Input: {first_example.get('input', '')}\n"
                 system_prompt += f"Output: {first_example.get('output', '')[:200]}...\n"
 
+    return system_prompt
+
+
+def build_call(state: MultiProjectState, config: RunnableConfig) -> tuple[Any, list] | None:
+    """Prepare the architect's model call for the current state.
+
+    Args:
+        state: Current workflow state
+        config: Runnable configuration
+
+    Returns:
+        (model with tools bound, input messages), or None without project context
+    """
+    # Get project context
+    project_context = get_project_context(state, config)
+    if not project_context:
+        return None
+
+    # Get LLM (the role's model tier) and tools from config
+    llm = get_role_llm(config, "architect", project_context)
+    tools = config["configurable"].get("tools", [])
+
+    # Bind tools to LLM
+    llm_with_tools = llm.bind_tools(tools)
+
+    project_info = project_context["info"]
+    examples = project_context.get("examples", {}).get("architect", {})
+
+    # Build system prompt (rendered once per project config)
+    system_prompt = prompt_cache.get_or_build(
+        "architect", state["project_ref"], lambda: _build_system_prompt(project_info, examples)
+    )
+
     # Get task and recent messages
     task = state.get("task", "")
     recent_messages = state.get("messages", [])[-3:]  # Last 3 messages for context
@@ -84,8 +103,37 @@ Coding Standards:
     messages.extend(recent_messages)
     messages.append(HumanMessage(content=f"Task: {task}"))
 
-    # Invoke LLM
-    response = llm_with_tools.invoke(messages)
+    return llm_with_tools, messages
+
 
-    # Return messages to add to state
-    return {"messages": [response], "next_agent": ""}
+def architect_node(state: MultiProjectState, config: RunnableConfig) -> dict[str, Any]:
+    """Architect agent that handles system design and architecture decisions.
+
+    Args:
+        state: Current workflow state
+        config: Runnable configuration
+
+    Returns:
+        Dictionary with 'messages' to add to state and the (possibly empty) 'plan'
+    """
+    call = build_call(state, config)
+    if call is None:
+        return {
+            "messages": [
+                AIMessage(
+                    content="Error: No project context available. Please select a project first."
+                )
+            ]
+        }
+    llm_with_tools, messages = call
+
+    # Invoke LLM, or take the result of a call started speculatively while routing
+    response = invoke_agent("architect", config, llm_with_tools, messages)
+
+    # Return messages to add to state; a new plan replaces any earlier one
+    return {
+        "messages": [response],
+        "next_agent": "",
+        "plan": parse_plan(response.content),
+        "usage": usage_of(response),
+    }
@@ -1,43 +1,30 @@
 """Developer agent for code implementation."""
 
+from typing import Any
+
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 
-from src.graph.state import MultiProjectState
+from src.agents.plan import content_text, files_written
+from src.agents.prompt_cache import prompt_cache
+from src.agents.speculation import invoke_agent
+from src.config.context import get_project_context
+from src.graph.budget import usage_of
+from src.graph.state import MultiProjectState, PlanResult, PlanWorkerState, ProjectInfo
+from src.llm.calls import invoke_model
+from src.llm.roles import get_role_llm
 
 
-def developer_node(state: MultiProjectState, config: RunnableConfig) -> dict[str, list]:
-    """Developer agent that implements features and fixes bugs.
+def _build_system_prompt(project_info: ProjectInfo, examples: dict[str, Any]) -> str:
+    """Render the developer system prompt for a project.
 
     Args:
-        state: Current workflow state
-        config: Runnable configuration
+        project_info: Project metadata
+        examples: Few-shot examples for this role
 
     Returns:
-        Dictionary with 'messages' to add to state
+        System prompt text
     """
-    # Get LLM and tools from config
-    llm = config["configurable"]["llm"]
-    tools = config["configurable"].get("tools", [])
-
-    # Bind tools to LLM
-    llm_with_tools = llm.bind_tools(tools)
-
-    # Get project context
-    project_context = state.get("project_context")
-    if not project_context:
-        return {
-            "messages": [
-                AIMessage(
-                    content="Error: No project context available. Please select a project first."
-                )
-            ]
-        }
-
-    project_info = project_context["info"]
-    examples = project_context.get("examples", {}).get("developer", {})
-
-    # Build system prompt
     system_prompt = f"""You are a software developer working on the {project_info['name']} project.
 
 Project Context:
@@ -84,6 +71,44 @@ Available tools:
                 system_prompt += f"Input: {first_example.get('input', '')}\n"
                 system_prompt += f"Output:\n{first_example.get('output', '')[:300]}...\n"
 
+    return system_prompt
+
+
+def build_call(
+    state: MultiProjectState | PlanWorkerState,
+    config: RunnableConfig,
+    instruction: str | None = None,
+) -> tuple[Any, list] | None:
+    """Prepare the developer's model call for the current state.
+
+    Args:
+        state: Current workflow state
+        config: Runnable configuration
+        instruction: Request to the developer (default: the whole task)
+
+    Returns:
+        (model with tools bound, input messages), or None without project context
+    """
+    # Get project context
+    project_context = get_project_context(state, config)
+    if not project_context:
+        return None
+
+    # Get LLM (the role's model tier) and tools from config
+    llm = get_role_llm(config, "developer", project_context)
+    tools = config["configurable"].get("tools", [])
+
+    # Bind tools to LLM
+    llm_with_tools = llm.bind_tools(tools)
+
+    project_info = project_context["info"]
+    examples = project_context.get("examples", {}).get("developer", {})
+
+    # Build system prompt (rendered once per project config)
+    system_prompt = prompt_cache.get_or_build(
+        "developer", state["project_ref"], lambda: _build_system_prompt(project_info, examples)
+    )
+
     # Get task and recent messages
     task = state.get("task", "")
     recent_messages = state.get("messages", [])[-5:]  # Last 5 messages for context
@@ -91,10 +116,71 @@ Available tools:
     # Build messages
     messages = [SystemMessage(content=system_prompt)]
     messages.extend(recent_messages)
-    messages.append(HumanMessage(content=f"Task: {task}"))
+    messages.append(HumanMessage(content=instruction or f"Task: {task}"))
+
+    return llm_with_tools, messages
 
-    # Invoke LLM
-    response = llm_with_tools.invoke(messages)
+
+def developer_node(state: MultiProjectState, config: RunnableConfig) -> dict[str, Any]:
+    """Developer agent that implements features and fixes bugs.
+
+    Args:
+        state: Current workflow state
+        config: Runnable configuration
+
+    Returns:
+        Dictionary with 'messages' to add to state
+    """
+    call = build_call(state, config)
+    if call is None:
+        return {
+            "messages": [
+                AIMessage(
+                    content="Error: No project context available. Please select a project first."
+                )
+            ]
+        }
+    llm_with_tools, messages = call
+
+    # Invoke LLM, or take the result of a call started speculatively while routing
+    response = invoke_agent("developer", config, llm_with_tools, messages)
 
     # Return messages to add to state
-    return {"messages": [response], "next_agent": ""}
+    return {"messages": [response], "next_agent": "", "usage": usage_of(response)}
+
+
+def developer_worker_node(state: PlanWorkerState, config: RunnableConfig) -> dict[str, Any]:
+    """Developer worker that implements one file-level subtask of a plan.
+
+    Args:
+        state: Worker input with the plan step
+        config: Runnable configuration
+
+    Returns:
+        Dictionary with the worker's 'plan_results' entry and model usage
+    """
+    step, index = state["step"], state["index"]
+    instruction = (
+        f"Task: {state['task']}\n\n"
+        f"You are handling subtask {index + 1} of {state['total']}; other developers edit "
+        f"the other files in parallel.\n"
+        f"File: {step['file']}\n"
+        f"Instructions: {step['instructions']}\n"
+        f"Only modify {step['file']}."
+    )
+
+    call = build_call(state, config, instruction)
+    if call is None:
+        response = None
+        summary, written = "Error: No project context available.", []
+    else:
+        llm_with_tools, messages = call
+        response = invoke_model("developer", config, llm_with_tools, messages)
+        summary, written = content_text(response.content), files_written(response)
+
+    return {
+        "plan_results": [
+            PlanResult(index=index, file=step["file"], summary=summary, files_written=written)
+        ],
+        "usage": usage_of(response),
+    }
@@ -0,0 +1,164 @@
+"""Architect plans for map-reduce developer execution.
+
+For changes spanning several files, the architect ends its answer with a
+plan block listing independent file-level subtasks. The graph runs one
+developer worker per subtask in parallel and the merge node reduces their
+results into a single message, flagging files edited by more than one
+worker.
+"""
+
+import json
+import posixpath
+import re
+from collections import defaultdict
+from typing import Any
+
+from langchain_core.messages import AIMessage
+
+from src.graph.state import MultiProjectState, PlanResult, PlanStep
+
+# Appended to the architect's system prompt
+PLAN_INSTRUCTIONS = """
+Multi-file changes:
+When the change touches several files that can be edited independently of each
+other, end your answer with a plan block listing one subtask per file:
+```plan
+[{"file": "path/relative/to/project", "instructions": "what to change in this file"}]
+```
+Omit the plan for single-file changes or when edits depend on each other.
+"""
+
+_PLAN_BLOCK = re.compile(r"```plan\s*\n(.*?)```", re.DOTALL)
+
+
+def content_text(content: Any) -> str:
+    """Get the text of message content (a string or a list of content blocks).
+
+    Args:
+        content: Message content
+
+    Returns:
+        Text parts joined by newlines
+    """
+    if isinstance(content, str):
+        return content
+    parts = []
+    for item in content or []:
+        if isinstance(item, dict) and "text" in item:
+            parts.append(item["text"])
+        elif isinstance(item, str):
+            parts.append(item)
+    return "\n".join(parts)
+
+
+def normalize_path(path: str) -> str:
+    """Normalize a project-relative path for comparison."""
+    return posixpath.normpath(path.replace("\\", "/"))
+
+
+def parse_plan(content: Any) -> list[PlanStep]:
+    """Extract the plan block from an architect response.
+
+    Subtasks for the same file are combined, since two workers editing one
+    file would conflict. A missing or malformed plan yields no subtasks.
+
+    Args:
+        content: Architect message content
+
+    Returns:
+        Plan steps in order of first appearance
+    """
+    match = _PLAN_BLOCK.search(content_text(content))
+    if not match:
+        return []
+    try:
+        raw = json.loads(match.group(1))
+    except json.JSONDecodeError:
+        return []
+    if not isinstance(raw, list):
+        return []
+
+    steps: dict[str, PlanStep] = {}
+    for item in raw:
+        if not isinstance(item, dict):
+            continue
+        file, instructions = item.get("file"), item.get("instructions")
+        if not isinstance(file, str) or not isinstance(instructions, str) or not file.strip():
+            continue
+        key = normalize_path(file.strip())
+        if key in steps:
+            steps[key]["instructions"] += f"\n{instructions}"
+        else:
+            steps[key] = PlanStep(file=file.strip(), instructions=instructions)
+    return list(steps.values())
+
+
+def files_written(message: Any) -> list[str]:
+    """Get the files a developer response edits.
+
+    Args:
+        message: Model response
+
+    Returns:
+        Normalized paths of its write_file calls
+    """
+    paths = {
+        normalize_path(call["args"]["file_path"])
+        for call in getattr(message, "tool_calls", None) or []
+        if call.get("name") == "write_file" and isinstance(call["args"].get("file_path"), str)
+    }
+    return sorted(paths)
+
+
+def find_conflicts(results: list[PlanResult]) -> dict[str, list[int]]:
+    """Find files edited by more than one worker.
+
+    A worker editing another subtask's file counts as editing it too, even
+    if that subtask's own worker made no write.
+
+    Args:
+        results: Worker results
+
+    Returns:
+        Conflicting file to the (1-based) subtasks touching it
+    """
+    touched: dict[str, set[int]] = defaultdict(set)
+    assigned = {normalize_path(r["file"]): r["index"] for r in results}
+    for result in results:
+        for path in result["files_written"]:
+            touched[path].add(result["index"])
+            if path in assigned:
+                touched[path].add(assigned[path])
+    return {
+        path: sorted(i + 1 for i in indexes)
+        for path, indexes in sorted(touched.items())
+        if len(indexes) > 1
+    }
+
+
+def merge_plan_node(state: MultiProjectState) -> dict[str, Any]:
+    """Reduce developer worker results into one message for the supervisor.
+
+    Args:
+        state: Current workflow state
+
+    Returns:
+        Dictionary with the merged message; clears the plan and its results
+    """
+    results = sorted(state.get("plan_results") or [], key=lambda r: r["index"])
+    lines = [f"Developer workers completed {len(results)} subtasks:"]
+    for result in results:
+        lines.append(f"\n[{result['index'] + 1}] {result['file']}\n{result['summary']}")
+
+    conflicts = find_conflicts(results)
+    if conflicts:
+        lines.append("\n⚠️ Conflicting edits (re-run these subtasks one after another):")
+        for path, subtasks in conflicts.items():
+            lines.append(f"- {path}: subtasks {', '.join(map(str, subtasks))}")
+
+    return {
+        "messages": [AIMessage(content="\n".join(lines), name="developer")],
+        "plan": [],
+        "plan_results": None,
+        "next_agent": "",
+    }
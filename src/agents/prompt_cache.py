@@ -0,0 +1,61 @@
+"""Cache of rendered agent system prompts."""
+
+import threading
+from collections.abc import Callable
+
+from src.metrics import get_metrics
+
+
+class PromptCache:
+    """Rendered system prompts keyed by agent role and project reference.
+
+    Project references embed a config hash, so a stale prompt can never be
+    served for a changed config; `invalidate_project` just releases prompts
+    of configs that were reloaded.
+    """
+
+    def __init__(self) -> None:
+        self._prompts: dict[tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+
+    def get_or_build(self, role: str, project_ref: str, build: Callable[[], str]) -> str:
+        """Get a rendered prompt, building it on first use.
+
+        Args:
+            role: Agent role (e.g. 'developer')
+            project_ref: Project context reference ('<name>@<hash>')
+            build: Renders the prompt
+
+        Returns:
+            Rendered system prompt
+        """
+        key = (role, project_ref)
+        prompt = self._prompts.get(key)
+        get_metrics().inc(
+            "langgraphx_cache_requests_total",
+            cache="prompt",
+            result="miss" if prompt is None else "hit",
+        )
+        if prompt is None:
+            prompt = build()
+            with self._lock:
+                self._prompts[key] = prompt
+        return prompt
+
+    def invalidate_project(self, name: str) -> None:
+        """Drop all prompts rendered for a project.
+
+        Args:
+            name: Project name
+        """
+        prefix = f"{name}@"
+        with self._lock:
+            for key in [k for k in self._prompts if k[1].startswith(prefix)]:
+                del self._prompts[key]
+
+    def __len__(self) -> int:
+        return len(self._prompts)
+
+
+# Shared by all agents in the process
+prompt_cache = PromptCache()
@@ -0,0 +1,306 @@
+"""Speculative prefetch of the next agent's model call.
+
+Every hop runs two model calls back to back: the supervisor decides where to
+route, then the chosen agent calls its own model. The agent's input depends
+only on state the supervisor does not change (messages, task, project), so
+it can be prepared before the routing decision exists. With speculation
+enabled, the supervisor starts the most likely next agent's call in the
+background while its own call runs; the agent takes that result on a hit,
+and a mispredicted call is cancelled or its result discarded.
+"""
+
+import os
+import threading
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from importlib import import_module
+from typing import Any, NamedTuple, TypedDict
+
+from langchain_core.runnables import RunnableConfig
+
+from src.graph.state import MultiProjectState
+from src.llm.calls import invoke_model
+from src.metrics import get_metrics
+
+# Agents whose calls can be prefetched
+AGENTS = ("architect", "developer", "reviewer", "tester")
+
+# Rule-based prediction (mirrors the supervisor's workflow rules), keyed by
+# the previous routing decision ("" at the start of a task)
+RULE_PREDICTIONS = {
+    "": "architect",
+    "architect": "developer",
+    "developer": "end",
+    "reviewer": "developer",
+    "tester": "end",
+}
+
+# Speculation outcomes reported as cache lookups to the metrics registry
+_CACHE_RESULTS = {"hits": "hit", "misses": "miss"}
+
+
+class SpeculationStats(TypedDict):
+    """Snapshot of speculation metrics."""
+
+    enabled: bool
+    started: int
+    hits: int
+    misses: int
+    hit_rate: float
+    wasted_tokens: int
+
+
+class _Pending(NamedTuple):
+    agent: str
+    messages: list[Any]
+    future: Future[Any]
+
+
+def _total_tokens(response: Any) -> int:
+    usage = getattr(response, "usage_metadata", None) or {}
+    return int(usage.get("total_tokens", 0))
+
+
+class Speculator:
+    """Predicts the next agent per thread and runs its model call ahead of time.
+
+    Predictions come from observed routing transitions (previous decision to
+    next decision) once a transition has `min_samples` observations, and from
+    RULE_PREDICTIONS before that.
+    """
+
+    def __init__(
+        self,
+        enabled: bool | None = None,
+        max_workers: int | None = None,
+        min_samples: int | None = None,
+    ) -> None:
+        """Initialize speculator.
+
+        Args:
+            enabled: Start speculative calls (default from env: SPECULATIVE_ROUTING, 0)
+            max_workers: Speculative calls in flight at once
+                (default from env: SPECULATIVE_WORKERS, 4)
+            min_samples: Observed transitions needed before statistics override
+                the rules (default from env: SPECULATION_MIN_SAMPLES, 5)
+        """
+        if enabled is None:
+            enabled = os.getenv("SPECULATIVE_ROUTING", "0").strip().lower() in ("1", "true", "yes")
+        self.enabled = enabled
+        self.max_workers = max_workers or int(os.getenv("SPECULATIVE_WORKERS", "4"))
+        self.min_samples = (
+            min_samples
+            if min_samples is not None
+            else int(os.getenv("SPECULATION_MIN_SAMPLES", "5"))
+        )
+
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._transitions: dict[str, Counter[str]] = {}
+        self._previous: dict[str, str] = {}
+        self._pending: dict[str, _Pending] = {}
+        self._counts = {"started": 0, "hits": 0, "misses": 0, "wasted_tokens": 0}
+
+    def _count(self, name: str, delta: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += delta
+        if name in _CACHE_RESULTS:
+            get_metrics().inc(
+                "langgraphx_cache_requests_total", cache="speculation", result=_CACHE_RESULTS[name]
+            )
+
+    def _submit(self, fn: Callable[[], Any]) -> Future[Any]:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="speculation"
+                )
+            return self._executor.submit(fn)
+
+    def predict(self, previous: str) -> str:
+        """Predict the next routing decision.
+
+        Args:
+            previous: Previous routing decision of the thread ("" at task start)
+
+        Returns:
+            Most likely next agent, or "end"
+        """
+        with self._lock:
+            observed = self._transitions.get(previous)
+            if observed and observed.total() >= self.min_samples:
+                return observed.most_common(1)[0][0]
+        return RULE_PREDICTIONS.get(previous, "end")
+
+    def speculate(self, state: MultiProjectState, config: RunnableConfig) -> str | None:
+        """Start the predicted next agent's model call in the background.
+
+        Called by the supervisor before its own model call.
+
+        Args:
+            state: Current workflow state
+            config: Runnable configuration
+
+        Returns:
+            Agent whose call was started, or None
+        """
+        thread_id = config["configurable"].get("thread_id")
+        if not self.enabled or not thread_id:
+            return None
+
+        # A leftover call from an interrupted hop can no longer be used
+        self.discard(thread_id)
+
+        with self._lock:
+            previous = self._previous.get(thread_id, "")
+        agent = self.predict(previous)
+        if agent not in AGENTS:
+            return None
+
+        call = import_module(f"src.agents.{agent}").build_call(state, config)
+        if call is None:
+            return None
+        llm_with_tools, messages = call
+
+        # Report the call under the predicted node, as if that node had made it,
+        # so traces, recordings and callbacks attribute it to the agent
+        metadata = {**config.get("metadata", {}), "langgraph_node": agent, "speculative": True}
+        call_config: RunnableConfig = {"callbacks": config.get("callbacks"), "metadata": metadata}
+        future = self._submit(lambda: llm_with_tools.invoke(messages, config=call_config))
+        with self._lock:
+            self._pending[thread_id] = _Pending(agent, messages, future)
+            self._counts["started"] += 1
+        return agent
+
+    def resolve(self, config: RunnableConfig, next_agent: str) -> None:
+        """Record the supervisor's decision and drop a mispredicted call.
+
+        Args:
+            config: Runnable configuration
+            next_agent: Routing decision
+        """
+        thread_id = config["configurable"].get("thread_id")
+        if not self.enabled or not thread_id:
+            return
+
+        with self._lock:
+            previous = self._previous.pop(thread_id, "")
+            self._transitions.setdefault(previous, Counter())[next_agent] += 1
+            if next_agent != "end":
+                self._previous[thread_id] = next_agent
+            pending = self._pending.get(thread_id)
+
+        if pending and pending.agent != next_agent:
+            self.discard(thread_id)
+
+    def take(self, config: RunnableConfig, agent: str, messages: list[Any]) -> Future[Any] | None:
+        """Take the speculative call for an agent's call, if one matches.
+
+        Args:
+            config: Runnable configuration
+            agent: Agent about to call its model
+            messages: The agent's actual input messages
+
+        Returns:
+            Future of the speculative call, or None if the call must be made now
+        """
+        thread_id = config["configurable"].get("thread_id")
+        with self._lock:
+            pending = self._pending.get(thread_id) if thread_id else None
+            if pending is None:
+                return None
+            if pending.agent != agent or pending.messages != messages:
+                pending = None
+            else:
+                del self._pending[thread_id]
+        if pending is None:
+            self.discard(thread_id)
+            return None
+
+        self._count("hits")
+        return pending.future
+
+    def discard(self, thread_id: str) -> None:
+        """Drop a thread's speculative call, counting it as a miss.
+
+        A call that has not started is cancelled; otherwise the tokens it
+        spends are counted as wasted once it completes.
+
+        Args:
+            thread_id: Thread whose pending call to drop
+        """
+        with self._lock:
+            pending = self._pending.pop(thread_id, None)
+        if pending is None:
+            return
+        self._count("misses")
+        if pending.future.cancel():
+            return
+
+        def count_waste(future: Future[Any]) -> None:
+            if future.exception() is None:
+                self._count("wasted_tokens", _total_tokens(future.result()))
+
+        pending.future.add_done_callback(count_waste)
+
+    def finish(self, thread_id: str) -> None:
+        """Forget a thread's routing history and pending call after its task ends.
+
+        Args:
+            thread_id: Finished thread
+        """
+        self.discard(thread_id)
+        with self._lock:
+            self._previous.pop(thread_id, None)
+
+    def stats(self) -> SpeculationStats:
+        """Get a snapshot of speculation metrics."""
+        with self._lock:
+            counts = dict(self._counts)
+        resolved = counts["hits"] + counts["misses"]
+        return SpeculationStats(
+            enabled=self.enabled,
+            started=counts["started"],
+            hits=counts["hits"],
+            misses=counts["misses"],
+            hit_rate=round(counts["hits"] / resolved, 3) if resolved else 0.0,
+            wasted_tokens=counts["wasted_tokens"],
+        )
+
+
+_speculator: Speculator | None = None
+_speculator_lock = threading.Lock()
+
+
+def get_speculator() -> Speculator:
+    """Get the process-wide speculator, creating it from env settings on first use.
+
+    Returns:
+        Shared Speculator instance
+    """
+    global _speculator
+    if _speculator is None:
+        with _speculator_lock:
+            if _speculator is None:
+                _speculator = Speculator()
+    return _speculator
+
+
+def invoke_agent(agent: str, config: RunnableConfig, llm: Any, messages: list[Any]) -> Any:
+    """Run an agent's model call, continuing a matching speculative call if there is one.
+
+    The call is bound by the node's deadline and the task's cancellation
+    either way; a failed speculative call is retried as a regular one.
+
+    Args:
+        agent: Agent role
+        config: Runnable configuration
+        llm: Model (with tools bound)
+        messages: Input messages
+
+    Returns:
+        Model response
+    """
+    started = get_speculator().take(config, agent, messages)
+    return invoke_model(agent, config, llm, messages, started=started)
@@ -1,14 +1,19 @@
 """Supervisor agent for task routing and coordination."""
 
-from typing import Literal
+from typing import Any
 
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 
+from src.agents.speculation import get_speculator
+from src.config.context import get_project_context
+from src.graph.budget import check_budget, usage_of
 from src.graph.state import MultiProjectState
+from src.llm.calls import invoke_model
+from src.llm.roles import get_role_llm
 
 
-def supervisor_node(state: MultiProjectState, config: RunnableConfig) -> dict[str, str]:
+def supervisor_node(state: MultiProjectState, config: RunnableConfig) -> dict[str, Any]:
     """Supervisor agent that analyzes tasks and routes to appropriate agent.
 
     Args:
@@ -16,10 +21,20 @@ def supervisor_node(state: MultiProjectState, config: RunnableConfig) -> dict[st
         config: Runnable configuration
 
     Returns:
-        Dictionary with 'next_agent' decision
+        Dictionary with 'next_agent' decision and model usage (one hop per dispatch)
     """
-    # Get LLM from config
-    llm = config["configurable"]["llm"]
+    # Stop without another model call once dispatching an agent would exceed the budget
+    stop_reason = check_budget(state, next_hop=True)
+    if stop_reason:
+        return {
+            "messages": [AIMessage(content=f"⚠️ Stopped: {stop_reason}", name="supervisor")],
+            "next_agent": "end",
+            "stop_reason": stop_reason,
+        }
+
+    # Get LLM (the supervisor's model tier) from config
+    project_context = get_project_context(state, config)
+    llm = get_role_llm(config, "supervisor", project_context)
 
     # Check if this is a re-entry after an agent completed work
     messages = state.get("messages", [])
@@ -79,7 +94,6 @@ After developer modified → end (or reviewer for complex changes)
     # Get task and current context
     task = state.get("task", "")
     current_project = state.get("current_project", "unknown")
-    project_context = state.get("project_context")
 
     # Build context information
     context_info = f"Current project: {current_project}"
@@ -105,8 +119,12 @@ Respond with ONLY: architect, developer, reviewer, tester, or end"""
         HumanMessage(content=prompt),
     ]
 
+    # Start the likely next agent's call while routing (opt-in)
+    speculator = get_speculator()
+    speculator.speculate(state, config)
+
     # Get routing decision
-    response = llm.invoke(messages_to_send)
+    response = invoke_model("supervisor", config, llm, messages_to_send)
     next_agent = response.content.strip().lower()
 
     # Validate response
@@ -119,4 +137,6 @@ Respond with ONLY: architect, developer, reviewer, tester, or end"""
         else:
             next_agent = "architect"
 
-    return {"next_agent": next_agent}
+    speculator.resolve(config, next_agent)
+    hops = 0 if next_agent == "end" else 1
+    return {"next_agent": next_agent, "usage": usage_of(response, hops=hops)}
@@ -0,0 +1,247 @@
+"""Batch execution of many tasks against one shared compiled graph."""
+
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NotRequired, TypedDict
+
+from src.graph.budget import TaskUsage
+
+if TYPE_CHECKING:
+    from src.config.projects import ProjectRegistry
+    from src.graph.sessions import SessionManager
+    from src.llm.proxy_client import LLMClient
+
+# Default number of tasks run concurrently
+DEFAULT_CONCURRENCY = 4
+
+
+class BatchTask(TypedDict):
+    """A task entry of a batch file."""
+
+    task: str
+    id: NotRequired[str]
+    project: NotRequired[str]
+
+
+class BatchResult(TypedDict):
+    """Outcome of one batch task, written as a JSONL line."""
+
+    id: str
+    project: str | None
+    task: str
+    thread_id: str | None
+    status: str  # ok, error or cancelled
+    error: str | None
+    steps: list[str]
+    output: Any
+    started_at: str
+    duration_s: float
+    usage: TaskUsage | None
+    stop_reason: str | None  # Set when the task's budget ran out
+
+
+def load_tasks(path: str | Path) -> list[BatchTask]:
+    """Load tasks from a YAML or JSONL file.
+
+    YAML files hold a list (or a mapping with a 'tasks' list); JSONL files
+    hold one entry per line. An entry is a task string or a mapping with
+    'task' and optional 'id' and 'project'. Entries without an id are
+    numbered in file order.
+
+    Args:
+        path: Batch file path (.yaml, .yml or .jsonl)
+
+    Returns:
+        List of BatchTask entries
+
+    Raises:
+        ValueError: If the file format or an entry is invalid
+        OSError: If the file cannot be read
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix in (".yaml", ".yml"):
+        import yaml
+
+        try:
+            data = yaml.safe_load(text) or []
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid YAML in {path}: {e}") from e
+        if isinstance(data, dict):
+            data = data.get("tasks", [])
+    elif path.suffix == ".jsonl":
+        data = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        raise ValueError(f"Unsupported batch file: {path} (expected .yaml, .yml or .jsonl)")
+
+    if not isinstance(data, list):
+        raise ValueError(f"Batch file must contain a list of tasks: {path}")
+
+    tasks: list[BatchTask] = []
+    for index, entry in enumerate(data, start=1):
+        if isinstance(entry, str):
+            entry = {"task": entry}
+        if not isinstance(entry, dict) or not isinstance(entry.get("task"), str):
+            raise ValueError(f"Batch entry {index} in {path} needs a 'task' string")
+        item = BatchTask(task=entry["task"], id=str(entry.get("id", index)))
+        if entry.get("project"):
+            item["project"] = str(entry["project"])
+        tasks.append(item)
+    return tasks
+
+
+def run_one(
+    item: BatchTask,
+    registry: "ProjectRegistry",
+    graph: Any,
+    llm_client: "LLMClient",
+    tools: list[Any],
+    sessions: "SessionManager | None" = None,
+    cancel_event: threading.Event | None = None,
+) -> BatchResult:
+    """Run a batch task in its own thread and capture its outcome.
+
+    Args:
+        item: Batch task
+        registry: Project registry instance
+        graph: Compiled graph instance
+        llm_client: LLM client instance
+        tools: Available tools list
+        sessions: Session manager (optional, created from the graph's checkpointer)
+        cancel_event: Event shared by the batch; setting it cancels the task
+
+    Returns:
+        BatchResult; failures are recorded, not raised
+    """
+    from src.runner import stream_task
+
+    result = BatchResult(
+        id=item.get("id", ""),
+        project=item.get("project"),
+        task=item["task"],
+        thread_id=None,
+        status="ok",
+        error=None,
+        steps=[],
+        output=None,
+        started_at=datetime.now(UTC).isoformat(),
+        duration_s=0.0,
+        usage=None,
+        stop_reason=None,
+    )
+    start = time.perf_counter()
+    try:
+        project = item.get("project")
+        if project and project not in registry.list_names():
+            raise ValueError(f"Project not found: {project}")
+        for event in stream_task(
+            item["task"],
+            project,
+            registry,
+            graph,
+            llm_client,
+            tools,
+            sessions=sessions,
+            cancel_event=cancel_event,
+        ):
+            if event["event"] == "start":
+                result["thread_id"] = event["thread_id"]
+                result["project"] = event["project"]
+            elif event["event"] == "node":
+                result["steps"].append(event["node"])
+                if "message" in event:
+                    result["output"] = event["message"]
+            elif event["event"] == "done":
+                result["usage"] = event.get("usage")
+                result["stop_reason"] = event.get("stop_reason") or None
+            elif event["event"] == "cancelled":
+                result["status"] = "cancelled"
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["duration_s"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def run_batch(
+    tasks: list[BatchTask],
+    registry: "ProjectRegistry",
+    graph: Any,
+    llm_client: "LLMClient",
+    tools: list[Any],
+    output: str | Path,
+    concurrency: int | None = None,
+    sessions: "SessionManager | None" = None,
+    on_result: Callable[[BatchResult], None] | None = None,
+) -> list[BatchResult]:
+    """Run tasks concurrently and append each result to a JSONL file.
+
+    Every task runs in a fresh thread_id against the shared compiled graph.
+    Results are written as tasks finish, so a partially completed batch
+    still leaves usable output. On Ctrl-C, queued tasks are dropped, running
+    ones are cancelled and recorded, and KeyboardInterrupt is re-raised.
+
+    Args:
+        tasks: Tasks to run
+        registry: Project registry instance
+        graph: Compiled graph instance
+        llm_client: LLM client instance
+        tools: Available tools list
+        output: JSONL results file (parent directories are created)
+        concurrency: Tasks run at once (default from env: BATCH_CONCURRENCY, 4)
+        sessions: Session manager (optional, created from the graph's checkpointer)
+        on_result: Callback for each finished task, e.g. progress output
+
+    Returns:
+        BatchResult list in task order
+
+    Raises:
+        KeyboardInterrupt: If interrupted, after recording the tasks that ran
+    """
+    if concurrency is None:
+        concurrency = int(os.getenv("BATCH_CONCURRENCY", str(DEFAULT_CONCURRENCY)))
+    concurrency = max(concurrency, 1)
+
+    output_path = Path(output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    results: dict[int, BatchResult] = {}
+    cancel_event = threading.Event()
+
+    with (
+        output_path.open("a", encoding="utf-8") as out,
+        ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch") as pool,
+    ):
+        futures = {
+            pool.submit(
+                run_one, item, registry, graph, llm_client, tools, sessions, cancel_event
+            ): index
+            for index, item in enumerate(tasks)
+        }
+
+        def record(future: Future[BatchResult]) -> None:
+            result = future.result()
+            results[futures[future]] = result
+            out.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+            out.flush()
+            if on_result:
+                on_result(result)
+
+        try:
+            for future in as_completed(futures):
+                record(future)
+        except KeyboardInterrupt:
+            # Running tasks see the event at their next model call poll and stop
+            cancel_event.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+            for future, index in futures.items():
+                if index not in results and not future.cancelled():
+                    record(future)
+            raise
+
+    return [results[index] for index in range(len(tasks))]
@@ -0,0 +1,147 @@
+"""Thin client for submitting tasks to a running LangGraphX server.
+
+Only uses the standard library so the CLI can check for a server and stream
+a task without importing LangGraph.
+"""
+
+import http.client
+import json
+import os
+import socket
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from src.runner import TaskEvent
+
+# Default server address: a Unix socket next to the checkpoint database
+DEFAULT_ADDRESS = "unix:.langgraphx/server.sock"
+
+
+def get_server_address() -> str:
+    """Get the server address (env: LANGGRAPHX_SERVER).
+
+    Returns:
+        'unix:<path>' or 'http://<host>:<port>'
+    """
+    return os.getenv("LANGGRAPHX_SERVER", DEFAULT_ADDRESS)
+
+
+def parse_address(address: str) -> tuple[str, Any]:
+    """Parse a server address.
+
+    Args:
+        address: 'unix:<path>', 'unix://<path>' or 'http://<host>:<port>'
+
+    Returns:
+        ('unix', path) or ('http', (host, port))
+
+    Raises:
+        ValueError: If the address is malformed
+    """
+    if address.startswith("unix:"):
+        path = address[len("unix:") :]
+        return "unix", path[2:] if path.startswith("//") else path
+    if address.startswith("http://"):
+        host, _, port = address[len("http://") :].rstrip("/").rpartition(":")
+        if not host or not port.isdigit():
+            raise ValueError(f"Invalid server address: {address}")
+        return "http", (host, int(port))
+    raise ValueError(
+        f"Invalid server address: {address} (expected unix:<path> or http://host:port)"
+    )
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix domain socket."""
+
+    def __init__(self, path: str, timeout: float | None = None) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+def _connect(address: str, timeout: float | None) -> http.client.HTTPConnection:
+    kind, target = parse_address(address)
+    if kind == "unix":
+        return _UnixHTTPConnection(target, timeout=timeout)
+    host, port = target
+    return http.client.HTTPConnection(host, port, timeout=timeout)
+
+
+def _request(
+    address: str, method: str, path: str, body: Any = None, timeout: float | None = 10.0
+) -> dict[str, Any]:
+    conn = _connect(address, timeout)
+    try:
+        payload = json.dumps(body).encode() if body is not None else None
+        conn.request(method, path, body=payload, headers={"Content-Type": "application/json"})
+        response = conn.getresponse()
+        data = json.loads(response.read() or b"{}")
+        if response.status >= 400:
+            raise RuntimeError(data.get("error", f"Server returned HTTP {response.status}"))
+        return data  # type: ignore[no-any-return]
+    finally:
+        conn.close()
+
+
+def is_server_running(address: str | None = None) -> bool:
+    """Check whether a server answers at the address.
+
+    Args:
+        address: Server address (default from env: LANGGRAPHX_SERVER)
+
+    Returns:
+        True if the server's health check succeeds
+    """
+    address = address or get_server_address()
+    kind, target = parse_address(address)
+    if kind == "unix" and not os.path.exists(target):
+        return False
+    try:
+        return _request(address, "GET", "/health", timeout=0.5).get("status") == "ok"
+    except (OSError, RuntimeError, ValueError):
+        return False
+
+
+def submit_task(
+    task: str,
+    project: str | None = None,
+    session: str | None = None,
+    address: str | None = None,
+) -> Iterator["TaskEvent"]:
+    """Submit a task and stream its events as they happen.
+
+    Args:
+        task: Task description
+        project: Project name (optional, server uses its first project)
+        session: Existing thread ID to continue (optional)
+        address: Server address (default from env: LANGGRAPHX_SERVER)
+
+    Yields:
+        TaskEvent dictionaries, ending with 'done' or 'error'
+
+    Raises:
+        RuntimeError: If the server rejects the task
+        ConnectionError: If the server cannot be reached
+    """
+    # No read timeout: agent steps can take minutes
+    conn = _connect(address or get_server_address(), timeout=None)
+    try:
+        body = json.dumps({"task": task, "project": project, "session": session}).encode()
+        conn.request("POST", "/tasks", body=body, headers={"Content-Type": "application/json"})
+        response = conn.getresponse()
+        if response.status >= 400:
+            error = json.loads(response.read() or b"{}").get("error")
+            raise RuntimeError(error or f"Server returned HTTP {response.status}")
+        for line in response:
+            if line.strip():
+                yield json.loads(line)
+    except OSError as e:
+        raise ConnectionError(f"Lost connection to LangGraphX server: {e}") from e
+    finally:
+        conn.close()
@@ -0,0 +1,86 @@
+"""Shared, read-only project context referenced from workflow state."""
+
+import hashlib
+import json
+import threading
+from typing import TYPE_CHECKING
+
+from src.config.schema import ProjectContext
+
+if TYPE_CHECKING:
+    from langchain_core.runnables import RunnableConfig
+
+    from src.graph.state import MultiProjectState
+
+
+def context_ref(name: str, context: ProjectContext) -> str:
+    """Build the reference for a project context.
+
+    Args:
+        name: Project name
+        context: Project context
+
+    Returns:
+        Reference of the form '<name>@<config hash>'
+    """
+    encoded = json.dumps(context, sort_keys=True, default=str).encode()
+    return f"{name}@{hashlib.sha256(encoded).hexdigest()[:12]}"
+
+
+class ProjectContextStore:
+    """Process-wide store of project contexts keyed by name and config hash.
+
+    Workflow state only carries the reference string, so checkpoints and state
+    copies stay small. A changed config gets a new reference while runs that
+    started on the old one keep resolving it. Stored contexts are shared
+    between runs and must not be mutated.
+    """
+
+    def __init__(self) -> None:
+        self._contexts: dict[str, ProjectContext] = {}
+        self._lock = threading.Lock()
+
+    def put(self, name: str, context: ProjectContext) -> str:
+        """Store a project context.
+
+        Args:
+            name: Project name
+            context: Project context
+
+        Returns:
+            Reference to pass in state
+        """
+        ref = context_ref(name, context)
+        with self._lock:
+            self._contexts.setdefault(ref, context)
+        return ref
+
+    def get(self, ref: str) -> ProjectContext | None:
+        """Resolve a reference.
+
+        Args:
+            ref: Reference returned by put
+
+        Returns:
+            ProjectContext, or None if unknown
+        """
+        return self._contexts.get(ref)
+
+
+def get_project_context(
+    state: MultiProjectState, config: RunnableConfig
+) -> ProjectContext | None:
+    """Resolve the project context of the current run.
+
+    Args:
+        state: Current workflow state
+        config: Runnable configuration carrying the 'project_contexts' store
+
+    Returns:
+        ProjectContext, or None if no project is selected
+    """
+    ref = state.get("project_ref")
+    store = config.get("configurable", {}).get("project_contexts")
+    if not ref or store is None:
+        return None
+    return store.get(ref)
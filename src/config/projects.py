@@ -1,78 +1,256 @@
 """Project registry for managing multi-project configurations."""
 
+import json
 import os
+import threading
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
 import yaml
 
-from src.graph.state import ProjectContext, ProjectInfo
+from src.config.context import ProjectContextStore
+from src.config.schema import ProjectContext, ProjectInfo
+from src.graph.budget import validate_budget
+from src.llm.roles import validate_models
+
+# libyaml-backed loader is several times faster; fall back to pure Python
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Bump when the snapshot layout changes
+SNAPSHOT_VERSION = 1
+
+REQUIRED_FIELDS = ["name", "type", "description", "path", "tech_stack", "tools"]
+
+
+def file_fingerprint(path: Path) -> list[int] | None:
+    """Get the (mtime_ns, size) fingerprint of a file, or None if absent."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
 
 
 class ProjectRegistry:
-    """Registry for managing project configurations."""
+    """Registry for managing project configurations.
+
+    Projects are discovered eagerly (one directory listing) but parsed lazily
+    on first use. Parsed configs are kept in a JSON snapshot keyed by file
+    mtime and size, so warm startups skip YAML parsing entirely. A project
+    with a broken config or a missing path is reported via `errors()` and
+    does not affect the others.
+    """
 
-    def __init__(self, projects_dir: str | Path = "projects") -> None:
+    def __init__(
+        self,
+        projects_dir: str | Path = "projects",
+        cache_path: str | Path | None = None,
+        use_cache: bool = True,
+    ) -> None:
         """Initialize project registry.
 
         Args:
             projects_dir: Directory containing project configurations
+            cache_path: Snapshot file (default: .langgraphx/projects-cache.json
+                next to projects_dir)
+            use_cache: Whether to read and write the snapshot
         """
         self.projects_dir = Path(projects_dir)
+        self.cache_path = (
+            Path(cache_path)
+            if cache_path
+            else self.projects_dir.parent / ".langgraphx" / "projects-cache.json"
+        )
+        self.use_cache = use_cache
         self._projects: dict[str, ProjectInfo] = {}
         self._examples: dict[str, dict[str, Any]] = {}
-
-        # Auto-discover and load projects
+        self._errors: dict[str, str] = {}
+        self._names: list[str] = []
+        self._snapshot: dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self._reload_listeners: list[Callable[[str], None]] = []
+        self.contexts = ProjectContextStore()
+
+        # Discover project names; configs are parsed on first access
         self._discover_projects()
+        self._snapshot = self._read_snapshot()
 
     def _discover_projects(self) -> None:
-        """Discover and load all projects from projects directory."""
+        """Discover projects (directories with a config.yaml) without parsing them."""
         if not self.projects_dir.exists():
             return
 
-        for project_dir in self.projects_dir.iterdir():
-            if project_dir.is_dir():
-                config_file = project_dir / "config.yaml"
-                if config_file.exists():
-                    self._load_project(project_dir.name)
+        self._names = sorted(
+            entry.name
+            for entry in os.scandir(self.projects_dir)
+            if entry.is_dir() and (Path(entry.path) / "config.yaml").exists()
+        )
 
-    def _load_project(self, name: str) -> None:
-        """Load project configuration and examples.
+    def _read_snapshot(self) -> dict[str, Any]:
+        """Read the compiled config snapshot, ignoring missing or stale formats."""
+        if not self.use_cache:
+            return {}
+        try:
+            snapshot = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            return {}
+        projects: dict[str, Any] = snapshot.get("projects", {})
+        return projects
+
+    def _write_snapshot(self) -> None:
+        """Atomically write the compiled config snapshot."""
+        if not self.use_cache:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(
+                json.dumps({"version": SNAPSHOT_VERSION, "projects": self._snapshot})
+            )
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            # The snapshot is only an accelerator
+            pass
+
+    def _parse_project(self, name: str) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Get raw config and examples, from the snapshot when files are unchanged.
 
         Args:
             name: Project name
+
+        Returns:
+            Tuple of (config, examples)
         """
         project_dir = self.projects_dir / name
         config_file = project_dir / "config.yaml"
         examples_file = project_dir / "examples.yaml"
+        files = {
+            "config": file_fingerprint(config_file),
+            "examples": file_fingerprint(examples_file),
+        }
 
-        # Load config
-        with open(config_file, "r") as f:
-            config = yaml.safe_load(f)
+        cached = self._snapshot.get(name)
+        if cached and cached["files"] == files:
+            return cached["config"], cached["examples"]
 
-        # Validate required fields
-        required_fields = ["name", "type", "description", "path", "tech_stack", "tools"]
-        for field in required_fields:
-            if field not in config:
-                raise ValueError(f"Project {name} missing required field: {field}")
+        with open(config_file) as f:
+            config = yaml.load(f, Loader=YamlLoader)
+        if not isinstance(config, dict):
+            raise ValueError(f"Project {name} config is not a mapping: {config_file}")
 
-        # Validate project path exists
-        project_path = Path(config["path"])
-        if not project_path.exists():
-            raise ValueError(
-                f"Project path does not exist: {config['path']}\n"
-                f"Please ensure the project is cloned or update the path in {config_file}"
-            )
+        examples: dict[str, Any] = {}
+        if files["examples"] is not None:
+            with open(examples_file) as f:
+                examples = yaml.load(f, Loader=YamlLoader) or {}
+
+        self._snapshot[name] = {"files": files, "config": config, "examples": examples}
+        self._write_snapshot()
+        return config, examples
+
+    def _load_project(self, name: str) -> None:
+        """Load and validate project configuration and examples.
+
+        Failures are recorded in the error report instead of raised. A project
+        that loaded before keeps its last good config and examples, so a broken
+        edit does not take it offline.
+
+        Args:
+            name: Project name
+        """
+        config_file = self.projects_dir / name / "config.yaml"
+        try:
+            config, examples = self._parse_project(name)
+            config = dict(config)
+
+            # Validate required fields
+            for field in REQUIRED_FIELDS:
+                if field not in config:
+                    raise ValueError(f"Project {name} missing required field: {field}")
+
+            # Validate per-role model overrides and budget limits
+            if "models" in config:
+                config["models"] = validate_models(config["models"])
+            if "budget" in config:
+                config["budget"] = validate_budget(config["budget"])
+
+            # Validate project path exists (not cached: the checkout may appear later)
+            project_path = Path(config["path"])
+            if not project_path.exists():
+                raise ValueError(
+                    f"Project path does not exist: {config['path']}\n"
+                    f"Please ensure the project is cloned or update the path in {config_file}"
+                )
+        except (OSError, ValueError, yaml.YAMLError) as e:
+            with self._lock:
+                self._errors[name] = str(e)
+            return
 
         # Resolve symlinks to get real path
         config["path"] = str(project_path.resolve())
 
-        self._projects[name] = ProjectInfo(**config)
+        # Swap info and examples together so readers never see a mix
+        with self._lock:
+            self._projects[name] = ProjectInfo(**config)
+            self._examples[name] = examples
+            self._errors.pop(name, None)
 
-        # Load examples if available
-        if examples_file.exists():
-            with open(examples_file, "r") as f:
-                self._examples[name] = yaml.safe_load(f) or {}
+    def _ensure_loaded(self, name: str) -> None:
+        """Load a discovered project on first access."""
+        if name in self._projects or name in self._errors or name not in self._names:
+            return
+        with self._lock:
+            if name not in self._projects and name not in self._errors:
+                self._load_project(name)
+
+    def _ensure_all_loaded(self) -> None:
+        """Load every discovered project."""
+        for name in self._names:
+            self._ensure_loaded(name)
+
+    def add_reload_listener(self, listener: Callable[[str], None]) -> None:
+        """Register a callback invoked with the project name after a reload.
+
+        Use it to drop caches derived from a project's config or examples.
+
+        Args:
+            listener: Callable taking the reloaded project's name
+        """
+        self._reload_listeners.append(listener)
+
+    def reload_project(self, name: str) -> None:
+        """Re-read one project's files and atomically replace its entry.
+
+        A project whose directory or config.yaml disappeared is removed.
+
+        Args:
+            name: Project name
+        """
+        with self._lock:
+            if (self.projects_dir / name / "config.yaml").exists():
+                if name not in self._names:
+                    self._names = sorted([*self._names, name])
+                self._load_project(name)
+            else:
+                self._names = [n for n in self._names if n != name]
+                self._projects.pop(name, None)
+                self._examples.pop(name, None)
+                self._errors.pop(name, None)
+                self._snapshot.pop(name, None)
+
+        for listener in self._reload_listeners:
+            listener(name)
+
+    def errors(self) -> dict[str, str]:
+        """Get projects that failed to load.
+
+        Returns:
+            Mapping of project name to error message
+        """
+        self._ensure_all_loaded()
+        return dict(self._errors)
 
     def register(self, name: str, path: str) -> ProjectInfo:
         """Register a new project by detecting its type and creating config.
@@ -115,21 +293,26 @@ class ProjectRegistry:
             name: Project name
 
         Returns:
-            ProjectInfo for the project
+            ProjectInfo for the project (the last good one if a reload failed)
 
         Raises:
             KeyError: If project not found
+            ValueError: If the project's configuration is invalid and never loaded
         """
-        if name not in self._projects:
-            raise KeyError(f"Project '{name}' not found. Available: {list(self._projects.keys())}")
-        return self._projects[name]
+        self._ensure_loaded(name)
+        if name in self._projects:
+            return self._projects[name]
+        if name in self._errors:
+            raise ValueError(self._errors[name])
+        raise KeyError(f"Project '{name}' not found. Available: {self.list_names()}")
 
     def list(self) -> list[ProjectInfo]:
-        """List all registered projects.
+        """List all registered projects that loaded successfully.
 
         Returns:
-            List of all ProjectInfo objects
+            List of all valid ProjectInfo objects
         """
+        self._ensure_all_loaded()
         return list(self._projects.values())
 
     def detect_type(self, path: str) -> str:
@@ -170,7 +353,7 @@ class ProjectRegistry:
         Returns:
             Raw configuration dictionary
         """
-        return dict(self._projects[name])
+        return dict(self.get(name))
 
     def load_context(self, name: str) -> ProjectContext:
         """Load complete project context including examples.
@@ -183,22 +366,37 @@ class ProjectRegistry:
 
         Raises:
             KeyError: If project not found
+            ValueError: If the project's configuration is invalid
         """
-        if name not in self._projects:
-            raise KeyError(f"Project '{name}' not found")
+        with self._lock:
+            info = self.get(name)
+            return ProjectContext(
+                info=info,
+                examples=self._examples.get(name, {}),
+            )
 
-        return ProjectContext(
-            info=self._projects[name],
-            examples=self._examples.get(name, {}),
-        )
+    def context_ref(self, name: str) -> str:
+        """Publish a project's context to the shared store and get its reference.
+
+        Args:
+            name: Project name
+
+        Returns:
+            Reference to place in workflow state
+
+        Raises:
+            KeyError: If project not found
+        """
+        return self.contexts.put(name, self.load_context(name))
 
     def list_names(self) -> list[str]:
-        """Get list of all project names.
+        """Get list of all project names, including ones not yet loaded.
 
         Returns:
             List of project names
         """
-        return list(self._projects.keys())
+        registered = [n for n in self._projects if n not in self._names]
+        return [*self._names, *registered]
 
 
 def create_project_registry(projects_dir: str | Path = "projects") -> ProjectRegistry:
@@ -0,0 +1,44 @@
+"""Project configuration types."""
+
+from typing import Any, NotRequired, TypedDict
+
+
+class ModelSettings(TypedDict, total=False):
+    """Model parameters for an agent role."""
+
+    model: str
+    max_tokens: int
+    temperature: float
+
+
+class BudgetLimits(TypedDict, total=False):
+    """Per-task limits; 0 disables a limit."""
+
+    max_hops: int  # Agent dispatches by the supervisor
+    max_input_tokens: int
+    max_output_tokens: int
+    max_seconds: float  # Wall-clock time of the task
+
+
+class ProjectInfo(TypedDict):
+    """Project metadata."""
+
+    name: str
+    type: str  # rust, elixir, python, etc.
+    description: str
+    path: str
+    tech_stack: dict[str, Any]
+    tools: dict[str, str]
+    conventions: list[str]
+    coding_standards: dict[str, Any]
+    test_framework: str
+    coverage_target: int
+    models: NotRequired[dict[str, ModelSettings]]  # Per-role model overrides
+    budget: NotRequired[BudgetLimits]  # Per-task budget overrides
+
+
+class ProjectContext(TypedDict):
+    """Project-specific context for agents."""
+
+    info: ProjectInfo
+    examples: dict[str, Any]  # Few-shot examples loaded from examples.yaml
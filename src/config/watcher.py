@@ -0,0 +1,117 @@
+"""Hot reload of project configurations via file watching."""
+
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from src.config.projects import ProjectRegistry, file_fingerprint
+
+# Files whose changes trigger a project reload
+WATCHED_FILES = ("config.yaml", "examples.yaml")
+
+
+class ProjectWatcher:
+    """Watch the projects directory and reload projects whose files change.
+
+    Uses watchfiles (inotify/FSEvents) when it is installed and falls back to
+    polling file fingerprints otherwise. Only the changed project is reloaded;
+    long-running processes keep serving the other projects throughout.
+    """
+
+    def __init__(self, registry: ProjectRegistry, interval: float | None = None) -> None:
+        """Initialize project watcher.
+
+        Args:
+            registry: Registry to reload
+            interval: Polling interval in seconds (default from env:
+                PROJECTS_WATCH_INTERVAL, 1.0)
+        """
+        self.registry = registry
+        self.interval = (
+            interval
+            if interval is not None
+            else float(os.getenv("PROJECTS_WATCH_INTERVAL", "1.0"))
+        )
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._fingerprints: dict[str, Any] = {}
+
+    def _project_of(self, path: str | Path) -> str | None:
+        """Map a changed file to its project name."""
+        try:
+            relative = Path(path).resolve().relative_to(self.registry.projects_dir.resolve())
+        except ValueError:
+            return None
+        if len(relative.parts) == 1 or relative.name in WATCHED_FILES:
+            return relative.parts[0]
+        return None
+
+    def _scan(self) -> dict[str, Any]:
+        """Fingerprint the watched files of every project directory."""
+        fingerprints: dict[str, Any] = {}
+        projects_dir = self.registry.projects_dir
+        if not projects_dir.exists():
+            return fingerprints
+        for entry in os.scandir(projects_dir):
+            if entry.is_dir():
+                fingerprints[entry.name] = [
+                    file_fingerprint(Path(entry.path) / name) for name in WATCHED_FILES
+                ]
+        return fingerprints
+
+    def poll(self) -> set[str]:
+        """Reload projects changed since the previous poll.
+
+        Returns:
+            Names of reloaded projects
+        """
+        current = self._scan()
+        changed = {
+            name
+            for name in current.keys() | self._fingerprints.keys()
+            if current.get(name) != self._fingerprints.get(name)
+        }
+        self._fingerprints = current
+        for name in sorted(changed):
+            self.registry.reload_project(name)
+        return changed
+
+    def _run_polling(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def _run_watchfiles(self) -> None:
+        import watchfiles
+
+        for changes in watchfiles.watch(
+            self.registry.projects_dir, stop_event=self._stop, debounce=int(self.interval * 1000)
+        ):
+            projects = {self._project_of(path) for _change, path in changes}
+            for name in sorted(p for p in projects if p):
+                self.registry.reload_project(name)
+
+    def start(self) -> None:
+        """Start watching in a daemon thread."""
+        if self._thread is not None:
+            return
+
+        try:
+            import watchfiles  # noqa: F401
+
+            target = self._run_watchfiles
+        except ImportError:
+            # Baseline for change detection
+            self._fingerprints = self._scan()
+            target = self._run_polling
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=target, name="project-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
@@ -0,0 +1,167 @@
+"""Per-task budgets for hops, tokens and wall-clock time.
+
+Every task gets limits from env defaults, overridden by the project's
+config.yaml `budget:` section. Nodes report their model usage into state,
+the supervisor counts a hop for every agent it dispatches, and routing ends
+the task once any limit is used up.
+"""
+
+import os
+import time
+from typing import Any, TypedDict
+
+from src.config.schema import BudgetLimits, ProjectInfo
+
+# Env variables holding the default limits
+_LIMITS = {
+    "max_hops": ("TASK_MAX_HOPS", "15", int),
+    "max_input_tokens": ("TASK_MAX_INPUT_TOKENS", "0", int),
+    "max_output_tokens": ("TASK_MAX_OUTPUT_TOKENS", "0", int),
+    "max_seconds": ("TASK_MAX_SECONDS", "0", float),
+}
+
+
+class TaskUsage(TypedDict):
+    """Resources a task has used so far."""
+
+    hops: int
+    input_tokens: int
+    output_tokens: int
+
+
+def default_limits() -> BudgetLimits:
+    """Get the default per-task limits.
+
+    Env:
+        TASK_MAX_HOPS: Agent dispatches per task (default 15)
+        TASK_MAX_INPUT_TOKENS: Input tokens per task (default 0, unlimited)
+        TASK_MAX_OUTPUT_TOKENS: Output tokens per task (default 0, unlimited)
+        TASK_MAX_SECONDS: Wall-clock seconds per task (default 0, unlimited)
+
+    Returns:
+        BudgetLimits with every limit set
+    """
+    return BudgetLimits(
+        **{key: cast(os.getenv(env, default)) for key, (env, default, cast) in _LIMITS.items()}
+    )
+
+
+def validate_budget(budget: Any) -> BudgetLimits:
+    """Validate a `budget` section of a project config.
+
+    Args:
+        budget: Raw value from config.yaml
+
+    Returns:
+        Validated limits
+
+    Raises:
+        ValueError: If a limit is unknown, not a number, or negative
+    """
+    if not isinstance(budget, dict):
+        raise ValueError("budget must be a mapping of limit to value")
+    for key, value in budget.items():
+        if key not in _LIMITS:
+            raise ValueError(f"Unknown budget limit: {key} (expected one of {', '.join(_LIMITS)})")
+        expected = _LIMITS[key][2]
+        numeric = expected is float and isinstance(value, int)
+        if isinstance(value, bool) or not (isinstance(value, expected) or numeric) or value < 0:
+            raise ValueError(f"budget.{key} must be a non-negative {expected.__name__}")
+    return budget
+
+
+def budget_limits(project_info: ProjectInfo | None = None) -> BudgetLimits:
+    """Resolve a task's limits.
+
+    Args:
+        project_info: Project whose `budget` section overrides the defaults (optional)
+
+    Returns:
+        BudgetLimits with every limit set
+    """
+    limits = default_limits()
+    limits.update((project_info or {}).get("budget", {}))
+    return limits
+
+
+def usage_of(response: Any, hops: int = 0) -> TaskUsage:
+    """Get the usage a node adds to its task.
+
+    Args:
+        response: Model response (usage_metadata is read if present)
+        hops: Agent dispatches made by the node
+
+    Returns:
+        TaskUsage
+    """
+    usage = getattr(response, "usage_metadata", None) or {}
+    return TaskUsage(
+        hops=hops,
+        input_tokens=int(usage.get("input_tokens", 0)),
+        output_tokens=int(usage.get("output_tokens", 0)),
+    )
+
+
+def add_usage(current: TaskUsage | None, update: TaskUsage | None) -> TaskUsage:
+    """Sum task usage; None resets it (at the start of a task)."""
+    if update is None:
+        return TaskUsage(hops=0, input_tokens=0, output_tokens=0)
+    current = current or TaskUsage(hops=0, input_tokens=0, output_tokens=0)
+    return TaskUsage(
+        hops=current["hops"] + update["hops"],
+        input_tokens=current["input_tokens"] + update["input_tokens"],
+        output_tokens=current["output_tokens"] + update["output_tokens"],
+    )
+
+
+def check_budget(state: Any, next_hop: bool = False) -> str | None:
+    """Check whether a task has used up its budget.
+
+    Args:
+        state: Workflow state with 'budget', 'usage' and 'started_at'
+        next_hop: Also count a dispatch about to be made
+
+    Returns:
+        Reason the task must stop, or None while within budget
+    """
+    limits = state.get("budget") or {}
+    usage = state.get("usage") or {}
+
+    max_hops = limits.get("max_hops", 0)
+    hops = usage.get("hops", 0) + (1 if next_hop else 0)
+    if max_hops and hops > max_hops:
+        return f"hop budget exhausted ({max_hops} hops)"
+
+    for key, label in (("input_tokens", "input token"), ("output_tokens", "output token")):
+        limit = limits.get(f"max_{key}", 0)
+        if limit and usage.get(key, 0) >= limit:
+            return f"{label} budget exhausted ({usage[key]}/{limit})"
+
+    max_seconds = limits.get("max_seconds", 0)
+    started_at = state.get("started_at")
+    if max_seconds and started_at and time.time() - started_at >= max_seconds:
+        return f"time budget exhausted ({max_seconds:g}s)"
+    return None
+
+
+def format_usage(usage: TaskUsage, limits: BudgetLimits, elapsed: float) -> str:
+    """Render usage against limits for the end-of-task report.
+
+    Args:
+        usage: Task usage
+        limits: Task limits
+        elapsed: Wall-clock seconds
+
+    Returns:
+        One-line summary, e.g. '3/15 hops, 1200 in / 300 out tokens, 4.2s'
+    """
+
+    def of(value: str, limit: float) -> str:
+        return f"{value}/{limit}" if limit else value
+
+    return (
+        f"{of(str(usage['hops']), limits.get('max_hops', 0))} hops, "
+        f"{of(str(usage['input_tokens']), limits.get('max_input_tokens', 0))} in / "
+        f"{of(str(usage['output_tokens']), limits.get('max_output_tokens', 0))} out tokens, "
+        f"{of(f'{elapsed:.1f}', limits.get('max_seconds', 0))}s"
+    )
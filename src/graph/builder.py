@@ -1,22 +1,34 @@
 """LangGraph workflow builder."""
 
+import os
+import threading
+from collections.abc import Callable
 from typing import Any, Literal
 
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, StateGraph
+from langgraph.graph.state import CompiledStateGraph
+from langgraph.types import Send
 
 from src.agents.architect import architect_node
-from src.agents.developer import developer_node
+from src.agents.developer import developer_node, developer_worker_node
+from src.agents.plan import merge_plan_node
 from src.agents.reviewer import reviewer_node
 from src.agents.supervisor import supervisor_node
 from src.agents.tester import tester_node
+from src.graph.budget import check_budget
 from src.graph.checkpointer import create_checkpointer
-from src.graph.state import MultiProjectState
-from src.llm.proxy_client import LLMClient
+from src.graph.state import MultiProjectState, PlanWorkerState
+from src.metrics import instrument_node
+from src.profiling import profile_node
 from src.tools.file_tools import get_file_tools
 from src.tools.git_tools import get_git_tools
 
-# Maximum iterations to prevent infinite loops
-MAX_ITERATIONS = 15
+
+def _add_node(workflow: StateGraph, name: str, node: Callable[..., Any]) -> None:
+    """Add a node, timed by the metrics registry and profiled when those are on."""
+    workflow.add_node(name, instrument_node(name, profile_node(name, node)))
 
 
 def route_to_agent(
@@ -27,15 +39,13 @@ def route_to_agent(
     Args:
         state: Current workflow state
 
-    # Check iteration count to prevent infinite loops
-    messages = state.get("messages", [])
-    if len(messages) > MAX_ITERATIONS:
-        print(f"\n⚠️  Maximum iterations ({MAX_ITERATIONS}) reached. Stopping workflow.\n")
-        return "__end__"
-
     Returns:
         Name of next agent or END
     """
+    # Stop runaway loops once the task's hop, token or time budget is used up
+    if check_budget(state):
+        return "__end__"
+
     next_agent = state.get("next_agent", "")
 
     if not next_agent or next_agent == "end":
@@ -50,30 +60,80 @@ def route_to_agent(
     return "__end__"
 
 
-def build_graph(llm_client: LLMClient) -> CompiledGraph:
-    """Build and compile the LangGraph worAny
+def route_with_plan(state: MultiProjectState) -> str | list[Send]:
+    """Route like route_to_agent, mapping a multi-file plan onto developer workers.
 
     Args:
-        llm_client: LLM client for agents
+        state: Current workflow state
 
     Returns:
-        Compiled graph ready for execution
+        Name of next agent or END, or one worker Send per plan step when the
+        supervisor picks the developer and the plan has several steps
+    """
+    next_agent = route_to_agent(state)
+    plan = state.get("plan") or []
+    if next_agent != "developer" or len(plan) < 2:
+        return next_agent
+
+    # Workers get the same context the developer would; concurrency is bounded
+    # by the run's max_concurrency
+    return [
+        Send(
+            "developer_worker",
+            PlanWorkerState(
+                messages=state.get("messages", []),
+                current_project=state["current_project"],
+                project_ref=state["project_ref"],
+                task=state.get("task", ""),
+                step=step,
+                index=index,
+                total=len(plan),
+            ),
+        )
+        for index, step in enumerate(plan)
+    ]
+
+
+def add_plan_workers(workflow: StateGraph) -> None:
+    """Add the map (developer workers) and reduce (merge) nodes for plans.
+
+    Args:
+        workflow: Workflow to extend
+    """
+    _add_node(workflow, "developer_worker", developer_worker_node)
+    _add_node(workflow, "merge_plan", merge_plan_node)
+
+    # Merge runs once all workers of the step have finished
+    workflow.add_edge("developer_worker", "merge_plan")
+    workflow.add_edge("merge_plan", "supervisor")
+
+
+def build_workflow() -> StateGraph:
+    """Build the (uncompiled) multi-agent workflow.
+
+    Returns:
+        StateGraph with agent nodes and routing edges
     """
     # Create workflow
     workflow = StateGraph(MultiProjectState)
 
     # Add agent nodes
-    workflow.add_node("supervisor", supervisor_node)
-    workflow.add_node("architect", architect_node)
-    workflow.add_node("developer", developer_node)
-    workflow.add_node("reviewer", reviewer_node)
-    workflow.add_node("tester", tester_node)
+    _add_node(workflow, "supervisor", supervisor_node)
+    _add_node(workflow, "architect", architect_node)
+    _add_node(workflow, "developer", developer_node)
+    _add_node(workflow, "reviewer", reviewer_node)
+    _add_node(workflow, "tester", tester_node)
 
     # Set entry point
     workflow.set_entry_point("supervisor")
 
-    # Add routing edges from supervisor
-    workflow.add_conditional_edges("supervisor", route_to_agent)
+    # Add routing edges from supervisor (multi-file plans fan out to workers)
+    add_plan_workers(workflow)
+    workflow.add_conditional_edges(
+        "supervisor",
+        route_with_plan,
+        ["architect", "developer", "reviewer", "tester", "developer_worker", END],
+    )
 
     # Add edges back to supervisor from agents for multi-step workflows
     # Architect investigates -> routes back to supervisor for next action
@@ -88,25 +148,180 @@ def build_graph(llm_client: LLMClient) -> CompiledGraph:
     # Tester tests -> can report issues or pass (end)
     workflow.add_edge("tester", "supervisor")
 
+    return workflow
+
+
+# Agents that check the developer's changes independently of each other
+VERIFIERS = ("reviewer", "tester")
+
+
+def route_with_fan_out(state: MultiProjectState) -> str | list[str] | list[Send]:
+    """Route like route_with_plan, sending review and testing out together.
+
+    Args:
+        state: Current workflow state
+
+    Returns:
+        Name of next agent or END, or both verifiers when either is chosen
+    """
+    next_agent = route_with_plan(state)
+    if next_agent in VERIFIERS:
+        return list(VERIFIERS)
+    return next_agent
+
+
+def _branch(node: Callable[..., dict[str, Any]]) -> Callable[..., dict[str, Any]]:
+    """Wrap an agent node to run as one of several parallel branches.
+
+    Parallel branches may not write the same single-value channel in one
+    step, so only their messages and usage (both reduced) are kept; the join
+    resets next_agent.
+    """
+
+    def branch(state: MultiProjectState, config: RunnableConfig) -> dict[str, Any]:
+        update = node(state, config)
+        return {key: update[key] for key in ("messages", "usage") if key in update}
+
+    return branch
+
+
+def join_findings(state: MultiProjectState) -> dict[str, str]:
+    """Wait for all parallel verifiers before the supervisor decides.
+
+    Both verifiers' messages are already merged into state by the messages
+    reducer, in node order.
+
+    Args:
+        state: Current workflow state
+
+    Returns:
+        Dictionary clearing 'next_agent'
+    """
+    return {"next_agent": ""}
+
+
+def build_parallel_workflow() -> StateGraph:
+    """Build the workflow with reviewer and tester running concurrently.
+
+    When the supervisor routes to either verifier, both run in the same step
+    and join before returning to the supervisor, so a change is reviewed and
+    tested in the wall-clock time of the slower of the two.
+
+    Returns:
+        StateGraph with agent nodes, fan-out and join
+    """
+    workflow = StateGraph(MultiProjectState)
+
+    _add_node(workflow, "supervisor", supervisor_node)
+    _add_node(workflow, "architect", architect_node)
+    _add_node(workflow, "developer", developer_node)
+    _add_node(workflow, "reviewer", _branch(reviewer_node))
+    _add_node(workflow, "tester", _branch(tester_node))
+    _add_node(workflow, "join_findings", join_findings)
+    add_plan_workers(workflow)
+
+    workflow.set_entry_point("supervisor")
+    workflow.add_conditional_edges(
+        "supervisor",
+        route_with_fan_out,
+        ["architect", "developer", *VERIFIERS, "developer_worker", END],
+    )
+
+    workflow.add_edge("architect", "supervisor")
+    workflow.add_edge("developer", "supervisor")
+
+    # Join waits for every verifier before the supervisor runs again
+    workflow.add_edge(list(VERIFIERS), "join_findings")
+    workflow.add_edge("join_findings", "supervisor")
+
+    return workflow
+
+
+# Workflow builders by topology name
+TOPOLOGIES: dict[str, Callable[[], StateGraph]] = {
+    "default": build_workflow,
+    "parallel": build_parallel_workflow,
+}
+
+
+def default_topology() -> str:
+    """Get the topology used when none is given (env: GRAPH_TOPOLOGY, default 'default')."""
+    return os.getenv("GRAPH_TOPOLOGY", "default")
+
+# Compiled graphs by (topology, checkpointer identity). Each cached graph holds
+# a reference to its checkpointer, so the id cannot be reused while cached.
+_graphs: dict[tuple[str, int], CompiledStateGraph] = {}
+_graphs_lock = threading.Lock()
+
+
+def build_graph(
+    checkpointer: BaseCheckpointSaver[Any] | None = None,
+    topology: str | None = None,
+) -> CompiledStateGraph:
+    """Build and compile the LangGraph workflow.
+
+    The graph carries no LLM or tools; agents read them from
+    config["configurable"] at run time, so one compiled graph serves every
+    task, project and worker thread.
+
+    Args:
+        checkpointer: Checkpointer for state persistence
+            (default: create_checkpointer())
+        topology: Name of the workflow in TOPOLOGIES (default: default_topology())
+
+    Returns:
+        Compiled graph ready for execution
+
+    Raises:
+        ValueError: If the topology is unknown
+    """
+    topology = topology or default_topology()
+    if topology not in TOPOLOGIES:
+        raise ValueError(
+            f"Unknown graph topology: {topology} (expected one of {', '.join(TOPOLOGIES)})"
+        )
+
     # Create checkpointer for state persistence
-    checkpointer = create_checkpointer()
+    if checkpointer is None:
+        checkpointer = create_checkpointer()
 
-    # Compile graph with checkpointer
-    compiled_graph = workflow.compile(checkpointer=checkpointer)
+    return TOPOLOGIES[topology]().compile(checkpointer=checkpointer)
 
-    return compiled_graph
 
+def create_graph(
+    checkpointer: BaseCheckpointSaver[Any] | None = None,
+    topology: str | None = None,
+) -> CompiledStateGraph:
+    """Factory function to get the compiled graph, compiling it on first use.
 
-def create_graph(llm_client: LLMClient) -> Any:
-    """Factory function to create configured graph.
+    Repeated calls with the same topology and checkpointer return the same
+    compiled graph. Without a checkpointer, the first call's default
+    checkpointer is reused.
 
     Args:
-        llm_client: LLM client for agents
+        checkpointer: Checkpointer for state persistence
+            (default: create_checkpointer() on first call)
+        topology: Name of the workflow in TOPOLOGIES (default: default_topology())
 
     Returns:
         Compiled graph ready for execution
     """
-    return build_graph(llm_client)
+    topology = topology or default_topology()
+    key = (topology, id(checkpointer))
+    graph = _graphs.get(key)
+    if graph is None:
+        with _graphs_lock:
+            graph = _graphs.get(key)
+            if graph is None:
+                graph = build_graph(checkpointer, topology)
+                _graphs[key] = graph
+    return graph
+
+
+def clear_graph_cache() -> None:
+    """Drop cached compiled graphs (e.g. after changing checkpointer settings)."""
+    with _graphs_lock:
+        _graphs.clear()
 
 
 def get_all_tools() -> list[Any]:
@@ -1,26 +1,244 @@
 """State checkpointer for LangGraph state persistence."""
 
+import atexit
 import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from dotenv import load_dotenv
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.checkpoint.memory import MemorySaver
 
+from src.graph.serde import CompactSerializer, PostgresBlobStore, compact_enabled
+from src.metrics import get_metrics
+
+if TYPE_CHECKING:
+    from psycopg_pool import ConnectionPool
+
+    from src.graph.sqlite_saver import BatchedSqliteSaver
+
 # Load environment variables
 load_dotenv()
 
+# Supported values for CHECKPOINT_BACKEND
+BACKENDS = ("memory", "postgres", "sqlite")
+
+# Default SQLite database for the sqlite backend
+DEFAULT_SQLITE_PATH = ".langgraphx/checkpoints.db"
+
+# One pool per connection string, shared by every checkpointer in the process
+_pools: dict[str, "ConnectionPool"] = {}
+# Connection strings whose schema migrations already ran in this process
+_setup_done: set[str] = set()
+# One saver (and so one writer connection) per SQLite database file
+_sqlite_savers: dict[str, "BatchedSqliteSaver"] = {}
+_lock = threading.Lock()
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment."""
+    return float(os.getenv(name, str(default)))
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an int setting from the environment."""
+    return int(os.getenv(name, str(default)))
+
+
+def get_backend() -> str:
+    """Get the configured checkpoint backend.
+
+    Uses CHECKPOINT_BACKEND when set, otherwise PostgreSQL if DATABASE_URL is
+    configured and the in-memory saver if not.
+
+    Returns:
+        Backend name (one of BACKENDS)
+
+    Raises:
+        ValueError: If CHECKPOINT_BACKEND is not a known backend
+    """
+    backend = os.getenv("CHECKPOINT_BACKEND", "").strip().lower()
+    if not backend:
+        backend = "postgres" if os.getenv("DATABASE_URL") else "memory"
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown CHECKPOINT_BACKEND: {backend}. Expected one of {BACKENDS}")
+    return backend
+
+
+def get_connection_pool(conninfo: str) -> "ConnectionPool":
+    """Get the process-wide connection pool for a database.
+
+    Pool settings come from the environment:
+        CHECKPOINT_POOL_MIN_SIZE: Connections kept open (default 1)
+        CHECKPOINT_POOL_MAX_SIZE: Upper bound on open connections (default 10)
+        CHECKPOINT_POOL_TIMEOUT: Seconds to wait for a free connection (default 30)
+        CHECKPOINT_POOL_MAX_IDLE: Seconds before an idle connection is closed (default 300)
+        CHECKPOINT_CONNECT_TIMEOUT: Seconds to establish a connection (default 10)
+
+    Args:
+        conninfo: PostgreSQL connection string
+
+    Returns:
+        Opened ConnectionPool
+
+    Raises:
+        ConnectionError: If the pool cannot open its initial connections
+    """
+    from psycopg.rows import dict_row
+    from psycopg_pool import ConnectionPool, PoolTimeout
+
+    with _lock:
+        pool = _pools.get(conninfo)
+        if pool is not None:
+            return pool
+
+        connect_timeout = _env_int("CHECKPOINT_CONNECT_TIMEOUT", 10)
+        pool = ConnectionPool(
+            conninfo,
+            min_size=_env_int("CHECKPOINT_POOL_MIN_SIZE", 1),
+            max_size=_env_int("CHECKPOINT_POOL_MAX_SIZE", 10),
+            timeout=_env_float("CHECKPOINT_POOL_TIMEOUT", 30.0),
+            max_idle=_env_float("CHECKPOINT_POOL_MAX_IDLE", 300.0),
+            # Settings required by PostgresSaver
+            kwargs={
+                "autocommit": True,
+                "prepare_threshold": 0,
+                "row_factory": dict_row,
+                "connect_timeout": connect_timeout,
+            },
+            # Drop connections the server closed while they sat idle
+            check=ConnectionPool.check_connection,
+            open=False,
+        )
+        pool.open()
+        try:
+            pool.wait(timeout=connect_timeout)
+        except PoolTimeout as e:
+            pool.close()
+            raise ConnectionError(f"Could not connect to checkpoint database: {e}") from e
+
+        _pools[conninfo] = pool
+        return pool
 
-def create_checkpointer() -> MemorySaver:
+
+def close_connection_pools() -> None:
+    """Close all process-wide checkpoint connection pools and SQLite savers."""
+    with _lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+        _setup_done.clear()
+
+        for saver in _sqlite_savers.values():
+            saver.flush()
+            saver.conn.close()
+        _sqlite_savers.clear()
+
+
+atexit.register(close_connection_pools)
+
+
+def _create_postgres_checkpointer(conninfo: str) -> BaseCheckpointSaver[Any]:
+    """Create a pooled PostgreSQL checkpointer, running migrations once per process."""
+    from src.graph.postgres_saver import PooledPostgresSaver
+
+    pool = get_connection_pool(conninfo)
+    if compact_enabled():
+        store = PostgresBlobStore(pool)
+        saver = PooledPostgresSaver(pool, serde=CompactSerializer(store))
+    else:
+        store = None
+        saver = PooledPostgresSaver(pool)
+
+    with _lock:
+        if conninfo not in _setup_done:
+            saver.setup()
+            if store is not None:
+                store.setup()
+            _setup_done.add(conninfo)
+
+    return saver
+
+
+def _create_sqlite_checkpointer(path: str) -> BaseCheckpointSaver[Any]:
+    """Get the process-wide WAL-mode SQLite checkpointer for a database file.
+
+    Settings come from the environment:
+        CHECKPOINT_SQLITE_BATCH_SIZE: Write operations per commit (default 8)
+        CHECKPOINT_SQLITE_FLUSH_INTERVAL: Max seconds between commits (default 1.0)
+    """
+    from src.graph.sqlite_saver import BatchedSqliteSaver
+
+    key = str(Path(path).resolve())
+    with _lock:
+        saver = _sqlite_savers.get(key)
+        if saver is None:
+            saver = BatchedSqliteSaver.from_path(
+                key,
+                batch_size=_env_int("CHECKPOINT_SQLITE_BATCH_SIZE", 8),
+                flush_interval=_env_float("CHECKPOINT_SQLITE_FLUSH_INTERVAL", 1.0),
+                compact=compact_enabled(),
+            )
+            _sqlite_savers[key] = saver
+        return saver
+
+
+def _timed_writes(saver: BaseCheckpointSaver[Any]) -> BaseCheckpointSaver[Any]:
+    """Record the latency of a saver's checkpoint writes when metrics are on.
+
+    The shared SQLite saver is returned by every call, so it is wrapped once.
+    """
+    metrics = get_metrics()
+    if not metrics.enabled or getattr(saver, "_writes_timed", False):
+        return saver
+    for op in ("put", "put_writes"):
+        method = getattr(saver, op)
+
+        def timed(*args: Any, _method: Any = method, _op: str = op, **kwargs: Any) -> Any:
+            with metrics.timer("langgraphx_checkpoint_write_duration_seconds", op=_op):
+                return _method(*args, **kwargs)
+
+        setattr(saver, op, timed)
+    saver._writes_timed = True  # type: ignore[attr-defined]
+    return saver
+
+
+def create_checkpointer() -> BaseCheckpointSaver[Any]:
     """Create and initialize checkpointer.
 
-    Note: Currently using MemorySaver for development.
-    Switch to PostgresSaver for production persistence.
+    The backend is chosen by CHECKPOINT_BACKEND (see get_backend). The
+    PostgreSQL backend shares one connection pool per process, so each graph
+    step borrows an open connection instead of connecting afresh. The SQLite
+    backend (CHECKPOINT_SQLITE_PATH) suits single-host runs: one WAL-mode
+    writer connection per file with batched commits.
+
+    Unless CHECKPOINT_SERDE=plain, the database backends use CompactSerializer,
+    which stores messages and static project data once by content hash and
+    compresses them (CHECKPOINT_COMPRESSION=zstd|zlib|none).
 
     Returns:
-        MemorySaver instance for state management
+        Checkpointer instance for state management
+
+    Raises:
+        ConnectionError: If the checkpoint database is unreachable
     """
-    # For now, use in-memory checkpointer for development
-    # This avoids PostgreSQL connection issues during initial testing
-    return MemorySaver()
+    backend = get_backend()
+
+    if backend == "postgres":
+        conninfo = os.getenv("DATABASE_URL", "")
+        if not conninfo:
+            raise ValueError("DATABASE_URL must be set for the postgres checkpoint backend")
+        return _timed_writes(_create_postgres_checkpointer(conninfo))
+
+    if backend == "sqlite":
+        return _timed_writes(
+            _create_sqlite_checkpointer(os.getenv("CHECKPOINT_SQLITE_PATH", DEFAULT_SQLITE_PATH))
+        )
+
+    # Plain serializer: MemorySaver drops trimmed checkpoints, but a content
+    # store would keep every message of every thread for the process lifetime
+    return _timed_writes(MemorySaver())
 
 
 def test_checkpointer_connection() -> bool:
@@ -30,7 +248,15 @@ def test_checkpointer_connection() -> bool:
         True if connection successful, False otherwise
     """
     try:
+        backend = get_backend()
         saver = create_checkpointer()
+        # Round-trip a query to prove the database answers
+        if backend == "postgres":
+            with saver.conn.connection() as db:  # type: ignore[attr-defined]
+                db.execute("SELECT 1")
+        elif backend == "sqlite":
+            with saver.lock:  # type: ignore[attr-defined]
+                saver.conn.execute("SELECT 1")  # type: ignore[attr-defined]
         return True
     except Exception:
         return False
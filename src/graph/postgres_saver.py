@@ -0,0 +1,97 @@
+"""PostgreSQL checkpointer with thread listing and trimming."""
+
+from typing import Any
+
+from langgraph.checkpoint.postgres import PostgresSaver
+
+from src.graph.serde import COMPACT_TYPE, CompactSerializer
+
+# Keep only the newest `keep` checkpoints per namespace, then release blobs
+# that no retained checkpoint references
+TRIM_CHECKPOINTS_SQL = """
+WITH ranked AS (
+    SELECT checkpoint_ns, checkpoint_id,
+           row_number() OVER (PARTITION BY checkpoint_ns ORDER BY checkpoint_id DESC) AS rn
+    FROM checkpoints
+    WHERE thread_id = %(thread_id)s
+),
+stale AS (
+    SELECT checkpoint_ns, checkpoint_id FROM ranked WHERE rn > %(keep)s
+),
+deleted_writes AS (
+    DELETE FROM checkpoint_writes w
+    USING stale s
+    WHERE w.thread_id = %(thread_id)s
+      AND w.checkpoint_ns = s.checkpoint_ns
+      AND w.checkpoint_id = s.checkpoint_id
+)
+DELETE FROM checkpoints c
+USING stale s
+WHERE c.thread_id = %(thread_id)s
+  AND c.checkpoint_ns = s.checkpoint_ns
+  AND c.checkpoint_id = s.checkpoint_id
+"""
+
+TRIM_BLOBS_SQL = """
+DELETE FROM checkpoint_blobs b
+WHERE b.thread_id = %(thread_id)s
+  AND NOT EXISTS (
+      SELECT 1 FROM checkpoints c
+      WHERE c.thread_id = b.thread_id
+        AND c.checkpoint_ns = b.checkpoint_ns
+        AND c.checkpoint -> 'channel_versions' ->> b.channel = b.version
+  )
+"""
+
+# Every stored value that can reference checkpoint content
+CONTENT_REFS_SQL = """
+SELECT type, blob FROM checkpoint_blobs WHERE type = %(type)s
+UNION ALL
+SELECT type, blob FROM checkpoint_writes WHERE type = %(type)s
+"""
+
+LIST_THREADS_SQL = """
+SELECT thread_id, count(*) AS checkpoints, max(checkpoint ->> 'ts') AS updated_at
+FROM checkpoints
+WHERE checkpoint_ns = ''
+GROUP BY thread_id
+"""
+
+
+class PooledPostgresSaver(PostgresSaver):
+    """PostgresSaver with thread listing and trimming for SessionManager."""
+
+    def list_threads(self) -> list[dict[str, Any]]:
+        """List threads with checkpoint counts and last update time."""
+        with self._cursor() as cur:
+            rows = cur.execute(LIST_THREADS_SQL).fetchall()
+        return [
+            {
+                "thread_id": row["thread_id"],
+                "project": row["thread_id"].rpartition("_")[0] or row["thread_id"],
+                "checkpoints": row["checkpoints"],
+                "updated_at": row["updated_at"] or "",
+            }
+            for row in rows
+        ]
+
+    def trim_thread(self, thread_id: str, keep: int) -> int:
+        """Delete all but the newest `keep` checkpoints of a thread."""
+        params = {"thread_id": thread_id, "keep": keep}
+        with self._cursor() as cur, cur.connection.transaction():
+            removed = cur.execute(TRIM_CHECKPOINTS_SQL, params).rowcount
+            if removed:
+                cur.execute(TRIM_BLOBS_SQL, params)
+        return max(removed, 0)
+
+    def sweep_content(self) -> int:
+        """Delete compact-serialized content no remaining checkpoint references.
+
+        Returns:
+            Number of content records deleted
+        """
+        if not isinstance(self.serde, CompactSerializer):
+            return 0
+        with self._cursor() as cur:
+            rows = cur.execute(CONTENT_REFS_SQL, {"type": COMPACT_TYPE}).fetchall()
+        return self.serde.sweep((row["type"], bytes(row["blob"])) for row in rows)
@@ -0,0 +1,459 @@
+"""Compact checkpoint serialization with content-addressed deduplication.
+
+Checkpointers serialize channel values (or, for SQLite, the whole checkpoint)
+on every step. Most of that payload is unchanged between steps: the message
+history only grows, and project data never changes during a run.
+CompactSerializer stores each message and every large value once in a
+content-addressed store and writes only a small skeleton of hashes per
+checkpoint, so each step pays for its new messages only.
+"""
+
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from typing import TYPE_CHECKING, Any, Protocol
+
+from langchain_core.messages import BaseMessage
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+if TYPE_CHECKING:
+    from psycopg_pool import ConnectionPool
+
+# Type tag of skeletons written by CompactSerializer
+COMPACT_TYPE = "compact"
+
+# Serialized values at least this large are stored by reference
+DEFAULT_MIN_REF_SIZE = 256
+
+# Raw records kept in memory to skip store round-trips on hot values
+CACHE_SIZE = 4096
+
+# Seconds an unreferenced record survives sweeps, so content a writer has
+# stored but not yet committed a checkpoint for is never removed under it
+SWEEP_GRACE = 3600.0
+
+_REF = "__ref__"
+_MSGS = "__msgs__"
+
+
+class BlobStore(Protocol):
+    """Content-addressed storage for serialized values."""
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, bytes]:
+        """Fetch records by key; missing keys are omitted."""
+        ...
+
+    def put_many(self, records: dict[str, bytes]) -> None:
+        """Store records, refreshing the storage time of keys that already exist."""
+        ...
+
+    def sweep(self, live: set[str], min_age: float) -> int:
+        """Delete records not in `live` stored at least `min_age` seconds ago.
+
+        Returns:
+            Number of records deleted
+        """
+        ...
+
+
+class MemoryBlobStore:
+    """In-process blob store.
+
+    Records are only evicted by `sweep`, which no in-memory saver runs, so it
+    only suits short-lived savers (tests and one-off runs); the memory
+    checkpoint backend uses the plain serializer.
+    """
+
+    def __init__(self) -> None:
+        self._records: dict[str, bytes] = {}
+        self._stored_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, bytes]:
+        with self._lock:
+            return {k: self._records[k] for k in keys if k in self._records}
+
+    def put_many(self, records: dict[str, bytes]) -> None:
+        now = time.time()
+        with self._lock:
+            for key, record in records.items():
+                self._records.setdefault(key, record)
+                self._stored_at[key] = now
+
+    def sweep(self, live: set[str], min_age: float) -> int:
+        cutoff = time.time() - min_age
+        with self._lock:
+            dead = [k for k, at in self._stored_at.items() if at <= cutoff and k not in live]
+            for key in dead:
+                del self._records[key]
+                del self._stored_at[key]
+        return len(dead)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+class SqliteBlobStore:
+    """Blob store table inside the checkpoint SQLite database.
+
+    Shares the checkpointer's connection and lock, so records commit together
+    with the checkpoints that reference them and never interleave with another
+    thread's statements. The lock must be reentrant: the saver serializes some
+    values while already holding it.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.RLock | None = None) -> None:
+        self.conn = conn
+        self.lock = lock or threading.RLock()
+        with self.lock:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoint_content "
+                "(key TEXT PRIMARY KEY, data BLOB, stored_at REAL NOT NULL DEFAULT 0)"
+            )
+            columns = self.conn.execute("PRAGMA table_info(checkpoint_content)").fetchall()
+            if "stored_at" not in {column[1] for column in columns}:
+                # Tables created before sweeping: existing records count as old
+                self.conn.execute(
+                    "ALTER TABLE checkpoint_content ADD COLUMN stored_at REAL NOT NULL DEFAULT 0"
+                )
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, bytes]:
+        placeholders = ",".join("?" * len(keys))
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT key, data FROM checkpoint_content WHERE key IN ({placeholders})",
+                list(keys),
+            ).fetchall()
+        return dict(rows)
+
+    def put_many(self, records: dict[str, bytes]) -> None:
+        now = time.time()
+        with self.lock:
+            self.conn.executemany(
+                "INSERT INTO checkpoint_content (key, data, stored_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET stored_at = excluded.stored_at",
+                [(key, record, now) for key, record in records.items()],
+            )
+
+    def sweep(self, live: set[str], min_age: float) -> int:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT key FROM checkpoint_content WHERE stored_at <= ?",
+                (time.time() - min_age,),
+            ).fetchall()
+            dead = [(key,) for (key,) in rows if key not in live]
+            self.conn.executemany("DELETE FROM checkpoint_content WHERE key = ?", dead)
+        return len(dead)
+
+
+class PostgresBlobStore:
+    """Blob store table inside the checkpoint PostgreSQL database."""
+
+    def __init__(self, pool: "ConnectionPool") -> None:
+        self.pool = pool
+
+    def setup(self) -> None:
+        """Create the content table if needed."""
+        with self.pool.connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoint_content "
+                "(key TEXT PRIMARY KEY, data BYTEA NOT NULL)"
+            )
+            conn.execute(
+                "ALTER TABLE checkpoint_content "
+                "ADD COLUMN IF NOT EXISTS stored_at TIMESTAMPTZ NOT NULL DEFAULT now()"
+            )
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, bytes]:
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT key, data FROM checkpoint_content WHERE key = ANY(%s)", (list(keys),)
+            ).fetchall()
+        return {row["key"]: bytes(row["data"]) for row in rows}
+
+    def put_many(self, records: dict[str, bytes]) -> None:
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.executemany(
+                "INSERT INTO checkpoint_content (key, data) VALUES (%s, %s) "
+                "ON CONFLICT (key) DO UPDATE SET stored_at = now()",
+                list(records.items()),
+            )
+
+    def sweep(self, live: set[str], min_age: float) -> int:
+        age = "stored_at <= now() - make_interval(secs => %s)"
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                f"SELECT key FROM checkpoint_content WHERE {age}", (min_age,)
+            ).fetchall()
+            dead = [row["key"] for row in rows if row["key"] not in live]
+            if not dead:
+                return 0
+            # Re-check the age: another process may have stored the key meanwhile
+            deleted = conn.execute(
+                f"DELETE FROM checkpoint_content WHERE key = ANY(%s) AND {age}", (dead, min_age)
+            ).rowcount
+        return max(deleted, 0)
+
+
+def _zstd_codec() -> tuple[Any, Any] | None:
+    """Get zstd (compress, decompress) from the stdlib or zstandard, if available."""
+    try:
+        from compression import zstd  # Python 3.14+
+
+        return zstd.compress, zstd.decompress
+    except ImportError:
+        pass
+    try:
+        import zstandard
+
+        # Module-level functions: compressor objects must not be shared across threads
+        return zstandard.compress, zstandard.decompress
+    except ImportError:
+        return None
+
+
+class CompactSerializer(SerializerProtocol):
+    """Serializer that deduplicates messages and large values by content hash.
+
+    - A list of messages becomes a list of per-message hashes, so appending a
+      message stores only that message.
+    - Any other value whose serialized form reaches `min_ref_size` bytes (the
+      project registry, project context) is stored once and referenced.
+    - Records are compressed with zstd when available, otherwise zlib.
+
+    Records are never rewritten once stored, and the store is shared across
+    threads, so static data repeated by every task is also stored once.
+    `sweep` deletes records no remaining checkpoint references; the savers
+    run it after trimming or deleting threads. Values written by other
+    serializers are still readable.
+    """
+
+    def __init__(
+        self,
+        store: BlobStore,
+        compression: str | None = None,
+        min_ref_size: int = DEFAULT_MIN_REF_SIZE,
+        inner: SerializerProtocol | None = None,
+        grace: float | None = None,
+    ) -> None:
+        """Initialize compact serializer.
+
+        Args:
+            store: Content-addressed record store
+            compression: zstd, zlib or none (default from env: CHECKPOINT_COMPRESSION,
+                falling back to zlib when zstd is unavailable)
+            min_ref_size: Serialized size at which values are stored by reference
+            inner: Serializer for the values themselves (default JsonPlusSerializer)
+            grace: Seconds unreferenced records survive sweeps (default SWEEP_GRACE)
+        """
+        self.store = store
+        self.inner = inner or JsonPlusSerializer()
+        self.min_ref_size = min_ref_size
+        self.grace = SWEEP_GRACE if grace is None else grace
+
+        compression = (compression or os.getenv("CHECKPOINT_COMPRESSION", "zstd")).lower()
+        zstd = _zstd_codec()
+        if compression == "zstd" and zstd is None:
+            compression = "zlib"
+        self.compression = compression
+        self._codecs: dict[bytes, tuple[Any, Any]] = {
+            b"n": (lambda data: data, lambda data: data),
+            b"z": (zlib.compress, zlib.decompress),
+        }
+        if zstd is not None:
+            self._codecs[b"s"] = zstd
+        self._codec = {"none": b"n", "zlib": b"z", "zstd": b"s"}.get(compression)
+        if self._codec is None:
+            raise ValueError(f"Unknown checkpoint compression: {compression}")
+
+        # Recently used raw records, with the monotonic time this serializer
+        # last stored each one (-inf when only read)
+        self._cache: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _pack(self, type_: str, data: bytes) -> bytes:
+        compress = self._codecs[self._codec][0]
+        return self._codec + compress(type_.encode() + b"\0" + data)
+
+    def _unpack(self, record: bytes) -> tuple[str, bytes]:
+        decompress = self._codecs[record[:1]][1]
+        type_, _, data = decompress(record[1:]).partition(b"\0")
+        return type_.decode(), data
+
+    def _remember(self, key: str, record: bytes, stored: bool = False) -> None:
+        with self._lock:
+            self._cache[key] = (record, time.monotonic() if stored else -math.inf)
+            self._cache.move_to_end(key)
+            while len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    def _ref(self, type_: str, data: bytes, pending: dict[str, bytes]) -> str:
+        """Get the content key of a serialized value, queueing it if new."""
+        key = hashlib.blake2b(type_.encode() + b"\0" + data, digest_size=16).hexdigest()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+        if cached is not None and time.monotonic() - cached[1] < self.grace / 2:
+            # Stored recently enough that no sweep can have removed it
+            return key
+        if key not in pending:
+            pending[key] = cached[0] if cached is not None else self._pack(type_, data)
+        return key
+
+    def _encode(self, value: Any, pending: dict[str, bytes]) -> Any:
+        """Replace a value with a reference marker where worthwhile."""
+        if (
+            isinstance(value, list)
+            and value
+            and all(isinstance(item, BaseMessage) for item in value)
+        ):
+            return {_MSGS: [self._ref(*self.inner.dumps_typed(m), pending) for m in value]}
+
+        type_, data = self.inner.dumps_typed(value)
+        if len(data) >= self.min_ref_size:
+            return {_REF: self._ref(type_, data, pending)}
+        return value
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        """Serialize an object, storing its large parts by reference.
+
+        Args:
+            obj: Checkpoint, channel value or pending write
+
+        Returns:
+            Tuple of (type tag, bytes)
+        """
+        pending: dict[str, bytes] = {}
+        if isinstance(obj, dict) and "channel_versions" in obj:
+            if "channel_values" not in obj:
+                # Checkpoint header without values (memory/Postgres): unique per step
+                return self.inner.dumps_typed(obj)
+            # Whole checkpoint (SQLite): encode each channel separately
+            skeleton: Any = {
+                **obj,
+                "channel_values": {
+                    k: self._encode(v, pending) for k, v in obj["channel_values"].items()
+                },
+            }
+        else:
+            skeleton = self._encode(obj, pending)
+            if skeleton is obj:
+                # Small value: nothing to deduplicate
+                return self.inner.dumps_typed(obj)
+
+        if pending:
+            self.store.put_many(pending)
+            for key, record in pending.items():
+                self._remember(key, record, stored=True)
+
+        return COMPACT_TYPE, self._pack(*self.inner.dumps_typed(skeleton))
+
+    def _fetch(self, keys: set[str]) -> dict[str, bytes]:
+        """Get raw records from the cache, falling back to the store."""
+        records: dict[str, bytes] = {}
+        with self._lock:
+            for key in keys:
+                if key in self._cache:
+                    records[key] = self._cache[key][0]
+        missing = [k for k in keys if k not in records]
+        if missing:
+            fetched = self.store.get_many(missing)
+            lost = set(missing) - fetched.keys()
+            if lost:
+                raise KeyError(f"Checkpoint content missing from store: {sorted(lost)[:3]}")
+            for key, record in fetched.items():
+                self._remember(key, record)
+            records.update(fetched)
+        return records
+
+    def _decode(self, value: Any, records: dict[str, bytes]) -> Any:
+        if isinstance(value, dict):
+            if _MSGS in value:
+                return [self.inner.loads_typed(self._unpack(records[k])) for k in value[_MSGS]]
+            if _REF in value:
+                return self.inner.loads_typed(self._unpack(records[value[_REF]]))
+        return value
+
+    @staticmethod
+    def _collect_keys(value: Any, keys: set[str]) -> None:
+        if isinstance(value, dict):
+            if _MSGS in value:
+                keys.update(value[_MSGS])
+            elif _REF in value:
+                keys.add(value[_REF])
+
+    @classmethod
+    def _skeleton_keys(cls, skeleton: Any) -> set[str]:
+        keys: set[str] = set()
+        is_checkpoint = isinstance(skeleton, dict) and "channel_values" in skeleton
+        for value in skeleton["channel_values"].values() if is_checkpoint else [skeleton]:
+            cls._collect_keys(value, keys)
+        return keys
+
+    def referenced_keys(self, data: tuple[str, bytes]) -> set[str]:
+        """Get the content keys a serialized object references.
+
+        Args:
+            data: Tuple of (type tag, bytes)
+
+        Returns:
+            Content keys (empty for values written by other serializers)
+        """
+        type_, payload = data
+        if type_ != COMPACT_TYPE:
+            return set()
+        return self._skeleton_keys(self.inner.loads_typed(self._unpack(payload)))
+
+    def sweep(self, payloads: Iterable[tuple[str, bytes]]) -> int:
+        """Delete stored records that none of the given payloads reference.
+
+        Records stored within the last `grace` seconds are kept, since their
+        checkpoint may not be committed yet.
+
+        Args:
+            payloads: Every (type tag, bytes) value the checkpointer still holds
+
+        Returns:
+            Number of records deleted
+        """
+        live: set[str] = set()
+        for data in payloads:
+            live |= self.referenced_keys(data)
+        return self.store.sweep(live, self.grace)
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        """Deserialize an object written by this or the inner serializer.
+
+        Args:
+            data: Tuple of (type tag, bytes)
+
+        Returns:
+            Deserialized object
+        """
+        type_, payload = data
+        if type_ != COMPACT_TYPE:
+            return self.inner.loads_typed(data)
+
+        skeleton = self.inner.loads_typed(self._unpack(payload))
+        keys = self._skeleton_keys(skeleton)
+        records = self._fetch(keys) if keys else {}
+
+        if isinstance(skeleton, dict) and "channel_values" in skeleton:
+            skeleton["channel_values"] = {
+                k: self._decode(v, records) for k, v in skeleton["channel_values"].items()
+            }
+            return skeleton
+        return self._decode(skeleton, records)
+
+
+def compact_enabled() -> bool:
+    """Check whether compact serialization is enabled (env: CHECKPOINT_SERDE)."""
+    return os.getenv("CHECKPOINT_SERDE", "compact").strip().lower() == "compact"
@@ -0,0 +1,234 @@
+"""Session (checkpoint thread) management for task execution."""
+
+import os
+import uuid
+from datetime import UTC, datetime
+from typing import Any, TypedDict
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+
+# Default number of checkpoints retained per thread (0 disables trimming)
+DEFAULT_MAX_CHECKPOINTS = 20
+
+
+class SessionInfo(TypedDict):
+    """Summary of a checkpoint thread."""
+
+    thread_id: str
+    project: str
+    checkpoints: int
+    updated_at: str
+
+
+def _project_from_thread_id(thread_id: str) -> str:
+    """Extract project name from a thread ID of the form '<project>_<suffix>'."""
+    project, _, _suffix = thread_id.rpartition("_")
+    return project or thread_id
+
+
+def _trim_memory_saver(saver: InMemorySaver, thread_id: str, keep: int) -> int:
+    """Drop all but the newest `keep` checkpoints of a thread in an InMemorySaver.
+
+    Args:
+        saver: In-memory checkpointer
+        thread_id: Thread to trim
+        keep: Number of newest checkpoints to retain per namespace
+
+    Returns:
+        Number of checkpoints removed
+    """
+    removed = 0
+    namespaces = saver.storage.get(thread_id, {})
+    for checkpoint_ns, checkpoints in namespaces.items():
+        # Checkpoint IDs are time-ordered (uuid6), so lexical order is age order
+        ordered = sorted(checkpoints.keys(), reverse=True)
+        stale = ordered[keep:]
+        for checkpoint_id in stale:
+            del checkpoints[checkpoint_id]
+            saver.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+            removed += 1
+
+        if not stale:
+            continue
+
+        # Release channel blobs no longer referenced by a retained checkpoint
+        live_versions: set[tuple[str, Any]] = set()
+        for saved in checkpoints.values():
+            checkpoint = saver.serde.loads_typed(saved[0])
+            live_versions.update(checkpoint["channel_versions"].items())
+        for key in list(saver.blobs.keys()):
+            blob_thread, blob_ns, channel, version = key
+            if (
+                blob_thread == thread_id
+                and blob_ns == checkpoint_ns
+                and (channel, version) not in live_versions
+            ):
+                del saver.blobs[key]
+
+    return removed
+
+
+class SessionManager:
+    """Allocate, list, prune and trim checkpoint threads.
+
+    Each task gets its own thread by default so checkpoint writes and resumes
+    only touch that task's history. Passing an explicit session ID continues
+    an existing thread instead.
+    """
+
+    def __init__(
+        self,
+        checkpointer: BaseCheckpointSaver[Any],
+        max_checkpoints: int | None = None,
+    ) -> None:
+        """Initialize session manager.
+
+        Args:
+            checkpointer: Checkpointer backing the compiled graph
+            max_checkpoints: Checkpoints retained per thread
+                (default from env: CHECKPOINT_MAX_PER_THREAD, 0 disables)
+        """
+        self.checkpointer = checkpointer
+        if max_checkpoints is None:
+            max_checkpoints = int(
+                os.getenv("CHECKPOINT_MAX_PER_THREAD", str(DEFAULT_MAX_CHECKPOINTS))
+            )
+        self.max_checkpoints = max_checkpoints
+
+    def new_thread_id(self, project: str) -> str:
+        """Allocate a fresh thread ID for a task.
+
+        Args:
+            project: Project the task runs against
+
+        Returns:
+            Thread ID of the form '<project>_<timestamp><random>'
+        """
+        stamp = datetime.now(UTC).strftime("%Y%m%d%H%M%S")
+        return f"{project}_{stamp}{uuid.uuid4().hex[:6]}"
+
+    def resolve(self, project: str, session: str | None = None) -> str:
+        """Get the thread ID to run a task in.
+
+        Args:
+            project: Project the task runs against
+            session: Existing thread ID to continue (optional)
+
+        Returns:
+            The given session, or a new thread ID
+        """
+        return session if session else self.new_thread_id(project)
+
+    def list_sessions(self, project: str | None = None) -> list[SessionInfo]:
+        """List known threads, newest first.
+
+        Args:
+            project: Only include threads of this project (optional)
+
+        Returns:
+            List of SessionInfo summaries
+        """
+        list_threads = getattr(self.checkpointer, "list_threads", None)
+        if callable(list_threads):
+            sessions: list[SessionInfo] = list_threads()
+        else:
+            by_thread: dict[str, SessionInfo] = {}
+            for item in self.checkpointer.list(None):
+                thread_id = item.config["configurable"]["thread_id"]
+                info = by_thread.get(thread_id)
+                if info is None:
+                    info = SessionInfo(
+                        thread_id=thread_id,
+                        project=_project_from_thread_id(thread_id),
+                        checkpoints=0,
+                        updated_at=item.checkpoint["ts"],
+                    )
+                    by_thread[thread_id] = info
+                info["checkpoints"] += 1
+                info["updated_at"] = max(info["updated_at"], item.checkpoint["ts"])
+            sessions = list(by_thread.values())
+
+        if project:
+            sessions = [s for s in sessions if s["project"] == project]
+        return sorted(sessions, key=lambda s: s["updated_at"], reverse=True)
+
+    def delete(self, thread_id: str) -> None:
+        """Delete a thread and all of its checkpoints.
+
+        Args:
+            thread_id: Thread to delete
+        """
+        self.checkpointer.delete_thread(thread_id)
+        self._flush()
+        self._sweep()
+
+    def prune(self, keep: int, project: str | None = None) -> list[str]:
+        """Delete all but the `keep` most recently updated threads.
+
+        Args:
+            keep: Number of threads to retain (per project when project is None)
+            project: Only prune threads of this project (optional)
+
+        Returns:
+            Deleted thread IDs
+        """
+        kept: dict[str, int] = {}
+        deleted = []
+        for session in self.list_sessions(project):
+            count = kept.get(session["project"], 0)
+            if count < keep:
+                kept[session["project"]] = count + 1
+                continue
+            self.checkpointer.delete_thread(session["thread_id"])
+            deleted.append(session["thread_id"])
+        if deleted:
+            self._flush()
+            self._sweep()
+        return deleted
+
+    def finish(self, thread_id: str) -> int:
+        """Flush buffered checkpoint writes and enforce the checkpoint cap.
+
+        Args:
+            thread_id: Thread whose run just completed
+
+        Returns:
+            Number of checkpoints removed
+        """
+        self._flush()
+        return self.trim(thread_id)
+
+    def _flush(self) -> None:
+        """Commit writes buffered by batching checkpointers."""
+        flush = getattr(self.checkpointer, "flush", None)
+        if callable(flush):
+            flush()
+
+    def _sweep(self) -> None:
+        """Release stored content no longer referenced by any checkpoint."""
+        sweep_content = getattr(self.checkpointer, "sweep_content", None)
+        if callable(sweep_content):
+            sweep_content()
+
+    def trim(self, thread_id: str) -> int:
+        """Enforce the per-thread checkpoint cap.
+
+        Args:
+            thread_id: Thread to trim
+
+        Returns:
+            Number of checkpoints removed
+        """
+        if self.max_checkpoints <= 0:
+            return 0
+
+        trim_thread = getattr(self.checkpointer, "trim_thread", None)
+        if callable(trim_thread):
+            removed: int = trim_thread(thread_id, self.max_checkpoints)
+            if removed:
+                self._sweep()
+            return removed
+        if isinstance(self.checkpointer, InMemorySaver):
+            return _trim_memory_saver(self.checkpointer, thread_id, self.max_checkpoints)
+        return 0
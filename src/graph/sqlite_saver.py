@@ -0,0 +1,203 @@
+"""SQLite checkpointer with WAL and batched commits for single-host runs."""
+
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from src.graph.serde import COMPACT_TYPE, CompactSerializer, SqliteBlobStore
+
+TRIM_WRITES_SQL = """
+DELETE FROM writes
+WHERE thread_id = :thread_id
+  AND (checkpoint_ns, checkpoint_id) IN (
+      SELECT checkpoint_ns, checkpoint_id FROM (
+          SELECT checkpoint_ns, checkpoint_id,
+                 row_number() OVER (PARTITION BY checkpoint_ns ORDER BY checkpoint_id DESC) AS rn
+          FROM checkpoints
+          WHERE thread_id = :thread_id
+      ) WHERE rn > :keep
+  )
+"""
+
+TRIM_CHECKPOINTS_SQL = """
+DELETE FROM checkpoints
+WHERE thread_id = :thread_id
+  AND (checkpoint_ns, checkpoint_id) IN (
+      SELECT checkpoint_ns, checkpoint_id FROM (
+          SELECT checkpoint_ns, checkpoint_id,
+                 row_number() OVER (PARTITION BY checkpoint_ns ORDER BY checkpoint_id DESC) AS rn
+          FROM checkpoints
+          WHERE thread_id = :thread_id
+      ) WHERE rn > :keep
+  )
+"""
+
+# Every stored value that can reference checkpoint content
+CONTENT_REFS_SQL = """
+SELECT type, checkpoint FROM checkpoints WHERE type = :type
+UNION ALL
+SELECT type, value FROM writes WHERE type = :type
+"""
+
+LIST_THREADS_SQL = """
+SELECT thread_id, count(*) AS checkpoints
+FROM checkpoints
+WHERE checkpoint_ns = ''
+GROUP BY thread_id
+"""
+
+
+class BatchedSqliteSaver(SqliteSaver):
+    """SqliteSaver that groups intermediate checkpoint writes into one commit.
+
+    All access goes through a single connection guarded by the saver's lock,
+    so there is exactly one writer. Writes are committed once `batch_size`
+    write operations are pending or `flush_interval` seconds have passed since
+    the last commit; `flush()` commits whatever is left at the end of a run.
+    Reads go through the same connection and therefore see uncommitted steps.
+
+    A crash loses at most the uncommitted tail of the current run; completed
+    runs are flushed before control returns to the caller.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        batch_size: int = 8,
+        flush_interval: float = 1.0,
+        compact: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize batched SQLite saver.
+
+        Args:
+            conn: SQLite connection (created with check_same_thread=False)
+            batch_size: Write operations per commit (1 commits every write)
+            flush_interval: Maximum seconds between commits while writing
+            compact: Use CompactSerializer backed by a table in the same database
+            **kwargs: Passed through to SqliteSaver
+        """
+        # Reentrant: put_writes serializes inside cursor(), and the compact
+        # serializer's blob store takes the lock again
+        lock = threading.RLock()
+        if compact:
+            kwargs["serde"] = CompactSerializer(SqliteBlobStore(conn, lock))
+        super().__init__(conn, **kwargs)
+        self.lock = lock  # type: ignore[assignment]
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval
+        self._pending = 0
+        self._last_commit = time.monotonic()
+
+    @classmethod
+    def from_path(
+        cls,
+        path: str | Path,
+        batch_size: int = 8,
+        flush_interval: float = 1.0,
+        compact: bool = False,
+    ) -> "BatchedSqliteSaver":
+        """Open a WAL-mode database file and wrap it in a saver.
+
+        Args:
+            path: Database file path (parent directories are created)
+            batch_size: Write operations per commit
+            flush_interval: Maximum seconds between commits while writing
+            compact: Use CompactSerializer backed by a table in the same database
+
+        Returns:
+            BatchedSqliteSaver instance
+        """
+        db_path = Path(path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level="DEFERRED")
+        # WAL lets readers proceed during commits; NORMAL sync is safe under WAL
+        # and avoids an fsync per commit
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return cls(conn, batch_size=batch_size, flush_interval=flush_interval, compact=compact)
+
+    @contextmanager
+    def cursor(self, transaction: bool = True) -> Iterator[sqlite3.Cursor]:
+        """Get a cursor, deferring the commit of writes to the batch boundary.
+
+        Args:
+            transaction: Whether the cursor performs writes
+
+        Yields:
+            sqlite3.Cursor for the shared connection
+        """
+        with self.lock:
+            self.setup()
+            cur = self.conn.cursor()
+            try:
+                yield cur
+            finally:
+                cur.close()
+                if transaction:
+                    self._pending += 1
+                    if (
+                        self._pending >= self.batch_size
+                        or time.monotonic() - self._last_commit >= self.flush_interval
+                    ):
+                        self._commit()
+
+    def _commit(self) -> None:
+        """Commit pending writes (caller holds the lock)."""
+        self.conn.commit()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+
+    def flush(self) -> None:
+        """Commit any pending writes."""
+        with self.lock:
+            if self._pending:
+                self._commit()
+
+    def list_threads(self) -> list[dict[str, Any]]:
+        """List threads with checkpoint counts and last update time."""
+        with self.cursor(transaction=False) as cur:
+            rows = cur.execute(LIST_THREADS_SQL).fetchall()
+
+        threads = []
+        for thread_id, count in rows:
+            latest = self.get_tuple({"configurable": {"thread_id": thread_id}})
+            threads.append(
+                {
+                    "thread_id": thread_id,
+                    "project": thread_id.rpartition("_")[0] or thread_id,
+                    "checkpoints": count,
+                    "updated_at": latest.checkpoint["ts"] if latest else "",
+                }
+            )
+        return threads
+
+    def trim_thread(self, thread_id: str, keep: int) -> int:
+        """Delete all but the newest `keep` checkpoints of a thread."""
+        params = {"thread_id": thread_id, "keep": keep}
+        with self.cursor() as cur:
+            cur.execute(TRIM_WRITES_SQL, params)
+            removed = cur.execute(TRIM_CHECKPOINTS_SQL, params).rowcount
+        self.flush()
+        return max(removed, 0)
+
+    def sweep_content(self) -> int:
+        """Delete compact-serialized content no remaining checkpoint references.
+
+        Returns:
+            Number of content records deleted
+        """
+        if not isinstance(self.serde, CompactSerializer):
+            return 0
+        with self.cursor() as cur:
+            rows = cur.execute(CONTENT_REFS_SQL, {"type": COMPACT_TYPE})
+            removed = self.serde.sweep(rows)
+        self.flush()
+        return removed
@@ -1,31 +1,49 @@
 """State definitions for LangGraph workflow."""
 
-from typing import Annotated, Any, TypedDict
+from typing import Annotated, NotRequired, TypedDict
 
 from langchain_core.messages import AnyMessage
 from langgraph.graph.message import add_messages
 
+# ProjectContext and ProjectInfo are re-exported: project types live in a
+# dependency-free module so the registry can load without importing LangGraph
+from src.config.schema import BudgetLimits, ProjectContext, ProjectInfo
+from src.graph.budget import TaskUsage, add_usage
 
-class ProjectInfo(TypedDict):
-    """Project metadata."""
+__all__ = [
+    "MultiProjectState",
+    "PlanResult",
+    "PlanStep",
+    "PlanWorkerState",
+    "ProjectContext",
+    "ProjectInfo",
+]
 
-    name: str
-    type: str  # rust, elixir, python, etc.
-    description: str
-    path: str
-    tech_stack: dict[str, Any]
-    tools: dict[str, str]
-    conventions: list[str]
-    coding_standards: dict[str, Any]
-    test_framework: str
-    coverage_target: int
 
+class PlanStep(TypedDict):
+    """Independent file-level subtask of the architect's plan."""
 
-class ProjectContext(TypedDict):
-    """Project-specific context for agents."""
+    file: str
+    instructions: str
 
-    info: ProjectInfo
-    examples: dict[str, Any]  # Few-shot examples loaded from examples.yaml
+
+class PlanResult(TypedDict):
+    """Outcome of one developer worker."""
+
+    index: int
+    file: str
+    summary: str
+    # Files the worker's edits write (write_file calls)
+    files_written: list[str]
+
+
+def merge_plan_results(
+    current: list[PlanResult] | None, update: list[PlanResult] | None
+) -> list[PlanResult]:
+    """Collect results of parallel developer workers; None clears them."""
+    if update is None:
+        return []
+    return (current or []) + update
 
 
 class MultiProjectState(TypedDict):
@@ -37,14 +55,39 @@ class MultiProjectState(TypedDict):
     # Current active project
     current_project: str
 
-    # Registry of all available projects
-    projects: dict[str, ProjectInfo]
-
-    # Loaded context for the current project
-    project_context: ProjectContext | None
+    # Reference ('<name>@<config hash>') to the current project's context in
+    # the shared ProjectContextStore; static project data stays out of state
+    project_ref: str
 
     # Next agent to route to (set by supervisor)
     next_agent: str
 
     # Task description from user
     task: str
+
+    # File-level subtasks from the architect, run by parallel developer workers
+    plan: NotRequired[list[PlanStep]]
+
+    # Results of the current plan's workers, reduced by the merge node
+    plan_results: NotRequired[Annotated[list[PlanResult], merge_plan_results]]
+
+    # Limits of the current task, its usage so far (reported by each node),
+    # and its start time (epoch seconds); enforced at routing
+    budget: NotRequired[BudgetLimits]
+    usage: NotRequired[Annotated[TaskUsage, add_usage]]
+    started_at: NotRequired[float]
+
+    # Why the task was stopped before the supervisor ended it (budget exhausted)
+    stop_reason: NotRequired[str]
+
+
+class PlanWorkerState(TypedDict):
+    """Input of one developer worker, sent per plan step."""
+
+    messages: list[AnyMessage]
+    current_project: str
+    project_ref: str
+    task: str
+    step: PlanStep
+    index: int
+    total: int
@@ -0,0 +1,288 @@
+"""Model calls with per-node deadlines, cancellation and hedging.
+
+Agent nodes used to call `llm.invoke` directly, so a stuck proxy call
+stalled its task until the HTTP read timeout and Ctrl-C could not stop it.
+invoke_model runs the call on a worker thread and waits for it while
+checking the node's deadline and the task's cancel event. Optionally, a
+call still outstanding after the role's p95 latency is hedged with a
+duplicate request, and whichever returns first wins.
+
+A call abandoned on timeout or cancellation keeps its worker thread until
+the HTTP client's own timeout ends it; its result is discarded.
+"""
+
+import contextvars
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, TypedDict
+
+from langchain_core.runnables import RunnableConfig
+
+# Threads running model calls; calls beyond the governor's limit wait there
+CALL_THREADS = 64
+
+# Latencies kept per role for the hedging delay
+LATENCY_SAMPLES = 200
+
+# How often a waiting call checks for cancellation
+POLL_INTERVAL = 0.1
+
+
+class TaskCancelled(Exception):
+    """Raised in a node when its task was cancelled."""
+
+
+class NodeTimeout(TimeoutError):
+    """Raised when a node's model call exceeds its deadline."""
+
+
+class CallStats(TypedDict):
+    """Snapshot of model call deadline, cancellation and hedging metrics."""
+
+    calls: int
+    timeouts: int
+    cancelled: int
+    hedged: int
+    hedge_wins: int
+    p95_ms: dict[str, float]
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "0").strip().lower() in ("1", "true", "yes")
+
+
+def node_timeout(role: str) -> float:
+    """Get the deadline of a node's model call.
+
+    Env:
+        NODE_TIMEOUT_<ROLE>: Seconds for this role (optional)
+        NODE_TIMEOUT: Seconds for every role (default 300; 0 disables)
+
+    Args:
+        role: Agent role
+
+    Returns:
+        Deadline in seconds, 0 for none
+    """
+    return float(os.getenv(f"NODE_TIMEOUT_{role.upper()}") or os.getenv("NODE_TIMEOUT", "300"))
+
+
+class ModelCaller:
+    """Runs model calls on worker threads with deadlines and hedging."""
+
+    def __init__(
+        self,
+        hedge: bool | None = None,
+        min_samples: int | None = None,
+    ) -> None:
+        """Initialize model caller.
+
+        Args:
+            hedge: Duplicate calls outstanding past the role's p95 latency
+                (default from env: LLM_HEDGE, 0)
+            min_samples: Latencies observed per role before hedging starts
+                (default from env: LLM_HEDGE_MIN_SAMPLES, 20)
+        """
+        self.hedge = _env_flag("LLM_HEDGE") if hedge is None else hedge
+        self.min_samples = (
+            min_samples
+            if min_samples is not None
+            else int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+        )
+        self._executor = ThreadPoolExecutor(max_workers=CALL_THREADS, thread_name_prefix="llm-call")
+        self._lock = threading.Lock()
+        self._latencies: dict[str, deque[float]] = {}
+        self._counts = {"calls": 0, "timeouts": 0, "cancelled": 0, "hedged": 0, "hedge_wins": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def submit(self, fn: Callable[[], Any]) -> Future[Any]:
+        """Run a call on a worker thread, keeping the caller's context (callbacks, tracing).
+
+        Args:
+            fn: Call to run
+
+        Returns:
+            Future of the call
+        """
+        return self._executor.submit(contextvars.copy_context().run, fn)
+
+    def record(self, role: str, seconds: float) -> None:
+        """Record a completed call's latency."""
+        with self._lock:
+            self._latencies.setdefault(role, deque(maxlen=LATENCY_SAMPLES)).append(seconds)
+
+    def hedge_delay(self, role: str) -> float | None:
+        """Get the delay after which a role's call is hedged.
+
+        Args:
+            role: Agent role
+
+        Returns:
+            p95 latency in seconds, or None when hedging is off or there are too few samples
+        """
+        if not self.hedge:
+            return None
+        with self._lock:
+            samples = list(self._latencies.get(role, ()))
+        if len(samples) < max(self.min_samples, 2):
+            return None
+        return statistics.quantiles(samples, n=100)[94]
+
+    def invoke(
+        self,
+        role: str,
+        config: RunnableConfig,
+        llm: Any,
+        messages: list[Any],
+        started: Future[Any] | None = None,
+    ) -> Any:
+        """Call a model within the node's deadline, honoring task cancellation.
+
+        Args:
+            role: Agent role (selects deadline and latency statistics)
+            config: Runnable configuration; 'cancel_event' in configurable
+                cancels the call
+            llm: Model (with tools bound)
+            messages: Input messages
+            started: Call already in flight for the same input (e.g. speculative);
+                a new call is made if it fails
+
+        Returns:
+            Model response
+
+        Raises:
+            TaskCancelled: If the task was cancelled while waiting
+            NodeTimeout: If the deadline passed
+        """
+        cancel = config.get("configurable", {}).get("cancel_event")
+        if cancel is not None and cancel.is_set():
+            raise TaskCancelled(f"Task cancelled before {role} call")
+
+        self._count("calls")
+        timeout = node_timeout(role)
+        start = time.monotonic()
+        deadline = start + timeout if timeout > 0 else None
+        hedge_after = self.hedge_delay(role)
+
+        def call() -> Future[Any]:
+            return self.submit(lambda: llm.invoke(messages))
+
+        primary = started or call()
+        issued_at = start
+        pending = {primary}
+        hedge: Future[Any] | None = None
+        fresh = started is None
+
+        try:
+            while True:
+                now = time.monotonic()
+                waits = [POLL_INTERVAL]
+                if deadline is not None:
+                    waits.append(deadline - now)
+                if hedge_after is not None and hedge is None:
+                    waits.append(start + hedge_after - now)
+                done, pending = wait(
+                    pending, timeout=max(min(waits), 0), return_when=FIRST_COMPLETED
+                )
+
+                # Successes first: a failure only matters if nothing succeeded
+                for future in sorted(done, key=lambda f: f.exception() is not None):
+                    if future.exception() is None:
+                        if fresh and future is primary:
+                            self.record(role, time.monotonic() - issued_at)
+                        if future is hedge:
+                            self._count("hedge_wins")
+                        return future.result()
+                    if not pending:
+                        if not fresh:
+                            # The earlier call failed; make the call now
+                            fresh = True
+                            primary = call()
+                            issued_at = time.monotonic()
+                            pending = {primary}
+                        else:
+                            raise future.exception()  # type: ignore[misc]
+
+                if cancel is not None and cancel.is_set():
+                    self._count("cancelled")
+                    raise TaskCancelled(f"Task cancelled during {role} call")
+
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    self._count("timeouts")
+                    raise NodeTimeout(f"{role} model call exceeded its {timeout:g}s deadline")
+
+                if hedge_after is not None and hedge is None and now - start >= hedge_after:
+                    self._count("hedged")
+                    hedge = call()
+                    pending.add(hedge)
+        finally:
+            # Drop calls that lost (or were abandoned); ones not yet running never start
+            for future in pending:
+                future.cancel()
+
+    def stats(self) -> CallStats:
+        """Get a snapshot of call metrics, with p95 latency per role."""
+        with self._lock:
+            counts = dict(self._counts)
+            latencies = {role: list(samples) for role, samples in self._latencies.items()}
+        return CallStats(
+            calls=counts["calls"],
+            timeouts=counts["timeouts"],
+            cancelled=counts["cancelled"],
+            hedged=counts["hedged"],
+            hedge_wins=counts["hedge_wins"],
+            p95_ms={
+                role: round(statistics.quantiles(samples, n=100)[94] * 1000, 1)
+                for role, samples in latencies.items()
+                if len(samples) >= 2
+            },
+        )
+
+
+_caller: ModelCaller | None = None
+_caller_lock = threading.Lock()
+
+
+def get_model_caller() -> ModelCaller:
+    """Get the process-wide model caller, creating it from env settings on first use.
+
+    Returns:
+        Shared ModelCaller instance
+    """
+    global _caller
+    if _caller is None:
+        with _caller_lock:
+            if _caller is None:
+                _caller = ModelCaller()
+    return _caller
+
+
+def invoke_model(
+    role: str,
+    config: RunnableConfig,
+    llm: Any,
+    messages: list[Any],
+    started: Future[Any] | None = None,
+) -> Any:
+    """Call a model from a node with its deadline, cancellation and hedging.
+
+    Args:
+        role: Agent role
+        config: Runnable configuration
+        llm: Model (with tools bound)
+        messages: Input messages
+        started: Call already in flight for the same input (optional)
+
+    Returns:
+        Model response
+    """
+    return get_model_caller().invoke(role, config, llm, messages, started)
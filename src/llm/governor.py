@@ -0,0 +1,393 @@
+"""Client-side rate limiting, concurrency limiting and retries for LLM calls.
+
+vscode-lm-proxy is a single local process with its own throughput limits.
+Every model call in the process goes through one shared LLMGovernor, which
+paces requests with token buckets (requests/s and tokens/min), caps the
+number of calls in flight, and retries overload errors with jittered
+exponential backoff that honors Retry-After.
+"""
+
+import os
+import random
+import statistics
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from email.utils import parsedate_to_datetime
+from typing import Any, TypedDict, TypeVar
+
+from src.metrics import get_metrics
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying: timeout, conflict, rate limit, server errors, overloaded
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Queue delays kept for percentile metrics
+WAIT_SAMPLES = 1024
+
+
+class GovernorStats(TypedDict):
+    """Snapshot of LLM call metrics."""
+
+    calls: int
+    attempts: int
+    retries: int
+    rate_limited: int
+    failures: int
+    in_flight: int
+    waiting: int
+    queue_wait_total_s: float
+    queue_wait_p50_ms: float
+    queue_wait_p95_ms: float
+    queue_wait_max_ms: float
+    backoff_total_s: float
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Holds up to `capacity` tokens and refills at `rate` tokens per second.
+    A request larger than the capacity waits for a full bucket and then
+    drives it negative, so oversized requests are slowed rather than stuck.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held (burst size)
+            clock: Monotonic time source
+            sleep: Sleep function
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Take tokens, waiting until enough are available.
+
+        Args:
+            amount: Tokens to take
+
+        Returns:
+            Seconds spent waiting
+        """
+        needed = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= needed:
+                    self._tokens -= amount
+                    return waited
+                delay = (needed - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+    def adjust(self, amount: float) -> None:
+        """Take (positive) or return (negative) tokens without waiting.
+
+        Args:
+            amount: Tokens to take; may drive the bucket negative
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens - amount)
+
+
+def retry_after(error: BaseException) -> float | None:
+    """Get the server-requested retry delay from an API error.
+
+    Args:
+        error: Exception raised by the model client
+
+    Returns:
+        Delay in seconds, or None if the error carries no Retry-After
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(float(value) / 1000, 0.0)
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Check whether an LLM call error is transient.
+
+    Args:
+        error: Exception raised by the model client
+
+    Returns:
+        True for timeouts, connection errors, rate limits and server errors
+    """
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS
+
+    try:
+        import anthropic
+        import httpx
+    except ImportError:
+        return isinstance(error, TimeoutError | ConnectionError)
+
+    return isinstance(
+        error,
+        anthropic.APIConnectionError | httpx.TimeoutException | httpx.TransportError,
+    ) or isinstance(error, TimeoutError | ConnectionError)
+
+
+class LLMGovernor:
+    """Rate limiter, in-flight limit and retry policy shared by all LLM calls."""
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        requests_per_second: float | None = None,
+        tokens_per_minute: float | None = None,
+        max_retries: int | None = None,
+        base_delay: float | None = None,
+        max_delay: float | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Initialize LLM governor.
+
+        Args:
+            max_concurrency: Calls in flight at once
+                (default from env: LLM_MAX_CONCURRENCY, 4; 0 disables)
+            requests_per_second: Sustained request rate
+                (default from env: LLM_REQUESTS_PER_SECOND, 0 disables)
+            tokens_per_minute: Sustained token rate, input plus output
+                (default from env: LLM_TOKENS_PER_MINUTE, 0 disables)
+            max_retries: Retries per call (default from env: LLM_MAX_RETRIES, 4)
+            base_delay: First backoff delay in seconds (default from env: LLM_RETRY_BASE_DELAY, 1.0)
+            max_delay: Backoff cap in seconds (default from env: LLM_RETRY_MAX_DELAY, 30.0)
+            sleep: Sleep function
+        """
+
+        def env(value: Any, name: str, default: str, cast: Callable[[str], Any]) -> Any:
+            return value if value is not None else cast(os.getenv(name, default))
+
+        self.max_concurrency = env(max_concurrency, "LLM_MAX_CONCURRENCY", "4", int)
+        self.requests_per_second = env(requests_per_second, "LLM_REQUESTS_PER_SECOND", "0", float)
+        self.tokens_per_minute = env(tokens_per_minute, "LLM_TOKENS_PER_MINUTE", "0", float)
+        self.max_retries = env(max_retries, "LLM_MAX_RETRIES", "4", int)
+        self.base_delay = env(base_delay, "LLM_RETRY_BASE_DELAY", "1.0", float)
+        self.max_delay = env(max_delay, "LLM_RETRY_MAX_DELAY", "30.0", float)
+        self._sleep = sleep
+
+        self._slots = (
+            threading.BoundedSemaphore(self.max_concurrency) if self.max_concurrency > 0 else None
+        )
+        self._requests = (
+            TokenBucket(
+                self.requests_per_second, max(self.requests_per_second, 1.0), sleep=sleep
+            )
+            if self.requests_per_second > 0
+            else None
+        )
+        self._tokens = (
+            TokenBucket(self.tokens_per_minute / 60, self.tokens_per_minute, sleep=sleep)
+            if self.tokens_per_minute > 0
+            else None
+        )
+
+        self._lock = threading.Lock()
+        self._waits: deque[float] = deque(maxlen=WAIT_SAMPLES)
+        self._counts = {
+            "calls": 0,
+            "attempts": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "failures": 0,
+            "in_flight": 0,
+            "waiting": 0,
+        }
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._backoff_total = 0.0
+
+    def _count(self, name: str, delta: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += delta
+
+    def backoff(self, attempt: int, error: BaseException) -> float:
+        """Compute the delay before retrying.
+
+        Full-jitter exponential backoff, or the server's Retry-After (plus a
+        little jitter so queued clients do not retry in lockstep).
+
+        Args:
+            attempt: Retry number, starting at 0
+            error: Error of the failed attempt
+
+        Returns:
+            Delay in seconds
+        """
+        requested = retry_after(error)
+        if requested is not None:
+            return min(requested, self.max_delay) + random.uniform(0, self.base_delay / 4)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def _admit(self, estimated_tokens: int) -> None:
+        """Wait for rate limit tokens and a free slot, recording the delay."""
+        self._count("waiting")
+        start = time.monotonic()
+        try:
+            if self._requests:
+                self._requests.acquire()
+            if self._tokens and estimated_tokens:
+                self._tokens.acquire(estimated_tokens)
+            if self._slots:
+                self._slots.acquire()
+        finally:
+            waited = time.monotonic() - start
+            with self._lock:
+                self._counts["waiting"] -= 1
+                self._waits.append(waited)
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+
+    def call(
+        self,
+        fn: Callable[[], T],
+        estimated_tokens: int = 0,
+        used_tokens: Callable[[T], int | None] | None = None,
+    ) -> T:
+        """Run an LLM call under the rate limits, retrying transient errors.
+
+        Args:
+            fn: Function performing one attempt of the call
+            estimated_tokens: Tokens reserved from the tokens/min budget up front
+            used_tokens: Extracts actual token usage from the result, to
+                correct the reservation
+
+        Returns:
+            Result of fn
+
+        Raises:
+            Exception: The last error once retries are exhausted, or any
+                non-retryable error immediately
+        """
+        self._count("calls")
+        attempt = 0
+        while True:
+            self._admit(estimated_tokens)
+            self._count("attempts")
+            self._count("in_flight")
+            try:
+                result = fn()
+            except Exception as e:
+                if getattr(e, "status_code", None) == 429:
+                    self._count("rate_limited")
+                if attempt >= self.max_retries or not is_retryable(e):
+                    self._count("failures")
+                    raise
+                delay = self.backoff(attempt, e)
+                get_metrics().inc(
+                    "langgraphx_llm_retries_total",
+                    error=getattr(e, "status_code", None) or type(e).__name__,
+                )
+            else:
+                if self._tokens and used_tokens:
+                    used = used_tokens(result)
+                    if used is not None:
+                        self._tokens.adjust(used - estimated_tokens)
+                return result
+            finally:
+                self._count("in_flight", -1)
+                if self._slots:
+                    self._slots.release()
+
+            # Back off without holding a slot so other calls can proceed
+            attempt += 1
+            self._count("retries")
+            with self._lock:
+                self._backoff_total += delay
+            self._sleep(delay)
+
+    def stats(self) -> GovernorStats:
+        """Get a snapshot of call and queueing metrics."""
+        with self._lock:
+            waits = sorted(self._waits)
+            counts = dict(self._counts)
+            wait_total, wait_max, backoff_total = (
+                self._wait_total,
+                self._wait_max,
+                self._backoff_total,
+            )
+
+        def percentile(q: float) -> float:
+            if not waits:
+                return 0.0
+            if len(waits) == 1:
+                return round(waits[0] * 1000, 2)
+            return round(statistics.quantiles(waits, n=100)[int(q) - 1] * 1000, 2)
+
+        return GovernorStats(
+            calls=counts["calls"],
+            attempts=counts["attempts"],
+            retries=counts["retries"],
+            rate_limited=counts["rate_limited"],
+            failures=counts["failures"],
+            in_flight=counts["in_flight"],
+            waiting=counts["waiting"],
+            queue_wait_total_s=round(wait_total, 3),
+            queue_wait_p50_ms=percentile(50),
+            queue_wait_p95_ms=percentile(95),
+            queue_wait_max_ms=round(wait_max * 1000, 2),
+            backoff_total_s=round(backoff_total, 3),
+        )
+
+
+_governor: LLMGovernor | None = None
+_governor_lock = threading.Lock()
+
+
+def get_governor() -> LLMGovernor:
+    """Get the process-wide governor, creating it from env settings on first use.
+
+    Returns:
+        Shared LLMGovernor instance
+    """
+    global _governor
+    if _governor is None:
+        with _governor_lock:
+            if _governor is None:
+                _governor = LLMGovernor()
+    return _governor
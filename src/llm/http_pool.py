@@ -0,0 +1,141 @@
+"""Shared, pooled HTTP client for model calls to vscode-lm-proxy.
+
+Each ChatAnthropic instance otherwise builds its own HTTP client with
+default limits and timeouts. All model instances in the process share this
+one client instead, so keep-alive connections to the proxy are reused
+across agents, tasks and worker threads.
+"""
+
+import atexit
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
+from typing import Any
+
+import anthropic
+
+_client: Any = None
+_lock = threading.Lock()
+
+
+def _httpx() -> ModuleType:
+    """Get the httpx package the Anthropic SDK is built on.
+
+    Older SDKs use httpx; newer ones ship the httpx2 fork and reject httpx
+    objects, so Limits/Timeout must come from the same package.
+    """
+    base = anthropic.DefaultHttpxClient.__mro__[1]
+    return sys.modules[base.__module__.partition(".")[0]]
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+def http2_available() -> bool:
+    """Check whether the h2 package needed for HTTP/2 is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_http_client() -> Any:
+    """Create a pooled HTTP client from env settings.
+
+    Env:
+        LLM_HTTP_MAX_CONNECTIONS: Open connections at most (default 20)
+        LLM_HTTP_MAX_KEEPALIVE: Idle connections kept for reuse (default 10)
+        LLM_HTTP_KEEPALIVE_EXPIRY: Seconds an idle connection is kept (default 60)
+        LLM_HTTP_CONNECT_TIMEOUT: Seconds to establish a connection (default 5)
+        LLM_HTTP_READ_TIMEOUT: Seconds to wait for response data (default 300)
+        LLM_HTTP_POOL_TIMEOUT: Seconds to wait for a free connection (default 30)
+        LLM_HTTP2: Use HTTP/2 when the h2 package is installed (default 0)
+
+    Returns:
+        anthropic.DefaultHttpxClient (TCP keep-alive enabled)
+    """
+    httpx = _httpx()
+    connect = _env_float("LLM_HTTP_CONNECT_TIMEOUT", 5.0)
+    read = _env_float("LLM_HTTP_READ_TIMEOUT", 300.0)
+    timeout = httpx.Timeout(
+        connect=connect,
+        read=read,
+        write=read,
+        pool=_env_float("LLM_HTTP_POOL_TIMEOUT", 30.0),
+    )
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "20")),
+        max_keepalive_connections=int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "10")),
+        keepalive_expiry=_env_float("LLM_HTTP_KEEPALIVE_EXPIRY", 60.0),
+    )
+    http2 = os.getenv("LLM_HTTP2", "0").strip().lower() in ("1", "true", "yes")
+    if http2 and not http2_available():
+        print("⚠️  LLM_HTTP2 is set but the h2 package is not installed; using HTTP/1.1")
+        http2 = False
+    return anthropic.DefaultHttpxClient(timeout=timeout, limits=limits, http2=http2)
+
+
+def get_http_client() -> Any:
+    """Get the process-wide HTTP client, creating it on first use.
+
+    Returns:
+        Shared anthropic.DefaultHttpxClient
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = create_http_client()
+    return _client
+
+
+def close_http_client() -> None:
+    """Close the shared HTTP client and its pooled connections."""
+    global _client
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+atexit.register(close_http_client)
+
+
+def warm_up(url: str, connections: int | None = None) -> float:
+    """Open keep-alive connections to the proxy before the first model call.
+
+    Sends concurrent HEAD requests so up to `connections` connections are
+    established and returned to the pool. Any HTTP response counts as
+    reachable; only transport errors fail.
+
+    Args:
+        url: Proxy URL
+        connections: Connections to open (default from env: LLM_WARMUP_CONNECTIONS)
+
+    Returns:
+        Seconds spent warming up
+
+    Raises:
+        ConnectionError: If the proxy cannot be reached
+    """
+    if connections is None:
+        connections = int(os.getenv("LLM_WARMUP_CONNECTIONS", "0"))
+    if connections <= 0:
+        return 0.0
+
+    client = get_http_client()
+    httpx = _httpx()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=connections) as pool:
+        futures = [pool.submit(client.head, url) for _ in range(connections)]
+        for future in futures:
+            try:
+                future.result()
+            except httpx.TransportError as e:
+                raise ConnectionError(f"Cannot reach vscode-lm-proxy at {url}: {e}") from e
+    return time.perf_counter() - start
@@ -1,16 +1,113 @@
 """LLM client for vscode-lm-proxy integration."""
 
 import os
+import threading
+import time
+from functools import cached_property
 from typing import Any
 
 from anthropic import Anthropic
 from dotenv import load_dotenv
 from langchain_anthropic import ChatAnthropic
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
+
+from src.config.schema import ModelSettings
+from src.llm.governor import get_governor
+from src.llm.http_pool import get_http_client, warm_up
+from src.llm.roles import DEFAULT_MAX_TOKENS, DEFAULT_TEMPERATURE, ROLES, role_settings
+from src.metrics import get_metrics
+from src.recording import ReplayChatModel, Replayer, get_replayer, get_run_recorder
 
 # Load environment variables
 load_dotenv()
 
 
+def estimate_tokens(messages: list[BaseMessage]) -> int:
+    """Roughly estimate input tokens (about 4 characters per token).
+
+    Args:
+        messages: Messages sent to the model
+
+    Returns:
+        Estimated token count
+    """
+    return sum(len(str(message.content)) for message in messages) // 4 + 1
+
+
+def _used_tokens(result: ChatResult) -> int | None:
+    """Get input plus output tokens reported for a model call."""
+    if not result.generations:
+        return None
+    usage = getattr(result.generations[0].message, "usage_metadata", None)
+    return usage["total_tokens"] if usage else None
+
+
+def _record_tokens(model: str, result: ChatResult) -> None:
+    """Count a call's tokens by type; cache reads against input give the prompt cache hit rate."""
+    if not result.generations:
+        return
+    usage = getattr(result.generations[0].message, "usage_metadata", None) or {}
+    details = usage.get("input_token_details") or {}
+    metrics = get_metrics()
+    for kind, count in (
+        ("input", usage.get("input_tokens", 0)),
+        ("output", usage.get("output_tokens", 0)),
+        ("cache_read", details.get("cache_read", 0)),
+        ("cache_creation", details.get("cache_creation", 0)),
+    ):
+        if count:
+            metrics.inc("langgraphx_llm_tokens_total", count, model=model, type=kind)
+
+
+class GovernedChatAnthropic(ChatAnthropic):
+    """ChatAnthropic whose requests go through the process-wide LLMGovernor.
+
+    Covers plain and tool-bound calls alike, since bind_tools() wraps the same
+    model. The SDK's own retries are disabled so the governor's backoff and
+    metrics see every attempt. Requests use the process-wide pooled HTTP
+    client, whose timeouts take precedence over default_request_timeout.
+    """
+
+    @cached_property
+    def _client(self) -> Anthropic:
+        http_client = get_http_client()
+        return Anthropic(
+            **{**self._client_params, "http_client": http_client, "timeout": http_client.timeout}
+        )
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        generate = super()._generate
+        metrics = get_metrics()
+        start = time.perf_counter()
+        try:
+            result = get_governor().call(
+                lambda: generate(messages, stop=stop, run_manager=run_manager, **kwargs),
+                estimated_tokens=estimate_tokens(messages),
+                used_tokens=_used_tokens,
+            )
+        except Exception:
+            metrics.inc("langgraphx_llm_calls_total", model=self.model, outcome="error")
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.observe("langgraphx_llm_call_duration_seconds", elapsed, model=self.model)
+        metrics.inc("langgraphx_llm_calls_total", model=self.model, outcome="ok")
+        if metrics.enabled:
+            _record_tokens(self.model, result)
+        recorder = get_run_recorder()
+        if recorder is not None:
+            recorder.record_llm(self.model, messages, result, elapsed, run_manager)
+        return result
+
+
 class LLMClient:
     """Client for interacting with Claude via vscode-lm-proxy."""
 
@@ -18,48 +115,101 @@ class LLMClient:
         self,
         proxy_url: str | None = None,
         model_name: str | None = None,
+        replayer: Replayer | None = None,
     ) -> None:
         """Initialize LLM client.
 
         Args:
             proxy_url: vscode-lm-proxy URL (default from env: LM_PROXY_URL)
             model_name: Model name (default from env: MODEL_NAME)
+            replayer: Answer calls from this recording instead of the proxy
+                (default: get_replayer(), set by env LLM_REPLAY)
 
         Raises:
             ConnectionError: If proxy connection fails
         """
         self.proxy_url = proxy_url or os.getenv("LM_PROXY_URL", "http://localhost:4000/anthropic")
         self.model_name = model_name or os.getenv("MODEL_NAME", "claude-sonnet-4.5")
+        self.replayer = replayer or get_replayer()
 
-        # Validate proxy connection
-        self._validate_connection()
+        # Validate proxy connection (a replay never contacts it)
+        if self.replayer is None:
+            self._validate_connection()
+
+        # Models by (model, max_tokens, temperature); all share one HTTP pool
+        self._models: dict[tuple[str, int, float], GovernedChatAnthropic | ReplayChatModel] = {}
+        self._models_lock = threading.Lock()
 
         # Initialize ChatAnthropic with proxy
-        self.client = ChatAnthropic(
-            model=self.model_name,
-            base_url=self.proxy_url,
-            api_key="dummy",  # vscode-lm-proxy doesn't need real API key
-            temperature=0.7,
-            max_tokens=4096,
+        self.client = self._model(
+            ModelSettings(
+                model=self.model_name,
+                max_tokens=DEFAULT_MAX_TOKENS,
+                temperature=DEFAULT_TEMPERATURE,
+            )
         )
 
+    def _model(self, settings: ModelSettings) -> GovernedChatAnthropic | ReplayChatModel:
+        """Get the chat model for complete settings, creating it on first use."""
+        key = (settings["model"], settings["max_tokens"], settings["temperature"])
+        with self._models_lock:
+            model = self._models.get(key)
+            if model is None and self.replayer is not None:
+                model = ReplayChatModel(model=key[0], replayer=self.replayer)
+                self._models[key] = model
+            elif model is None:
+                model = GovernedChatAnthropic(
+                    model=key[0],
+                    base_url=self.proxy_url,
+                    api_key="dummy",  # vscode-lm-proxy doesn't need real API key
+                    temperature=key[2],
+                    max_tokens=key[1],
+                    max_retries=0,  # Retried by the governor
+                )
+                self._models[key] = model
+        return model
+
     def _validate_connection(self) -> None:
         """Validate connection to vscode-lm-proxy.
 
+        Opens LLM_WARMUP_CONNECTIONS pooled connections up front so the first
+        model calls skip connection setup. Disabled by default (0); the
+        connection is then tested on first actual use.
+
         Raises:
             ConnectionError: If proxy is not accessible
         """
-        # Skip validation - connection will be tested on first actual use
-        # This avoids issues with proxy initialization
-        pass
+        warm_up(self.proxy_url)
 
-    def get_chat_model(self) -> ChatAnthropic:
+    def get_chat_model(
+        self, role: str | None = None, overrides: ModelSettings | None = None
+    ) -> ChatAnthropic:
         """Get the ChatAnthropic instance for use in agents.
 
+        Args:
+            role: Agent role whose model tier to use (optional, default model)
+            overrides: Project-level model settings for the role (optional)
+
         Returns:
             ChatAnthropic instance configured with proxy
         """
-        return self.client
+        if role is None and not overrides:
+            return self.client
+        return self._model(role_settings(role or "", overrides, self.model_name))
+
+    def role_models(self, models: dict[str, ModelSettings] | None = None) -> dict[str, str]:
+        """Get the model each agent role resolves to.
+
+        Args:
+            models: Project-level per-role settings (optional)
+
+        Returns:
+            Mapping of role to model name
+        """
+        models = models or {}
+        return {
+            role: role_settings(role, models.get(role), self.model_name)["model"] for role in ROLES
+        }
 
     def create_with_tools(self, tools: list[Any]) -> ChatAnthropic:
         """Create a ChatAnthropic instance bound with tools.
@@ -0,0 +1,127 @@
+"""Per-role model selection (model tiering).
+
+Cheap steps such as the supervisor's one-word routing decision don't need
+the large model or a 4096-token budget. Each agent role resolves its model
+settings from, in increasing precedence:
+
+1. MODEL_NAME with the default parameters
+2. Built-in role defaults (ROLE_DEFAULTS)
+3. Env: MODEL_<ROLE>, MAX_TOKENS_<ROLE>, TEMPERATURE_<ROLE>
+4. The project's config.yaml `models.<role>` section
+"""
+
+import os
+from typing import Any
+
+from src.config.schema import ModelSettings, ProjectContext
+
+# Agent roles that can be configured
+ROLES = ("supervisor", "architect", "developer", "reviewer", "tester")
+
+DEFAULT_MODEL = "claude-sonnet-4.5"
+DEFAULT_MAX_TOKENS = 4096
+DEFAULT_TEMPERATURE = 0.7
+
+# The supervisor answers with a single agent name
+ROLE_DEFAULTS: dict[str, ModelSettings] = {
+    "supervisor": ModelSettings(max_tokens=16, temperature=0.0),
+}
+
+_FIELDS = {"model": str, "max_tokens": int, "temperature": float}
+
+
+def default_settings(model: str | None = None) -> ModelSettings:
+    """Get the model settings used when no role is given.
+
+    Args:
+        model: Default model (default from env: MODEL_NAME)
+
+    Returns:
+        ModelSettings
+    """
+    return ModelSettings(
+        model=model or os.getenv("MODEL_NAME", DEFAULT_MODEL),
+        max_tokens=DEFAULT_MAX_TOKENS,
+        temperature=DEFAULT_TEMPERATURE,
+    )
+
+
+def validate_models(models: Any) -> dict[str, ModelSettings]:
+    """Validate a `models` section of a project config.
+
+    Args:
+        models: Raw value from config.yaml
+
+    Returns:
+        Validated per-role settings
+
+    Raises:
+        ValueError: If a role or parameter is unknown or has the wrong type
+    """
+    if not isinstance(models, dict):
+        raise ValueError("models must be a mapping of agent role to model settings")
+    for role, settings in models.items():
+        if role not in ROLES:
+            raise ValueError(f"Unknown agent role in models: {role} (expected one of {ROLES})")
+        if not isinstance(settings, dict):
+            raise ValueError(f"models.{role} must be a mapping")
+        for key, value in settings.items():
+            expected = _FIELDS.get(key)
+            if expected is None:
+                raise ValueError(f"Unknown model setting models.{role}.{key}")
+            numeric = expected is float and isinstance(value, int)
+            if not isinstance(value, expected) and not numeric:
+                raise ValueError(f"models.{role}.{key} must be {expected.__name__}")
+    return models
+
+
+def role_settings(
+    role: str, overrides: ModelSettings | None = None, default_model: str | None = None
+) -> ModelSettings:
+    """Resolve the model settings of an agent role.
+
+    Args:
+        role: Agent role
+        overrides: Project-level settings for the role (optional)
+        default_model: Model used when nothing role-specific is set
+            (default from env: MODEL_NAME)
+
+    Returns:
+        Complete ModelSettings
+    """
+    settings = default_settings(default_model)
+    settings.update(ROLE_DEFAULTS.get(role, {}))
+
+    suffix = role.upper()
+    if model := os.getenv(f"MODEL_{suffix}"):
+        settings["model"] = model
+    if max_tokens := os.getenv(f"MAX_TOKENS_{suffix}"):
+        settings["max_tokens"] = int(max_tokens)
+    if temperature := os.getenv(f"TEMPERATURE_{suffix}"):
+        settings["temperature"] = float(temperature)
+
+    settings.update(overrides or {})
+    return settings
+
+
+def get_role_llm(config: Any, role: str, project_context: ProjectContext | None = None) -> Any:
+    """Get the chat model an agent node should use.
+
+    Uses the run's LLMClient ('llm_client' in config["configurable"]) to pick
+    the role's tier, falling back to the single 'llm' model when no client
+    is configured.
+
+    Args:
+        config: Runnable configuration
+        role: Agent role
+        project_context: Current project context, for project-level overrides
+
+    Returns:
+        Chat model for the role
+    """
+    configurable = config["configurable"]
+    client = configurable.get("llm_client")
+    if client is None:
+        return configurable["llm"]
+    overrides = (project_context or {}).get("info", {}).get("models", {}).get(role)
+    return client.get_chat_model(role, overrides)
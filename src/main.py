@@ -1,14 +1,14 @@
 """CLI entry point for LangGraphX."""
 
 import argparse
+import os
 import sys
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from langchain_core.messages import HumanMessage
-
-from src.config.projects import create_project_registry
-from src.graph.builder import create_graph, get_all_tools
-from src.llm.proxy_client import create_llm_client
+# LangGraph, LangChain and the Anthropic SDK take seconds to import, so they
+# are imported where needed: listing projects or a bad flag never loads them
+if TYPE_CHECKING:
+    from src.graph.sessions import SessionManager
 
 
 def run_task(
@@ -18,7 +18,9 @@ def run_task(
     graph=None,
     llm_client=None,
     tools=None,
-) -> None:
+    session: str | None = None,
+    sessions: SessionManager | None = None,
+) -> str:
     """Execute a single task.
 
     Args:
@@ -28,50 +30,170 @@ def run_task(
         graph: Compiled graph instance
         llm_client: LLM client instance
         tools: Available tools list
+        session: Existing thread ID to continue (optional, new thread per task by default)
+        sessions: Session manager (optional, created from the graph's checkpointer)
+
+    Returns:
+        Thread ID the task ran in
+    """
+    from src.runner import print_event, stream_task
+
+    thread_id = ""
+    for event in stream_task(
+        task, project, registry, graph, llm_client, tools, session=session, sessions=sessions
+    ):
+        print_event(event)
+        thread_id = event.get("thread_id", thread_id)
+    return thread_id
+
+
+def print_projects(registry) -> None:
+    """Print available projects, reporting ones whose configuration is invalid.
+
+    Args:
+        registry: Project registry instance
+    """
+    print("📂 Available projects:")
+    errors = registry.errors()
+    for project in registry.list_names():
+        if project in errors:
+            print(f"  - {project} ⚠️  invalid: {errors[project]}")
+            continue
+        info = registry.get(project)
+        print(f"  - {project} ({info['type']}): {info['description']}")
+
+
+def print_sessions(sessions: SessionManager, project: str | None = None) -> None:
+    """Print known sessions, newest first.
+
+    Args:
+        sessions: Session manager
+        project: Only list sessions of this project (optional)
+    """
+    items = sessions.list_sessions(project)
+    if not items:
+        print("📭 No sessions found")
+        return
+
+    print("🧵 Sessions:")
+    for item in items:
+        print(
+            f"  - {item['thread_id']} ({item['project']}): "
+            f"{item['checkpoints']} checkpoints, updated {item['updated_at']}"
+        )
+
+
+def run_batch_file(
+    tasks: list[Any],
+    output: str | None,
+    concurrency: int | None,
+    registry,
+    graph,
+    llm_client,
+    tools,
+    sessions: SessionManager,
+) -> int:
+    """Run a loaded batch, printing progress and a summary.
+
+    Args:
+        tasks: Tasks from load_tasks
+        output: JSONL results file (optional, timestamped file in .langgraphx/)
+        concurrency: Tasks run at once (optional, default from env: BATCH_CONCURRENCY)
+        registry: Project registry instance
+        graph: Compiled graph instance
+        llm_client: LLM client instance
+        tools: Available tools list
+        sessions: Session manager
+
+    Returns:
+        Number of failed tasks
     """
-    # Use provided project or default to first available
-    projects = registry.list_names()
-    current_project = project if project and project in projects else projects[0]
-
-    print(f"\n🔄 Processing task with {current_project}...\n")
-
-    # Load project context
-    context = registry.load_context(current_project)
-
-    # Prepare state
-    initial_state: dict[str, Any] = {
-        "messages": [HumanMessage(content=task)],
-        "current_project": current_project,
-        "projects": {p: registry.get(p) for p in projects},
-        "project_context": context,
-        "next_agent": "",
-        "task": task,
-    }
-
-    # Configure graph
-    config = {
-        "configurable": {
-            "llm": llm_client.get_chat_model(),
-            "tools": tools,
-            "thread_id": f"{current_project}_session",
-        }
-    }
-
-    # Execute workflow
-    for event in graph.stream(initial_state, config):
-        for node_name, node_output in event.items():
-            print(f"📍 {node_name.upper()}")
-
-            if "messages" in node_output:
-                messages = node_output["messages"]
-                if messages:
-                    last_message = messages[-1]
-                    print(f"💬 {last_message.content}\n")
-
-            if "next_agent" in node_output and node_output["next_agent"]:
-                print(f"➡️  Routing to: {node_output['next_agent']}\n")
-
-    print("✅ Task completed!\n")
+    import time
+    from datetime import datetime
+
+    from src.batch import BatchResult, run_batch
+
+    if output is None:
+        output = f".langgraphx/batch-{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl"
+
+    def report(result: BatchResult) -> None:
+        mark = {"ok": "✅", "cancelled": "🛑"}.get(result["status"], "❌")
+        detail = result["error"] or " → ".join(result["steps"])
+        print(f"  {mark} [{result['id']}] {result['project']} {result['duration_s']}s: {detail}")
+
+    print(f"📋 Running {len(tasks)} tasks → {output}\n")
+    start = time.perf_counter()
+    try:
+        results = run_batch(
+            tasks,
+            registry,
+            graph,
+            llm_client,
+            tools,
+            output,
+            concurrency=concurrency,
+            sessions=sessions,
+            on_result=report,
+        )
+    except KeyboardInterrupt:
+        print(f"\n🛑 Batch cancelled; results of tasks that ran are in {output}.")
+        sys.exit(130)
+    elapsed = time.perf_counter() - start
+
+    failed = sum(1 for r in results if r["status"] != "ok")
+    busy = sum(r["duration_s"] for r in results)
+    print(
+        f"\n📊 {len(results) - failed}/{len(results)} succeeded in {elapsed:.1f}s "
+        f"({len(results) / elapsed:.2f} tasks/s, {busy / elapsed:.1f}x parallelism)"
+    )
+
+    from src.llm.governor import get_governor
+
+    llm = get_governor().stats()
+    print(
+        f"🚦 LLM: {llm['calls']} calls, {llm['retries']} retries "
+        f"({llm['rate_limited']} rate limited), "
+        f"queue wait p50 {llm['queue_wait_p50_ms']} ms / p95 {llm['queue_wait_p95_ms']} ms"
+    )
+
+    from src.agents.speculation import get_speculator
+
+    speculation = get_speculator().stats()
+    if speculation["enabled"]:
+        print(
+            f"🔮 Speculation: {speculation['hits']}/{speculation['started']} hits "
+            f"({speculation['hit_rate']:.0%}), {speculation['wasted_tokens']} tokens wasted"
+        )
+    return failed
+
+
+def replay_setup(args: argparse.Namespace) -> None:
+    """Configure a replay run from --replay.
+
+    Replays use an in-memory checkpointer and no speculative or hedged calls,
+    which would not match the recording. Without a task, the recording's
+    first task is run again on its project and topology.
+
+    Args:
+        args: Parsed arguments (task and project are filled in)
+    """
+    from src.recording import get_replayer
+
+    os.environ["LLM_REPLAY"] = args.replay
+    os.environ["CHECKPOINT_BACKEND"] = "memory"
+    os.environ["SPECULATIVE_ROUTING"] = "0"
+    os.environ["LLM_HEDGE"] = "0"
+
+    try:
+        replayer = get_replayer()
+    except (OSError, ValueError) as e:
+        print(f"❌ Cannot read recording: {e}")
+        sys.exit(2)
+    tasks = replayer.recording.tasks if replayer is not None else []
+    if not args.task and tasks:
+        args.task = tasks[0]["task"]
+        args.project = args.project or tasks[0]["project"]
+        os.environ.setdefault("GRAPH_TOPOLOGY", tasks[0]["topology"])
 
 
 def main() -> None:
@@ -97,45 +219,185 @@ def main() -> None:
         action="store_true",
         help="List available projects and exit",
     )
+    parser.add_argument(
+        "-s",
+        "--session",
+        help="Continue an existing session (thread ID) instead of starting a new one",
+    )
+    parser.add_argument(
+        "--list-sessions",
+        action="store_true",
+        help="List sessions (optionally filtered by --project) and exit",
+    )
+    parser.add_argument(
+        "--prune-sessions",
+        type=int,
+        metavar="KEEP",
+        help="Delete all but the KEEP most recent sessions per project and exit",
+    )
+    parser.add_argument(
+        "-b",
+        "--batch",
+        metavar="FILE",
+        help="Run all tasks of a YAML/JSONL batch file concurrently and exit",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        metavar="FILE",
+        help="JSONL file for batch results (default: .langgraphx/batch-<time>.jsonl)",
+    )
+    parser.add_argument(
+        "-j",
+        "--concurrency",
+        type=int,
+        help="Batch tasks run at once (default from env: BATCH_CONCURRENCY, 4)",
+    )
+    parser.add_argument(
+        "--local",
+        action="store_true",
+        help="Run the task in this process even if a LangGraphX server is running",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Record node, model and tool spans; runs the task locally (same as env TRACE=1)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile nodes and tools; runs the task locally (same as env PROFILE=1)",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="FILE",
+        help="Record model calls and tool results of the run to FILE (same as env LLM_RECORD)",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="FILE",
+        help="Run offline against a recording, repeating its first task if none is given",
+    )
 
     args = parser.parse_args()
+    if args.trace:
+        os.environ["TRACE"] = "1"
+    if args.profile:
+        os.environ["PROFILE"] = "1"
+    if args.record:
+        os.environ["LLM_RECORD"] = args.record
+    if args.replay:
+        replay_setup(args)
 
     print("🤖 LangGraphX - Multi-Agent Development System")
     print("=" * 60)
 
     try:
+        from src.config.projects import create_project_registry
+
+        # Handle --list-projects flag: only needs the (snapshot-cached) registry
+        registry = create_project_registry()
+        if args.list_projects:
+            print()
+            print_projects(registry)
+            return
+
+        # Handle session management flags: only need the checkpointer
+        if args.list_sessions or args.prune_sessions is not None:
+            from src.graph.checkpointer import create_checkpointer
+            from src.graph.sessions import SessionManager
+
+            sessions = SessionManager(create_checkpointer())
+            print()
+            if args.list_sessions:
+                print_sessions(sessions, args.project)
+            else:
+                deleted = sessions.prune(args.prune_sessions, args.project)
+                print(f"🧹 Deleted {len(deleted)} sessions")
+            return
+
+        # Validate the batch file before paying for initialization
+        batch_tasks = None
+        if args.batch:
+            from src.batch import load_tasks
+
+            try:
+                batch_tasks = load_tasks(args.batch)
+            except (OSError, ValueError) as e:
+                print(f"\n❌ Invalid batch file: {e}")
+                sys.exit(2)
+
+        # Submit one-shot tasks to a running server, which has everything warm;
+        # tracing and profiling need the run in this process
+        if args.task and not (
+            args.local or args.trace or args.profile or args.record or args.replay
+        ):
+            from src.client import get_server_address, is_server_running, submit_task
+            from src.runner import print_event
+
+            if is_server_running():
+                print(f"\n🔌 Submitting to server at {get_server_address()}")
+                failed = False
+                try:
+                    for event in submit_task(args.task, args.project, args.session):
+                        print_event(event)
+                        failed = failed or event["event"] == "error"
+                except RuntimeError as e:
+                    print(f"\n❌ Server rejected task: {e}")
+                    failed = True
+                except KeyboardInterrupt:
+                    # Closing the connection makes the server cancel the task
+                    print("\n\n🛑 Task cancelled.")
+                    sys.exit(130)
+                if failed:
+                    sys.exit(1)
+                return
+
         # Initialize components
         print("\n📦 Initializing components...")
 
+        from src.agents.prompt_cache import prompt_cache
+        from src.graph.builder import create_graph, get_all_tools
+        from src.graph.sessions import SessionManager
+        from src.llm.proxy_client import create_llm_client
+
         # Create LLM client
         print("  - Connecting to vscode-lm-proxy...")
         llm_client = create_llm_client()
-        print("  ✓ LLM client ready")
+        tiers = llm_client.role_models()
+        print(f"  ✓ LLM client ready ({', '.join(f'{r}: {m}' for r, m in tiers.items())})")
 
         # Load project registry
-        print("  - Loading project registry...")
-        registry = create_project_registry()
         projects = registry.list_names()
+        registry.add_reload_listener(prompt_cache.invalidate_project)
         print(f"  ✓ Found {len(projects)} projects: {', '.join(projects)}")
 
         # Build graph
         print("  - Building workflow graph...")
-        graph = create_graph(llm_client)
+        graph = create_graph()
         print("  ✓ Graph compiled")
 
         # Get tools
         tools = get_all_tools()
         print(f"  ✓ Loaded {len(tools)} tools")
 
+        sessions = SessionManager(graph.checkpointer)
+
         print("\n✅ System ready!\n")
 
-        # Handle --list-projects flag
-        if args.list_projects:
-            print("📂 Available projects:")
-            for project in projects:
-                info = registry.get(project)
-                print(f"  - {project} ({info['type']}): {info['description']}")
-            return
+        # Handle batch mode
+        if batch_tasks is not None:
+            failed = run_batch_file(
+                batch_tasks,
+                args.output,
+                args.concurrency,
+                registry,
+                graph,
+                llm_client,
+                tools,
+                sessions,
+            )
+            sys.exit(1 if failed else 0)
 
         # Handle direct task execution
         if args.task:
@@ -147,6 +409,8 @@ def main() -> None:
                     graph=graph,
                     llm_client=llm_client,
                     tools=tools,
+                    session=args.session,
+                    sessions=sessions,
                 )
             except Exception as e:
                 print(f"\n❌ Error: {e}\n")
@@ -160,6 +424,7 @@ def main() -> None:
         print("Available commands:")
         print("  - Type your task to execute")
         print("  - 'projects' to list available projects")
+        print("  - 'sessions' to list sessions, 'session <id>' to continue one, 'new' to reset")
         print("  - 'quit' or 'exit' to exit")
         print()
 
@@ -171,6 +436,15 @@ def main() -> None:
         if current_project:
             print(f"📁 Active project: {current_project}\n")
 
+        # Explicit session to continue; None starts a new thread per task
+        current_session = args.session
+
+        # Pick up edits to projects/*/config.yaml and examples.yaml without restarting
+        if os.getenv("PROJECTS_WATCH", "1") != "0":
+            from src.config.watcher import ProjectWatcher
+
+            ProjectWatcher(registry).start()
+
         while True:
             try:
                 user_input = input("💬 You: ").strip()
@@ -183,18 +457,34 @@ def main() -> None:
                     break
 
                 if user_input.lower() == "projects":
-                    print("\n📂 Available projects:")
-                    for project in projects:
-                        info = registry.get(project)
-                        print(f"  - {project} ({info['type']}): {info['description']}")
                     print()
+                    print_projects(registry)
+                    print()
+                    continue
+
+                if user_input.lower() == "sessions":
+                    print()
+                    print_sessions(sessions, current_project)
+                    print()
+                    continue
+
+                if user_input.lower() == "new":
+                    current_session = None
+                    print("\n✓ Next task starts a new session\n")
+                    continue
+
+                if user_input.lower().startswith("session "):
+                    current_session = user_input[8:].strip()
+                    print(f"\n✓ Continuing session: {current_session}\n")
                     continue
 
                 # Check if switching project
                 if user_input.lower().startswith("use "):
                     project_name = user_input[4:].strip()
+                    projects = registry.list_names()
                     if project_name in projects:
                         current_project = project_name
+                        current_session = None
                         print(f"\n✓ Switched to project: {current_project}\n")
                     else:
                         print(f"\n❌ Project not found: {project_name}")
@@ -214,6 +504,8 @@ def main() -> None:
                         graph=graph,
                         llm_client=llm_client,
                         tools=tools,
+                        session=current_session,
+                        sessions=sessions,
                     )
                 except Exception as e:
                     print(f"\n❌ Error: {e}\n")
@@ -0,0 +1,328 @@
+"""Process-wide metrics in the Prometheus text exposition format.
+
+Long-running workers need aggregates rather than per-task traces: task
+throughput, node, model and tool latency histograms, model errors and
+retries, cache hit rates and checkpoint write latency. Modules record into
+the shared registry from get_metrics(); the task server serves it at
+/metrics and METRICS_FILE dumps it periodically for node_exporter's
+textfile collector.
+
+Metrics are off by default (METRICS=0). Recording then returns after one
+attribute check, and nodes and checkpointers are not wrapped at all.
+"""
+
+import atexit
+import functools
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Histogram buckets in seconds, from fast tool calls to slow model calls
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+# name -> (type, help); recording an undeclared metric is a programming error
+METRICS: dict[str, tuple[str, str]] = {
+    "langgraphx_tasks_total": ("counter", "Tasks finished, by project and outcome"),
+    "langgraphx_task_duration_seconds": ("histogram", "Wall-clock duration of tasks"),
+    "langgraphx_node_duration_seconds": ("histogram", "Duration of graph node runs"),
+    "langgraphx_node_errors_total": ("counter", "Graph node runs that raised"),
+    "langgraphx_llm_calls_total": ("counter", "Model calls, by model and outcome"),
+    "langgraphx_llm_call_duration_seconds": (
+        "histogram",
+        "Duration of model calls including queueing and retries",
+    ),
+    "langgraphx_llm_tokens_total": ("counter", "Model tokens, by model and type"),
+    "langgraphx_llm_retries_total": ("counter", "Model call attempts retried, by error"),
+    "langgraphx_tool_calls_total": ("counter", "Tool calls, by tool and outcome"),
+    "langgraphx_tool_duration_seconds": ("histogram", "Duration of tool calls"),
+    "langgraphx_cache_requests_total": ("counter", "Cache lookups, by cache and result"),
+    "langgraphx_checkpoint_write_duration_seconds": (
+        "histogram",
+        "Duration of checkpoint writes, by operation",
+    ),
+}
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def metrics_enabled() -> bool:
+    """Check whether metrics are recorded (env METRICS, default 0)."""
+    return os.getenv("METRICS", "0").strip().lower() in ("1", "true", "yes")
+
+
+def _format_labels(labels: Labels, extra: tuple[str, str] | None = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in pairs
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Histogram:
+    """Cumulative bucket counts, sum and count of observations."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms with labels."""
+
+    def __init__(self, enabled: bool | None = None) -> None:
+        """Initialize metrics registry.
+
+        Args:
+            enabled: Record metrics (default from env: METRICS, 0)
+        """
+        self.enabled = metrics_enabled() if enabled is None else enabled
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, Labels], float] = {}
+        self._histograms: dict[tuple[str, Labels], _Histogram] = {}
+
+    @staticmethod
+    def _key(name: str, labels: dict[str, Any]) -> tuple[str, Labels]:
+        if name not in METRICS:
+            raise KeyError(f"Undeclared metric: {name}")
+        return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Increase a counter.
+
+        Args:
+            name: Declared counter name
+            value: Amount to add
+            **labels: Label values
+        """
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record an observation in a histogram.
+
+        Args:
+            name: Declared histogram name
+            value: Observed value (seconds for durations)
+            **labels: Label values
+        """
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(LATENCY_BUCKETS)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        """Observe the duration of a block in a histogram, also when it raises."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def value(self, name: str, **labels: Any) -> float:
+        """Get a counter's value, or a histogram's observation count."""
+        key = self._key(name, labels)
+        with self._lock:
+            if key in self._histograms:
+                return self._histograms[key].count
+            return self._counters.get(key, 0)
+
+    def total(self, name: str, **labels: Any) -> float:
+        """Get a histogram's sum of observations, or a counter's value."""
+        key = self._key(name, labels)
+        with self._lock:
+            if key in self._histograms:
+                return self._histograms[key].sum
+            return self._counters.get(key, 0)
+
+    def render(self) -> str:
+        """Render all recorded metrics in the Prometheus text format (version 0.0.4)."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {
+                key: (list(h.counts), h.sum, h.count) for key, h in self._histograms.items()
+            }
+
+        lines: list[str] = []
+        for name, (kind, help_text) in METRICS.items():
+            series = sorted(
+                (labels, value)
+                for (metric, labels), value in (
+                    counters.items() if kind == "counter" else histograms.items()
+                )
+                if metric == name
+            )
+            if not series:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in series:
+                if kind == "counter":
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+                counts, total, count = value
+                for bound, bucket_count in zip(LATENCY_BUCKETS, counts, strict=True):
+                    le = ("le", _format_value(bound))
+                    lines.append(f"{name}_bucket{_format_labels(labels, le)} {bucket_count}")
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def dump(self, path: str | Path) -> None:
+        """Write the rendered metrics to a file, atomically replacing it.
+
+        Args:
+            path: Output file (e.g. a node_exporter textfile collector .prom file)
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_text(self.render())
+        tmp.replace(path)
+
+
+def _dump_periodically(registry: MetricsRegistry, path: str, interval: float) -> None:
+    while True:
+        time.sleep(interval)
+        try:
+            registry.dump(path)
+        except OSError:
+            # Keep dumping; the directory may come back
+            pass
+
+
+_registry: MetricsRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Get the process-wide metrics registry, creating it from env settings on first use.
+
+    Env:
+        METRICS: Record metrics (default 0)
+        METRICS_FILE: File the metrics are dumped to (optional)
+        METRICS_DUMP_INTERVAL: Seconds between dumps (default 15); also dumped at exit
+
+    Returns:
+        Shared MetricsRegistry instance
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                registry = MetricsRegistry()
+                path = os.getenv("METRICS_FILE")
+                if registry.enabled and path:
+                    interval = float(os.getenv("METRICS_DUMP_INTERVAL", "15"))
+                    threading.Thread(
+                        target=_dump_periodically,
+                        args=(registry, path, interval),
+                        name="metrics-dump",
+                        daemon=True,
+                    ).start()
+                    atexit.register(registry.dump, path)
+                _registry = registry
+    return _registry
+
+
+def instrument_node(name: str, node: F) -> F:
+    """Wrap a graph node to record its duration and errors.
+
+    Returns the node itself when metrics are off. The wrapper keeps the
+    node's signature (via __wrapped__), so LangGraph still passes config to
+    nodes that take it.
+
+    Args:
+        name: Node name
+        node: Node function
+
+    Returns:
+        Instrumented node
+    """
+    metrics = get_metrics()
+    if not metrics.enabled:
+        return node
+
+    @functools.wraps(node)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return node(*args, **kwargs)
+        except Exception:
+            metrics.inc("langgraphx_node_errors_total", node=name)
+            raise
+        finally:
+            metrics.observe(
+                "langgraphx_node_duration_seconds", time.perf_counter() - start, node=name
+            )
+
+    return wrapper  # type: ignore[return-value]
+
+
+def timed_tool(fn: F) -> F:
+    """Record a tool's calls and duration; apply below @tool.
+
+    Tools report failures as a result dict with an 'error' key rather than
+    raising, so those count as errors too.
+
+    Args:
+        fn: Tool function
+
+    Returns:
+        Instrumented function with the same name, signature and docstring
+    """
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        metrics = get_metrics()
+        if not metrics.enabled:
+            return fn(*args, **kwargs)
+        outcome = "error"
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+            if not (isinstance(result, dict) and "error" in result):
+                outcome = "ok"
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.observe("langgraphx_tool_duration_seconds", elapsed, tool=name)
+            metrics.inc("langgraphx_tool_calls_total", tool=name, outcome=outcome)
+
+    return wrapper  # type: ignore[return-value]
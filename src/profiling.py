@@ -0,0 +1,379 @@
+"""Opt-in cProfile and tracemalloc profiling of graph nodes and tools.
+
+With PROFILE=1 (or --profile), node and tool calls are timed, and one call
+at a time runs under cProfile, with tracemalloc snapshots taken around it
+to record what it allocated. At the end of a task, per-node .prof files
+(for pstats, snakeviz or gprof2dot) and a report are written to PROFILE_DIR.
+
+The report splits each node's wall time into our code (src/), library code
+and time blocked waiting: on locks (a model call running on a worker
+thread), sockets, select or sleep. A node dominated by waiting is network
+bound; one dominated by src/ time points at prompt building, search or
+serialization.
+
+cProfile allows one active profiler per process (since Python 3.12 it is
+built on sys.monitoring), so one call is profiled at a time. A node or tool
+that starts while another thread's call is being profiled, such as a
+parallel plan worker, runs unprofiled and only adds its calls and wall time
+to the report; 'profiled' counts the calls that ran under cProfile. A tool
+called inside a profiled node shows up in that node's profile rather than
+its own. Profiles are collected process-wide; profile one task at a time.
+"""
+
+import cProfile
+import functools
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from typing import Any, TypedDict, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+DEFAULT_PROFILE_DIR = ".langgraphx/profiles"
+
+# Our code, as opposed to libraries
+SRC_DIR = str(Path(__file__).resolve().parent)
+
+# Built-in functions in which a thread blocks rather than runs Python
+WAIT_MARKERS = (
+    "acquire' of '_thread",
+    "time.sleep",
+    "select.select",
+    "'poll' of 'select",
+    "'recv",
+    "'read' of '_ssl",
+    "'connect' of '_socket",
+    "getaddrinfo",
+)
+
+# Held by the one call being profiled: cProfile allows one active profiler per process
+_profile_slot = threading.Lock()
+
+# Frames tracemalloc keeps per allocation
+TRACEMALLOC_FRAMES = 1
+
+# Allocations made by the profilers themselves are not the node's
+_OWN_ALLOCATIONS = [
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, cProfile.__file__),
+]
+
+
+class ProfileSummary(TypedDict):
+    """Wall time split and allocations of one node or tool over a task."""
+
+    kind: str  # node | tool
+    name: str
+    calls: int
+    profiled: int  # Calls run under cProfile; the rest overlapped another profiled call
+    wall_ms: float
+    src_ms: float
+    library_ms: float
+    wait_ms: float
+    alloc_kb: float
+
+
+class _Record(TypedDict):
+    kind: str
+    name: str
+    wall: float
+    profile: cProfile.Profile | None  # None when the call ran unprofiled
+    allocations: list[tracemalloc.StatisticDiff]
+
+
+def profiling_enabled() -> bool:
+    """Check whether nodes and tools are profiled (env PROFILE, default 0)."""
+    return os.getenv("PROFILE", "0").strip().lower() in ("1", "true", "yes")
+
+
+def _is_wait(func: tuple[str, int, str]) -> bool:
+    return func[0] == "~" and any(marker in func[2] for marker in WAIT_MARKERS)
+
+
+def split_time(stats: pstats.Stats) -> tuple[float, float, float]:
+    """Split profiled time by where it was spent.
+
+    Args:
+        stats: Profile statistics
+
+    Returns:
+        Seconds in src/ code, in library code, and blocked waiting
+    """
+    src = library = wait = 0.0
+    entries = stats.stats.items()  # type: ignore[attr-defined]
+    for func, (_cc, _nc, tottime, _ct, _callers) in entries:
+        if _is_wait(func):
+            wait += tottime
+        elif func[0].startswith(SRC_DIR):
+            src += tottime
+        else:
+            library += tottime
+    return src, library, wait
+
+
+class Profiler:
+    """Collects cProfile and tracemalloc results of node and tool calls."""
+
+    def __init__(
+        self,
+        enabled: bool | None = None,
+        memory: bool | None = None,
+        top: int | None = None,
+        profile_dir: str | Path | None = None,
+    ) -> None:
+        """Initialize profiler.
+
+        Args:
+            enabled: Profile calls (default from env: PROFILE, 0)
+            memory: Snapshot allocations with tracemalloc, which slows Python
+                code down noticeably (default from env: PROFILE_MEMORY, 1)
+            top: Functions and allocation sites listed per node in the report
+                (default from env: PROFILE_TOP, 15)
+            profile_dir: Output directory (default from env: PROFILE_DIR,
+                .langgraphx/profiles)
+        """
+        self.enabled = profiling_enabled() if enabled is None else enabled
+        self.memory = (
+            os.getenv("PROFILE_MEMORY", "1") != "0" if memory is None else memory
+        ) and self.enabled
+        self.top = top if top is not None else int(os.getenv("PROFILE_TOP", "15"))
+        self.profile_dir = Path(profile_dir or os.getenv("PROFILE_DIR", DEFAULT_PROFILE_DIR))
+        self._lock = threading.Lock()
+        self._records: list[_Record] = []
+        self._active = threading.local()
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+
+    def call(self, kind: str, name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a call under cProfile, recording its allocations.
+
+        Calls nested in a profiled call on the same thread run unprofiled;
+        they appear in the outer call's profile. Calls that start while
+        another thread's call is profiled, or while a profiler outside this
+        module is active, run unprofiled and record only their wall time.
+
+        Args:
+            kind: 'node' or 'tool'
+            name: Node or tool name
+            fn: Function to call
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            Result of fn
+        """
+        if not self.enabled or getattr(self._active, "on", False):
+            return fn(*args, **kwargs)
+
+        profile: cProfile.Profile | None = None
+        before: tracemalloc.Snapshot | None = None
+        if _profile_slot.acquire(blocking=False):
+            before = tracemalloc.take_snapshot() if self.memory else None
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # A profiler outside this module holds the process's profiler slot
+                profile = before = None
+                _profile_slot.release()
+
+        self._active.on = True
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            wall = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+                _profile_slot.release()
+            self._active.on = False
+            allocations: list[tracemalloc.StatisticDiff] = []
+            if before is not None:
+                after = tracemalloc.take_snapshot().filter_traces(_OWN_ALLOCATIONS)
+                allocations = [
+                    diff
+                    for diff in after.compare_to(before.filter_traces(_OWN_ALLOCATIONS), "lineno")
+                    if diff.size_diff > 0
+                ]
+            record = _Record(
+                kind=kind, name=name, wall=wall, profile=profile, allocations=allocations
+            )
+            with self._lock:
+                self._records.append(record)
+
+    def finish(self, label: str) -> tuple[Path, list[ProfileSummary]] | None:
+        """Write profiles and the report for the calls made since the last finish.
+
+        Args:
+            label: Run label for the output directory (e.g. the task's thread ID)
+
+        Returns:
+            Output directory and per-node summary, or None if nothing was profiled
+        """
+        with self._lock:
+            records, self._records = self._records, []
+        if not records:
+            return None
+
+        safe_label = "".join(c if c.isalnum() or c in "-_" else "_" for c in label)
+        out = self.profile_dir / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{safe_label}"
+        out.mkdir(parents=True, exist_ok=True)
+
+        groups: dict[tuple[str, str], list[_Record]] = {}
+        for record in records:
+            groups.setdefault((record["kind"], record["name"]), []).append(record)
+
+        summaries: list[ProfileSummary] = []
+        sections: list[str] = []
+        for (kind, name), group in groups.items():
+            profiles = [r["profile"] for r in group if r["profile"] is not None]
+            stats: pstats.Stats | None = None
+            src = library = wait = 0.0
+            if profiles:
+                stats = pstats.Stats(profiles[0])
+                for profile in profiles[1:]:
+                    stats.add(profile)
+                stats.dump_stats(str(out / f"{kind}-{name}.prof"))
+                src, library, wait = split_time(stats)
+
+            allocations = _merge_allocations(group)
+            summary = ProfileSummary(
+                kind=kind,
+                name=name,
+                calls=len(group),
+                profiled=len(profiles),
+                wall_ms=round(sum(r["wall"] for r in group) * 1000, 1),
+                src_ms=round(src * 1000, 1),
+                library_ms=round(library * 1000, 1),
+                wait_ms=round(wait * 1000, 1),
+                alloc_kb=round(sum(allocations.values()) / 1024, 1),
+            )
+            summaries.append(summary)
+            sections.append(self._section(summary, stats, allocations))
+
+        summaries.sort(key=lambda s: -s["wall_ms"])
+        report = [format_profile(summaries), "", *sections]
+        (out / "report.txt").write_text("\n".join(report))
+        return out, summaries
+
+    def _section(
+        self,
+        summary: ProfileSummary,
+        stats: pstats.Stats | None,
+        allocations: dict[str, int],
+    ) -> str:
+        lines = [
+            f"=== {summary['kind']} {summary['name']} ({summary['calls']} calls, "
+            f"{summary['profiled']} profiled, {summary['wall_ms']:.1f} ms) ==="
+        ]
+        if stats is None:
+            lines.append("Not profiled: every call overlapped another profiled call")
+        else:
+            buffer = io.StringIO()
+            stats.stream = buffer  # type: ignore[attr-defined]
+            stats.sort_stats("cumulative").print_stats(self.top)
+            lines.append(buffer.getvalue().strip())
+        if self.memory:
+            lines.append(f"\nTop {self.top} allocation sites (net bytes):")
+            top = sorted(allocations.items(), key=lambda item: -item[1])[: self.top]
+            lines.extend(f"  {size:>12,}  {site}" for site, size in top)
+        return "\n".join(lines) + "\n"
+
+
+def _merge_allocations(records: list[_Record]) -> dict[str, int]:
+    sites: dict[str, int] = {}
+    for record in records:
+        for diff in record["allocations"]:
+            frame = diff.traceback[0]
+            site = f"{frame.filename}:{frame.lineno}"
+            sites[site] = sites.get(site, 0) + diff.size_diff
+    return sites
+
+
+def format_profile(rows: list[ProfileSummary]) -> str:
+    """Render profile summaries as a text table.
+
+    Args:
+        rows: Per-node summaries
+
+    Returns:
+        Table with a header line
+    """
+    header = (
+        f"{'kind':<5} {'name':<24} {'calls':>5} {'prof':>5} {'wall ms':>10} {'src ms':>9} "
+        f"{'lib ms':>9} {'wait ms':>10} {'alloc KB':>9}"
+    )
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        lines.append(
+            f"{row['kind']:<5} {row['name'][:24]:<24} {row['calls']:>5} {row['profiled']:>5} "
+            f"{row['wall_ms']:>10.1f} {row['src_ms']:>9.1f} {row['library_ms']:>9.1f} "
+            f"{row['wait_ms']:>10.1f} {row['alloc_kb']:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+_profiler: Profiler | None = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler() -> Profiler:
+    """Get the process-wide profiler, creating it from env settings on first use.
+
+    Returns:
+        Shared Profiler instance
+    """
+    global _profiler
+    if _profiler is None:
+        with _profiler_lock:
+            if _profiler is None:
+                _profiler = Profiler()
+    return _profiler
+
+
+def profile_node(name: str, node: F) -> F:
+    """Wrap a graph node to run under the profiler.
+
+    Returns the node itself when profiling is off; the wrapper keeps the
+    node's signature for LangGraph.
+
+    Args:
+        name: Node name
+        node: Node function
+
+    Returns:
+        Profiled node
+    """
+    profiler = get_profiler()
+    if not profiler.enabled:
+        return node
+
+    @functools.wraps(node)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return profiler.call("node", name, node, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def profiled_tool(fn: F) -> F:
+    """Run a tool under the profiler when profiling is on; apply below @tool.
+
+    Args:
+        fn: Tool function
+
+    Returns:
+        Function with the same name, signature and docstring
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return get_profiler().call("tool", fn.__name__, fn, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
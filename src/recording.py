@@ -0,0 +1,480 @@
+"""Record model calls and tool results of runs, and replay runs from a recording.
+
+With LLM_RECORD=<file> (or --record), every model call LLMClient makes and
+every tool result is appended to a recording, saved as gzip-compressed JSON
+at the end of each task. Messages are stored once by content hash, since
+each call resends the conversation so far.
+
+With LLM_REPLAY=<file> (or --replay), LLMClient hands out ReplayChatModel
+instead of proxy-backed models, and tools return their recorded results, so
+the graph runs offline and without side effects. Each call is answered with
+the recorded response to the same request (same message types, contents,
+names and tool calls). A call whose request is not in the recording, e.g.
+after a prompt change, gets the next unused response recorded for the same
+node; LLM_REPLAY_STRICT=1 makes it an error instead, for regression tests
+that must follow the recorded run exactly. LLM_REPLAY_LATENCY=1 waits each
+call's recorded duration, reproducing the timing of the original run.
+
+Speculative calls and hedged duplicates only match their own recorded
+requests; turn both off when replaying.
+"""
+
+import functools
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypedDict, TypeVar
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+FORMAT_VERSION = 1
+
+
+class ReplayMismatch(RuntimeError):
+    """Raised when a replayed run makes a call the recording cannot answer."""
+
+
+class RecordedTask(TypedDict):
+    """A task started while recording."""
+
+    task: str
+    project: str
+    thread_id: str
+    topology: str
+
+
+class RecordedCall(TypedDict):
+    """A model call or tool call and its result."""
+
+    kind: str  # llm | tool
+    name: str  # model or tool name
+    node: str  # graph node that made the call, if any
+    key: str
+    request: list[str] | dict[str, Any]  # message hashes, or tool arguments
+    response: dict[str, Any]  # message dict, or {"output": tool result}
+    ms: float
+
+
+class ReplayStats(TypedDict):
+    """How replayed calls were answered."""
+
+    calls: int
+    matched: int
+    fallback: int
+    tool_calls: int
+    unused: int
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "0").strip().lower() in ("1", "true", "yes")
+
+
+def _digest(value: Any) -> str:
+    data = json.dumps(value, sort_keys=True, default=str).encode()
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def request_key(messages: list[BaseMessage]) -> str:
+    """Get the replay key of a model request.
+
+    Message IDs and response metadata differ between runs of the same
+    conversation, so only types, contents, names and tool calls count.
+
+    Args:
+        messages: Messages sent to the model
+
+    Returns:
+        Hex digest identifying the request
+    """
+    return _digest(
+        [
+            [
+                message.type,
+                message.content,
+                message.name,
+                [
+                    (call["name"], call["args"])
+                    for call in getattr(message, "tool_calls", None) or []
+                ],
+            ]
+            for message in messages
+        ]
+    )
+
+
+def tool_key(name: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+    """Get the replay key of a tool call."""
+    return _digest([name, list(args), kwargs])
+
+
+def _node(run_manager: Any) -> str:
+    metadata = getattr(run_manager, "metadata", None) or {}
+    return str(metadata.get("langgraph_node", ""))
+
+
+class Recording:
+    """Tasks, calls and deduplicated messages of recorded runs."""
+
+    def __init__(
+        self,
+        tasks: list[RecordedTask] | None = None,
+        calls: list[RecordedCall] | None = None,
+        messages: dict[str, dict[str, Any]] | None = None,
+    ) -> None:
+        """Initialize recording.
+
+        Args:
+            tasks: Recorded tasks
+            calls: Recorded calls in completion order
+            messages: Message dicts by hash
+        """
+        self.tasks = tasks or []
+        self.calls = calls or []
+        self.messages = messages or {}
+
+    def request_messages(self, call: RecordedCall) -> list[BaseMessage]:
+        """Get the messages a recorded model call was sent."""
+        return messages_from_dict([self.messages[h] for h in call["request"]])
+
+    def save(self, path: str | Path) -> None:
+        """Write the recording as compressed JSON, atomically replacing the file.
+
+        Args:
+            path: Output file
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": FORMAT_VERSION,
+            "tasks": self.tasks,
+            "calls": self.calls,
+            "messages": self.messages,
+        }
+        tmp = path.with_name(f".{path.name}.tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"), default=str)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Recording":
+        """Read a recording written by save().
+
+        Args:
+            path: Recording file
+
+        Returns:
+            Loaded recording
+
+        Raises:
+            ValueError: If the file is not a recording of a supported version
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported recording: {path}")
+        return cls(data["tasks"], data["calls"], data["messages"])
+
+
+class RunRecorder:
+    """Collects the model and tool calls of runs into a recording file."""
+
+    def __init__(self, path: str | Path) -> None:
+        """Initialize run recorder.
+
+        Args:
+            path: Recording file, rewritten by every save()
+        """
+        self.path = Path(path)
+        self.recording = Recording()
+        self._lock = threading.Lock()
+
+    def record_task(self, task: str, project: str, thread_id: str, topology: str) -> None:
+        """Record a task's start."""
+        with self._lock:
+            self.recording.tasks.append(
+                RecordedTask(task=task, project=project, thread_id=thread_id, topology=topology)
+            )
+
+    def record_llm(
+        self,
+        model: str,
+        messages: list[BaseMessage],
+        result: ChatResult,
+        seconds: float,
+        run_manager: Any = None,
+    ) -> None:
+        """Record a completed model call.
+
+        Args:
+            model: Model name
+            messages: Messages sent
+            result: Model result
+            seconds: Call duration including retries
+            run_manager: Callback run manager (gives the calling node)
+        """
+        if not result.generations:
+            return
+        hashes = []
+        stored: dict[str, dict[str, Any]] = {}
+        for message in messages:
+            data = message_to_dict(message)
+            digest = _digest(data)
+            hashes.append(digest)
+            stored[digest] = data
+        call = RecordedCall(
+            kind="llm",
+            name=model,
+            node=_node(run_manager),
+            key=request_key(messages),
+            request=hashes,
+            response=message_to_dict(result.generations[0].message),
+            ms=round(seconds * 1000, 3),
+        )
+        with self._lock:
+            self.recording.messages.update(stored)
+            self.recording.calls.append(call)
+
+    def record_tool(
+        self, name: str, args: tuple[Any, ...], kwargs: dict[str, Any], output: Any, seconds: float
+    ) -> None:
+        """Record a tool call's result."""
+        call = RecordedCall(
+            kind="tool",
+            name=name,
+            node="",
+            key=tool_key(name, args, kwargs),
+            request={"args": list(args), "kwargs": kwargs},
+            response={"output": output},
+            ms=round(seconds * 1000, 3),
+        )
+        with self._lock:
+            self.recording.calls.append(call)
+
+    def save(self) -> Path:
+        """Write everything recorded so far.
+
+        Returns:
+            Recording file
+        """
+        with self._lock:
+            self.recording.save(self.path)
+        return self.path
+
+
+class Replayer:
+    """Answers model and tool calls from a recording."""
+
+    def __init__(
+        self,
+        recording: Recording,
+        strict: bool | None = None,
+        latency: bool | None = None,
+    ) -> None:
+        """Initialize replayer.
+
+        Args:
+            recording: Recording to replay
+            strict: Fail calls whose request is not recorded instead of answering
+                them in recorded order (default from env: LLM_REPLAY_STRICT, 0)
+            latency: Wait each call's recorded duration
+                (default from env: LLM_REPLAY_LATENCY, 0)
+        """
+        self.recording = recording
+        self.strict = _env_flag("LLM_REPLAY_STRICT") if strict is None else strict
+        self.latency = _env_flag("LLM_REPLAY_LATENCY") if latency is None else latency
+        self._lock = threading.Lock()
+        self.reset()
+
+    @classmethod
+    def load(cls, path: str | Path, **kwargs: Any) -> "Replayer":
+        """Create a replayer for a recording file."""
+        return cls(Recording.load(path), **kwargs)
+
+    def reset(self) -> None:
+        """Make every recorded call available again, e.g. to replay a run repeatedly."""
+        with self._lock:
+            self._used = [False] * len(self.recording.calls)
+            self._by_key: dict[str, list[int]] = {}
+            self._by_node: dict[str, list[int]] = {}
+            for index, call in enumerate(self.recording.calls):
+                self._by_key.setdefault(call["key"], []).append(index)
+                if call["kind"] == "llm":
+                    self._by_node.setdefault(call["node"], []).append(index)
+            self._counts = {"calls": 0, "matched": 0, "fallback": 0, "tool_calls": 0}
+
+    def _take(self, indexes: list[int]) -> int | None:
+        for index in indexes:
+            if not self._used[index]:
+                self._used[index] = True
+                return index
+        return None
+
+    def llm_response(self, messages: list[BaseMessage], node: str = "") -> BaseMessage:
+        """Get the recorded response to a model request.
+
+        Args:
+            messages: Messages of the request
+            node: Calling graph node
+
+        Returns:
+            Recorded response message
+
+        Raises:
+            ReplayMismatch: If the request is not recorded (strict) or the node
+                has no unused responses left
+        """
+        key = request_key(messages)
+        with self._lock:
+            self._counts["calls"] += 1
+            index = self._take(self._by_key.get(key, []))
+            if index is not None:
+                self._counts["matched"] += 1
+            elif self.strict:
+                raise ReplayMismatch(
+                    f"Model call {self._counts['calls']} ({node or 'no node'}) is not in the "
+                    "recording"
+                )
+            else:
+                index = self._take(self._by_node.get(node, []))
+                if index is None:
+                    raise ReplayMismatch(f"No recorded responses left for {node or 'no node'}")
+                self._counts["fallback"] += 1
+            call = self.recording.calls[index]
+        if self.latency:
+            time.sleep(call["ms"] / 1000)
+        return messages_from_dict([call["response"]])[0]
+
+    def tool_result(self, name: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+        """Get the recorded result of a tool call.
+
+        Recorded calls with the same arguments are answered in order; an
+        unrecorded call gets an error result like other tool failures.
+
+        Args:
+            name: Tool name
+            args: Positional arguments
+            kwargs: Keyword arguments
+
+        Returns:
+            Recorded tool result
+
+        Raises:
+            ReplayMismatch: If the call is not recorded and replay is strict
+        """
+        with self._lock:
+            self._counts["tool_calls"] += 1
+            index = self._take(self._by_key.get(tool_key(name, args, kwargs), []))
+        if index is None:
+            if self.strict:
+                raise ReplayMismatch(f"Tool call {name}({kwargs}) is not in the recording")
+            return {
+                "error": f"No recorded result for {name}",
+                "suggestion": "Record the run again to include this call",
+            }
+        call = self.recording.calls[index]
+        if self.latency:
+            time.sleep(call["ms"] / 1000)
+        return call["response"]["output"]
+
+    def stats(self) -> ReplayStats:
+        """Get counts of answered calls and of recorded model calls left unused."""
+        with self._lock:
+            unused = sum(
+                1
+                for used, call in zip(self._used, self.recording.calls, strict=True)
+                if not used and call["kind"] == "llm"
+            )
+            return ReplayStats(
+                calls=self._counts["calls"],
+                matched=self._counts["matched"],
+                fallback=self._counts["fallback"],
+                tool_calls=self._counts["tool_calls"],
+                unused=unused,
+            )
+
+
+class ReplayChatModel(BaseChatModel):
+    """Chat model answering from a recording instead of the proxy."""
+
+    model: str
+    replayer: Any  # Replayer
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "ReplayChatModel":
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        message = self.replayer.llm_response(messages, _node(run_manager))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+_recorder: RunRecorder | None = None
+_replayer: Replayer | None = None
+_lock = threading.Lock()
+
+
+def get_run_recorder() -> RunRecorder | None:
+    """Get the process-wide run recorder (env LLM_RECORD: recording file).
+
+    Returns:
+        Shared RunRecorder, or None when not recording
+    """
+    global _recorder
+    if _recorder is None and os.getenv("LLM_RECORD"):
+        with _lock:
+            if _recorder is None:
+                _recorder = RunRecorder(os.environ["LLM_RECORD"])
+    return _recorder
+
+
+def get_replayer() -> Replayer | None:
+    """Get the process-wide replayer (env LLM_REPLAY: recording file).
+
+    Returns:
+        Shared Replayer, or None when not replaying
+    """
+    global _replayer
+    if _replayer is None and os.getenv("LLM_REPLAY"):
+        with _lock:
+            if _replayer is None:
+                _replayer = Replayer.load(os.environ["LLM_REPLAY"])
+    return _replayer
+
+
+def recorded_tool(fn: F) -> F:
+    """Record a tool's results, or answer from the recording when replaying; apply below @tool.
+
+    Args:
+        fn: Tool function
+
+    Returns:
+        Function with the same name, signature and docstring
+    """
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        replayer = get_replayer()
+        if replayer is not None:
+            return replayer.tool_result(name, args, kwargs)
+        recorder = get_run_recorder()
+        if recorder is None:
+            return fn(*args, **kwargs)
+        start = time.perf_counter()
+        output = fn(*args, **kwargs)
+        recorder.record_tool(name, args, kwargs, output, time.perf_counter() - start)
+        return output
+
+    return wrapper  # type: ignore[return-value]
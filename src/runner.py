@@ -0,0 +1,282 @@
+"""Task execution shared by the CLI and the server."""
+
+import os
+import threading
+import time
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any, NotRequired, TypedDict
+
+from src.config.schema import BudgetLimits
+from src.graph.budget import TaskUsage, add_usage, budget_limits, check_budget, format_usage
+
+if TYPE_CHECKING:
+    from src.config.projects import ProjectRegistry
+    from src.graph.sessions import SessionManager
+    from src.llm.proxy_client import LLMClient
+    from src.profiling import ProfileSummary
+    from src.recording import ReplayStats
+    from src.tracing import SpanSummary
+
+
+class TaskEvent(TypedDict):
+    """Progress event of a running task.
+
+    'start' carries thread_id and project, 'node' carries node plus the
+    latest message and routing decision, 'done' carries thread_id plus the
+    task's usage against its budget (and why it stopped early, if it did),
+    'cancelled' carries thread_id, and 'error' carries error. With tracing or
+    profiling on, 'done' also carries their summaries and output paths; when
+    recording or replaying, the recording file or replay statistics. The
+    server also sends 'queued' while a task waits for a worker.
+    """
+
+    event: str
+    thread_id: NotRequired[str]
+    project: NotRequired[str]
+    node: NotRequired[str]
+    message: NotRequired[Any]
+    next_agent: NotRequired[str]
+    error: NotRequired[str]
+    usage: NotRequired[TaskUsage]
+    budget: NotRequired[BudgetLimits]
+    elapsed_s: NotRequired[float]
+    stop_reason: NotRequired[str]
+    trace: NotRequired[list["SpanSummary"]]
+    trace_file: NotRequired[str]
+    profile: NotRequired[list["ProfileSummary"]]
+    profile_dir: NotRequired[str]
+    recording: NotRequired[str]
+    replay: NotRequired["ReplayStats"]
+
+
+def stream_task(
+    task: str,
+    project: str | None,
+    registry: "ProjectRegistry",
+    graph: Any,
+    llm_client: "LLMClient",
+    tools: list[Any],
+    session: str | None = None,
+    sessions: "SessionManager | None" = None,
+    cancel_event: threading.Event | None = None,
+) -> Iterator[TaskEvent]:
+    """Execute a task, yielding progress events as graph nodes complete.
+
+    Args:
+        task: Task description
+        project: Project name (optional, uses first project if not specified)
+        registry: Project registry instance
+        graph: Compiled graph instance
+        llm_client: LLM client instance
+        tools: Available tools list
+        session: Existing thread ID to continue (optional, new thread per task by default)
+        sessions: Session manager (optional, created from the graph's checkpointer)
+        cancel_event: Event that cancels the task when set (optional, e.g. shared
+            by a batch); a task-local event is used by default
+
+    Yields:
+        TaskEvent for the start, each node, and completion of the task
+    """
+    from langchain_core.messages import HumanMessage
+
+    from src.agents.speculation import get_speculator
+    from src.graph.builder import default_topology
+    from src.graph.sessions import SessionManager
+    from src.llm.calls import TaskCancelled
+    from src.metrics import get_metrics
+    from src.profiling import get_profiler
+    from src.recording import get_replayer, get_run_recorder
+    from src.tracing import TraceRecorder, summarize, tracing_enabled, write_trace
+
+    # Use provided project or default to first available
+    projects = registry.list_names()
+    current_project = project if project and project in projects else projects[0]
+
+    if sessions is None:
+        sessions = SessionManager(graph.checkpointer)
+    thread_id = sessions.resolve(current_project, session)
+
+    yield TaskEvent(event="start", thread_id=thread_id, project=current_project)
+
+    run_recorder = get_run_recorder()
+    if run_recorder is not None:
+        run_recorder.record_task(task, current_project, thread_id, default_topology())
+
+    # Project context is shared read-only via config; state only holds its reference
+    project_ref = registry.context_ref(current_project)
+
+    # A caller's event may be shared with other tasks, so only set our own
+    owns_cancel = cancel_event is None
+    if cancel_event is None:
+        cancel_event = threading.Event()
+
+    # Per-task budget: usage resets (None) while the thread's history is kept
+    limits = budget_limits(registry.get(current_project))
+    started_at = time.time()
+
+    # Prepare state
+    initial_state: dict[str, Any] = {
+        "messages": [HumanMessage(content=task)],
+        "current_project": current_project,
+        "project_ref": project_ref,
+        "next_agent": "",
+        "task": task,
+        "budget": limits,
+        "usage": None,
+        "started_at": started_at,
+        "stop_reason": "",
+    }
+
+    # Configure graph
+    config = {
+        "configurable": {
+            "llm": llm_client.get_chat_model(),
+            # Agents pick their role's model tier from the client
+            "llm_client": llm_client,
+            "tools": tools,
+            "project_contexts": registry.contexts,
+            "thread_id": thread_id,
+            # Set to cancel the task; nodes waiting on a model call stop promptly
+            "cancel_event": cancel_event,
+        },
+        # Nodes run at once within the task (plan workers, parallel verifiers)
+        "max_concurrency": int(os.getenv("GRAPH_MAX_CONCURRENCY", "4")),
+    }
+    recorder = TraceRecorder() if tracing_enabled() else None
+    if recorder is not None:
+        config["callbacks"] = [recorder]
+    if limits["max_hops"]:
+        # Room for a supervisor step plus agent, join or merge steps per hop, so
+        # the hop budget (not LangGraph's recursion limit) ends the task
+        config["recursion_limit"] = max(25, 3 * limits["max_hops"] + 10)
+
+    usage = add_usage(None, None)
+    stop_reason = ""
+    # Reported to metrics; done tasks are told apart from stopped ones below
+    outcome = "error"
+
+    # Execute workflow
+    try:
+        for event in graph.stream(initial_state, config):
+            for node_name, node_output in event.items():
+                node_event = TaskEvent(event="node", node=node_name)
+                messages = (node_output or {}).get("messages")
+                if messages:
+                    node_event["message"] = messages[-1].content
+                if (node_output or {}).get("next_agent"):
+                    node_event["next_agent"] = node_output["next_agent"]
+                if (node_output or {}).get("usage"):
+                    usage = add_usage(usage, node_output["usage"])
+                stop_reason = (node_output or {}).get("stop_reason") or stop_reason
+                yield node_event
+        outcome = "done"
+    except (KeyboardInterrupt, TaskCancelled):
+        # Ctrl-C in the CLI, or a node saw the cancel event
+        outcome = "cancelled"
+    except GeneratorExit:
+        # The consumer stopped listening (server client gone)
+        outcome = "cancelled"
+        raise
+    finally:
+        # Stops model calls still running in other nodes, e.g. when the server's
+        # client disconnects and this generator is closed
+        if owns_cancel:
+            cancel_event.set()
+        # Persist buffered checkpoints and keep the thread's history bounded
+        sessions.finish(thread_id)
+        get_speculator().finish(thread_id)
+        if recorder is not None:
+            trace_file = write_trace(recorder.spans(), thread_id)
+        profiled = get_profiler().finish(thread_id)
+        recording_file = run_recorder.save() if run_recorder is not None else None
+        metrics = get_metrics()
+        metrics.observe(
+            "langgraphx_task_duration_seconds", time.time() - started_at, project=current_project
+        )
+        if outcome != "done":
+            metrics.inc("langgraphx_tasks_total", project=current_project, outcome=outcome)
+
+    if outcome == "cancelled":
+        yield TaskEvent(event="cancelled", thread_id=thread_id)
+        return
+
+    # The supervisor reports stops it makes; routing may also end a task whose
+    # budget ran out during an agent step
+    state = {"budget": limits, "usage": usage, "started_at": started_at}
+    done = TaskEvent(
+        event="done",
+        thread_id=thread_id,
+        usage=usage,
+        budget=limits,
+        elapsed_s=round(time.time() - started_at, 3),
+        stop_reason=stop_reason or check_budget(state) or "",
+    )
+    metrics.inc(
+        "langgraphx_tasks_total",
+        project=current_project,
+        outcome="stopped" if done["stop_reason"] else "done",
+    )
+    if recorder is not None:
+        done["trace"] = summarize(recorder.spans())
+        done["trace_file"] = str(trace_file)
+    if profiled is not None:
+        done["profile_dir"] = str(profiled[0])
+        done["profile"] = profiled[1]
+    if recording_file is not None:
+        done["recording"] = str(recording_file)
+    replayer = get_replayer()
+    if replayer is not None:
+        done["replay"] = replayer.stats()
+    yield done
+
+
+def print_event(event: TaskEvent) -> None:
+    """Print a task event the way the interactive CLI shows progress.
+
+    Args:
+        event: Event from stream_task or the server
+    """
+    kind = event["event"]
+    if kind == "start":
+        project, thread_id = event["project"], event["thread_id"]
+        print(f"\n🔄 Processing task with {project} (session: {thread_id})...\n")
+    elif kind == "queued":
+        print("\n⏳ Waiting for a free worker...")
+    elif kind == "node":
+        print(f"📍 {event['node'].upper()}")
+        if "message" in event:
+            print(f"💬 {event['message']}\n")
+        if event.get("next_agent"):
+            print(f"➡️  Routing to: {event['next_agent']}\n")
+    elif kind == "done":
+        if event.get("stop_reason"):
+            print(f"⚠️  Stopped early: {event['stop_reason']}")
+        else:
+            print("✅ Task completed!")
+        if "usage" in event:
+            usage = format_usage(event["usage"], event.get("budget", {}), event["elapsed_s"])
+            print(f"📏 Budget: {usage}")
+        if "trace" in event:
+            from src.tracing import format_summary
+
+            print(f"\n⏱️  Trace ({event['trace_file']}):")
+            print(format_summary(event["trace"]))
+        if "profile" in event:
+            from src.profiling import format_profile
+
+            print(f"\n🔬 Profile ({event['profile_dir']}/report.txt):")
+            print(format_profile(event["profile"]))
+        if "recording" in event:
+            print(f"\n📼 Recorded to {event['recording']}")
+        if "replay" in event:
+            replay = event["replay"]
+            print(
+                f"\n⏯️  Replayed {replay['calls']} model calls: {replay['matched']} matched, "
+                f"{replay['fallback']} answered in recorded order, "
+                f"{replay['unused']} recorded calls unused"
+            )
+        print()
+    elif kind == "cancelled":
+        print(f"\n🛑 Task cancelled (session {event['thread_id']} kept).\n")
+    elif kind == "error":
+        print(f"\n❌ Error: {event['error']}\n")
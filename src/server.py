@@ -0,0 +1,351 @@
+"""Long-running LangGraphX server with a local HTTP / Unix socket API.
+
+Keeps the project registry, compiled graph and LLM client warm across tasks
+and runs tasks concurrently up to a worker limit.
+
+Endpoints:
+    GET  /health    Server status and worker usage
+    GET  /projects  Available project names
+    GET  /metrics   Prometheus text-format metrics (with METRICS=1)
+    POST /tasks     Run {"task", "project"?, "session"?}; streams TaskEvents
+                    as newline-delimited JSON until 'done' or 'error'
+
+Usage:
+    python -m src.server [--listen unix:.langgraphx/server.sock] [--workers 4]
+    python -m src.server --listen http://127.0.0.1:8765
+"""
+
+import argparse
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from src.client import get_server_address, is_server_running, parse_address
+from src.llm.governor import get_governor
+from src.metrics import get_metrics
+from src.runner import TaskEvent, stream_task
+
+if TYPE_CHECKING:
+    from src.config.projects import ProjectRegistry
+    from src.graph.sessions import SessionManager
+    from src.llm.proxy_client import LLMClient
+
+# Default number of tasks executed concurrently
+DEFAULT_MAX_WORKERS = 4
+
+
+class TaskServer:
+    """Runs tasks against shared, warm components with a concurrency limit.
+
+    Tasks beyond the worker limit wait for a free slot; their stream starts
+    with a 'queued' event so clients can tell waiting from working.
+    """
+
+    def __init__(
+        self,
+        registry: "ProjectRegistry",
+        graph: Any,
+        llm_client: "LLMClient",
+        tools: list[Any],
+        sessions: "SessionManager",
+        max_workers: int | None = None,
+    ) -> None:
+        """Initialize task server.
+
+        Args:
+            registry: Project registry
+            graph: Compiled graph shared by all tasks
+            llm_client: LLM client shared by all tasks
+            tools: Available tools list
+            sessions: Session manager for the graph's checkpointer
+            max_workers: Concurrent task limit
+                (default from env: LANGGRAPHX_MAX_WORKERS, 4)
+        """
+        self.registry = registry
+        self.graph = graph
+        self.llm_client = llm_client
+        self.tools = tools
+        self.sessions = sessions
+        self.max_workers = max_workers or int(
+            os.getenv("LANGGRAPHX_MAX_WORKERS", str(DEFAULT_MAX_WORKERS))
+        )
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queued = 0
+
+    def health(self) -> dict[str, Any]:
+        """Get server status."""
+        from src.agents.speculation import get_speculator
+        from src.llm.calls import get_model_caller
+
+        with self._lock:
+            return {
+                "status": "ok",
+                "workers": self.max_workers,
+                "active": self._active,
+                "queued": self._queued,
+                "llm": get_governor().stats(),
+                "speculation": get_speculator().stats(),
+                "calls": get_model_caller().stats(),
+            }
+
+    def validate(self, payload: Any) -> str | None:
+        """Check a task request.
+
+        Args:
+            payload: Decoded request body
+
+        Returns:
+            Error message, or None if the request is valid
+        """
+        if not isinstance(payload, dict) or not isinstance(payload.get("task"), str):
+            return "Request body must be a JSON object with a 'task' string"
+        if not payload["task"].strip():
+            return "Task must not be empty"
+        projects = self.registry.list_names()
+        if not projects:
+            return "No projects available"
+        project = payload.get("project")
+        if project and project not in projects:
+            return f"Project not found: {project}"
+        return None
+
+    def run(self, payload: dict[str, Any]) -> Iterator[TaskEvent]:
+        """Run a validated task, waiting for a free worker slot first.
+
+        Args:
+            payload: Task request with 'task' and optional 'project' and 'session'
+
+        Yields:
+            TaskEvent for queueing, progress and completion or failure
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._queued += 1
+            yield TaskEvent(event="queued")
+            self._slots.acquire()
+            with self._lock:
+                self._queued -= 1
+
+        with self._lock:
+            self._active += 1
+        try:
+            yield from stream_task(
+                payload["task"],
+                payload.get("project"),
+                self.registry,
+                self.graph,
+                self.llm_client,
+                self.tools,
+                session=payload.get("session"),
+                sessions=self.sessions,
+            )
+        except Exception as e:
+            yield TaskEvent(event="error", error=str(e))
+        finally:
+            with self._lock:
+                self._active -= 1
+            self._slots.release()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """HTTP handler exposing a TaskServer."""
+
+    server: "_HTTPServer | _UnixHTTPServer"
+
+    def address_string(self) -> str:
+        # Unix socket peers have no address
+        return self.client_address[0] if self.client_address else "local"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if os.getenv("LANGGRAPHX_SERVER_LOG", "0") == "1":
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, body: dict[str, Any]) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_text(self, status: int, body: str, content_type: str) -> None:
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        app = self.server.app
+        if self.path == "/health":
+            self._send_json(200, app.health())
+        elif self.path == "/metrics":
+            metrics = get_metrics()
+            if metrics.enabled:
+                self._send_text(200, metrics.render(), "text/plain; version=0.0.4; charset=utf-8")
+            else:
+                self._send_json(404, {"error": "Metrics are disabled (set METRICS=1)"})
+        elif self.path == "/projects":
+            self._send_json(200, {"projects": app.registry.list_names()})
+        else:
+            self._send_json(404, {"error": f"Not found: {self.path}"})
+
+    def do_POST(self) -> None:
+        app = self.server.app
+        if self.path != "/tasks":
+            self._send_json(404, {"error": f"Not found: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"null")
+        except ValueError:
+            self._send_json(400, {"error": "Request body must be JSON"})
+            return
+        error = app.validate(payload)
+        if error:
+            self._send_json(400, {"error": error})
+            return
+
+        # Close-delimited stream (HTTP/1.0): one JSON event per line
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        events = app.run(payload)
+        for event in events:
+            try:
+                self.wfile.write(json.dumps(event, default=str).encode() + b"\n")
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                # Client went away (e.g. Ctrl-C): cancel the task; finished steps
+                # stay checkpointed
+                events.close()
+                break
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], app: TaskServer) -> None:
+        super().__init__(address, _Handler)
+        self.app = app
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, app: TaskServer) -> None:
+        super().__init__(path, _Handler)
+        self.app = app
+
+
+def create_task_server(max_workers: int | None = None) -> TaskServer:
+    """Factory function to create a task server with warm components.
+
+    Args:
+        max_workers: Concurrent task limit (default from env: LANGGRAPHX_MAX_WORKERS)
+
+    Returns:
+        TaskServer with registry, compiled graph and LLM client loaded
+    """
+    from src.agents.prompt_cache import prompt_cache
+    from src.config.projects import create_project_registry
+    from src.graph.builder import create_graph, get_all_tools
+    from src.graph.sessions import SessionManager
+    from src.llm.proxy_client import create_llm_client
+
+    registry = create_project_registry()
+    registry.add_reload_listener(prompt_cache.invalidate_project)
+    graph = create_graph()
+    return TaskServer(
+        registry=registry,
+        graph=graph,
+        llm_client=create_llm_client(),
+        tools=get_all_tools(),
+        sessions=SessionManager(graph.checkpointer),
+        max_workers=max_workers,
+    )
+
+
+def bind(app: TaskServer, address: str) -> "_HTTPServer | _UnixHTTPServer":
+    """Bind the HTTP API of a task server to an address.
+
+    Args:
+        app: Task server
+        address: 'unix:<path>' or 'http://<host>:<port>'
+
+    Returns:
+        Bound server; call serve_forever() to start serving
+
+    Raises:
+        RuntimeError: If another server is already listening on the socket
+    """
+    kind, target = parse_address(address)
+    if kind == "http":
+        return _HTTPServer(target, app)
+
+    socket_path = Path(target)
+    if socket_path.exists():
+        if is_server_running(address):
+            raise RuntimeError(f"A LangGraphX server is already running at {address}")
+        # Stale socket left by a server that did not shut down cleanly
+        socket_path.unlink()
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    return _UnixHTTPServer(str(socket_path), app)
+
+
+def main() -> None:
+    """Server entry point."""
+    parser = argparse.ArgumentParser(description="LangGraphX task server")
+    parser.add_argument(
+        "--listen",
+        default=get_server_address(),
+        help="unix:<path> or http://<host>:<port> (default from env: LANGGRAPHX_SERVER)",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        help="Concurrent task limit (default from env: LANGGRAPHX_MAX_WORKERS, 4)",
+    )
+    args = parser.parse_args()
+
+    try:
+        app = create_task_server(args.workers)
+        server = bind(app, args.listen)
+    except (ConnectionError, RuntimeError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if os.getenv("PROJECTS_WATCH", "1") != "0":
+        from src.config.watcher import ProjectWatcher
+
+        ProjectWatcher(app.registry).start()
+
+    # Shut down cleanly (removing the socket) on SIGTERM as well as Ctrl-C
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    print(f"🤖 LangGraphX server listening on {args.listen} ({app.max_workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down")
+    finally:
+        server.server_close()
+        kind, target = parse_address(args.listen)
+        if kind == "unix":
+            Path(target).unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,15 @@ from typing import Any
 
 from langchain_core.tools import tool
 
+from src.metrics import timed_tool
+from src.profiling import profiled_tool
+from src.recording import recorded_tool
+
 
 @tool
+@timed_tool
+@profiled_tool
+@recorded_tool
 def read_file(file_path: str, project_path: str) -> dict[str, Any]:
     """Read contents of a file within the project directory.
 
@@ -75,6 +82,9 @@ def read_file(file_path: str, project_path: str) -> dict[str, Any]:
 
 
 @tool
+@timed_tool
+@profiled_tool
+@recorded_tool
 def write_file(file_path: str, content: str, project_path: str) -> dict[str, Any]:
     """Write content to a file within the project directory.
 
@@ -133,6 +143,9 @@ def write_file(file_path: str, content: str, project_path: str) -> dict[str, Any
 
 
 @tool
+@timed_tool
+@profiled_tool
+@recorded_tool
 def search_code(query: str, project_path: str, file_extension: str = "") -> dict[str, Any]:
     """Search for code patterns in project files.
 
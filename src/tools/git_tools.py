@@ -6,8 +6,15 @@ from typing import Any
 
 from langchain_core.tools import tool
 
+from src.metrics import timed_tool
+from src.profiling import profiled_tool
+from src.recording import recorded_tool
+
 
 @tool
+@timed_tool
+@profiled_tool
+@recorded_tool
 def git_status(project_path: str) -> dict[str, Any]:
     """Get git status of the project repository.
 
@@ -95,6 +102,9 @@ def git_status(project_path: str) -> dict[str, Any]:
 
 
 @tool
+@timed_tool
+@profiled_tool
+@recorded_tool
 def git_commit(message: str, project_path: str, files: list[str] | None = None) -> dict[str, Any]:
     """Commit changes to git repository.
 
@@ -0,0 +1,407 @@
+"""Per-task tracing of graph nodes, model calls and tool calls.
+
+A TraceRecorder is a LangChain callback handler added to a task's config.
+It turns the callbacks LangGraph and LangChain already emit into spans: one
+per graph node, model call (latency, time to first token when streamed,
+input/output/cache tokens) and tool call (duration, input/output bytes),
+nested under the span that made them. Spans are written per task as JSONL
+or as an OTLP/JSON file that OpenTelemetry tooling can import, and
+summarized in a table at the end of the run.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, NotRequired, TypedDict
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+DEFAULT_TRACE_DIR = ".langgraphx/traces"
+
+TRACE_FORMATS = ("jsonl", "otlp")
+
+# Span attributes summed in the summary table
+_TOKEN_KEYS = ("input_tokens", "output_tokens", "cache_read_tokens", "cache_creation_tokens")
+
+
+class TraceSpan(TypedDict):
+    """A timed operation of a task."""
+
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    kind: str  # task | node | llm | tool
+    name: str
+    start: float  # Unix time in seconds
+    duration_ms: float
+    attributes: dict[str, Any]
+    error: NotRequired[str]
+
+
+class SpanSummary(TypedDict):
+    """Spans of one kind and name, aggregated for the summary table."""
+
+    kind: str
+    name: str
+    count: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    input_tokens: int
+    output_tokens: int
+    cache_read_tokens: int
+    cache_creation_tokens: int
+    errors: int
+
+
+def tracing_enabled() -> bool:
+    """Check whether tasks are traced (env TRACE, default 0)."""
+    return os.getenv("TRACE", "0").strip().lower() in ("1", "true", "yes")
+
+
+def trace_format() -> str:
+    """Get the trace file format (env TRACE_FORMAT: jsonl or otlp, default jsonl).
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    fmt = os.getenv("TRACE_FORMAT", "jsonl").strip().lower()
+    if fmt not in TRACE_FORMATS:
+        expected = ", ".join(TRACE_FORMATS)
+        raise ValueError(f"Unknown TRACE_FORMAT: {fmt} (expected one of {expected})")
+    return fmt
+
+
+class TraceRecorder(BaseCallbackHandler):
+    """Callback handler recording the spans of one task.
+
+    Callbacks arrive from every thread the task runs on (parallel nodes,
+    model calls on worker threads), so state is guarded by a lock.
+    """
+
+    def __init__(self, trace_id: str | None = None) -> None:
+        """Initialize trace recorder.
+
+        Args:
+            trace_id: 32-hex-digit trace ID (default: random)
+        """
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self._lock = threading.Lock()
+        # run_id -> (span, perf_counter at start) of spans still running
+        self._open: dict[UUID, tuple[TraceSpan, float]] = {}
+        # run_id -> parent run_id of every run seen, to nest spans under the
+        # nearest recorded ancestor across untraced runs (routers, writers)
+        self._parents: dict[UUID, UUID | None] = {}
+        self._spans: list[TraceSpan] = []
+
+    def _ancestor(self, parent_run_id: UUID | None) -> str | None:
+        run_id = parent_run_id
+        while run_id is not None:
+            if run_id in self._open:
+                return self._open[run_id][0]["span_id"]
+            run_id = self._parents.get(run_id)
+        return None
+
+    def _start(
+        self,
+        run_id: UUID,
+        parent_run_id: UUID | None,
+        kind: str,
+        name: str,
+        attributes: dict[str, Any],
+    ) -> None:
+        with self._lock:
+            self._parents[run_id] = parent_run_id
+            span = TraceSpan(
+                trace_id=self.trace_id,
+                # Run IDs are time-ordered; their random half makes the span ID
+                span_id=run_id.hex[16:],
+                parent_id=self._ancestor(parent_run_id),
+                kind=kind,
+                name=name,
+                start=time.time(),
+                duration_ms=0.0,
+                attributes=attributes,
+            )
+            self._open[run_id] = (span, time.perf_counter())
+
+    def _end(
+        self,
+        run_id: UUID,
+        attributes: dict[str, Any] | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        with self._lock:
+            opened = self._open.pop(run_id, None)
+            if opened is None:
+                return
+            span, started = opened
+            span["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            span["attributes"].update(attributes or {})
+            if error is not None:
+                span["error"] = f"{type(error).__name__}: {error}"
+            self._spans.append(span)
+
+    # Graph nodes
+
+    def on_chain_start(
+        self,
+        serialized: dict[str, Any] | None,
+        inputs: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        if parent_run_id is None:
+            # The graph run itself
+            self._start(run_id, None, "task", kwargs.get("name") or "task", {})
+        elif node is not None and kwargs.get("name") == node:
+            step = (metadata or {}).get("langgraph_step")
+            self._start(run_id, parent_run_id, "node", node, {"step": step})
+        else:
+            with self._lock:
+                self._parents[run_id] = parent_run_id
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error=error)
+
+    # Model calls
+
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, Any] | None,
+        messages: list[list[Any]],
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        metadata = metadata or {}
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model") or params.get("model_name") or metadata.get("ls_model_name")
+        attributes: dict[str, Any] = {"model": model, "messages": sum(map(len, messages))}
+        # Named after the calling node, so the summary splits model time by agent
+        name = metadata.get("langgraph_node") or model or "llm"
+        self._start(run_id, parent_run_id, "llm", name, attributes)
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            opened = self._open.get(run_id)
+            if opened is not None and "ttft_ms" not in opened[0]["attributes"]:
+                ttft = (time.perf_counter() - opened[1]) * 1000
+                opened[0]["attributes"]["ttft_ms"] = round(ttft, 3)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        usage: dict[str, Any] = {}
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+        details = usage.get("input_token_details") or {}
+        self._end(
+            run_id,
+            {
+                "input_tokens": int(usage.get("input_tokens", 0)),
+                "output_tokens": int(usage.get("output_tokens", 0)),
+                "cache_read_tokens": int(details.get("cache_read", 0)),
+                "cache_creation_tokens": int(details.get("cache_creation", 0)),
+            },
+        )
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error=error)
+
+    # Tool calls
+
+    def on_tool_start(
+        self,
+        serialized: dict[str, Any] | None,
+        input_str: str,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,
+    ) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name", "tool")
+        attributes = {"bytes_in": len(str(input_str).encode())}
+        self._start(run_id, parent_run_id, "tool", name, attributes)
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        content = getattr(output, "content", output)
+        self._end(run_id, {"bytes_out": len(str(content).encode())})
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error=error)
+
+    def spans(self) -> list[TraceSpan]:
+        """Get finished spans in start order."""
+        with self._lock:
+            return sorted(self._spans, key=lambda s: s["start"])
+
+
+def summarize(spans: list[TraceSpan]) -> list[SpanSummary]:
+    """Aggregate spans by kind and name.
+
+    Args:
+        spans: Finished spans
+
+    Returns:
+        One row per kind and name, by kind (task, node, llm, tool), slowest
+        first within a kind
+    """
+    rows: dict[tuple[str, str], SpanSummary] = {}
+    for span in spans:
+        key = (span["kind"], span["name"])
+        row = rows.get(key)
+        if row is None:
+            row = rows[key] = SpanSummary(
+                kind=span["kind"],
+                name=span["name"],
+                count=0,
+                total_ms=0.0,
+                mean_ms=0.0,
+                max_ms=0.0,
+                input_tokens=0,
+                output_tokens=0,
+                cache_read_tokens=0,
+                cache_creation_tokens=0,
+                errors=0,
+            )
+        row["count"] += 1
+        row["total_ms"] += span["duration_ms"]
+        row["max_ms"] = max(row["max_ms"], span["duration_ms"])
+        for key_name in _TOKEN_KEYS:
+            row[key_name] += span["attributes"].get(key_name, 0)  # type: ignore[literal-required]
+        row["errors"] += 1 if "error" in span else 0
+
+    order = {"task": 0, "node": 1, "llm": 2, "tool": 3}
+    for row in rows.values():
+        row["total_ms"] = round(row["total_ms"], 1)
+        row["mean_ms"] = round(row["total_ms"] / row["count"], 1)
+        row["max_ms"] = round(row["max_ms"], 1)
+    return sorted(rows.values(), key=lambda r: (order.get(r["kind"], 4), -r["total_ms"]))
+
+
+def format_summary(rows: list[SpanSummary]) -> str:
+    """Render summary rows as a text table.
+
+    Args:
+        rows: Rows from summarize
+
+    Returns:
+        Table with a header line
+    """
+    header = (
+        f"{'kind':<5} {'name':<24} {'count':>5} {'total ms':>10} {'mean ms':>9} "
+        f"{'max ms':>9} {'in tok':>8} {'out tok':>8} {'cache tok':>9}"
+    )
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        name = row["name"] if len(row["name"]) <= 24 else row["name"][:23] + "…"
+        errors = f"  ({row['errors']} failed)" if row["errors"] else ""
+        lines.append(
+            f"{row['kind']:<5} {name:<24} {row['count']:>5} {row['total_ms']:>10.1f} "
+            f"{row['mean_ms']:>9.1f} {row['max_ms']:>9.1f} {row['input_tokens']:>8} "
+            f"{row['output_tokens']:>8} {row['cache_read_tokens']:>9}{errors}"
+        )
+    return "\n".join(lines)
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans: list[TraceSpan], service: str = "langgraphx") -> dict[str, Any]:
+    """Convert spans to an OTLP/JSON trace export request.
+
+    Args:
+        spans: Finished spans
+        service: service.name resource attribute
+
+    Returns:
+        ExportTraceServiceRequest as a JSON-ready dict
+    """
+    otlp_spans = []
+    for span in spans:
+        start_ns = int(span["start"] * 1e9)
+        attributes = {"langgraphx.kind": span["kind"], **span["attributes"]}
+        otlp_span: dict[str, Any] = {
+            "traceId": span["trace_id"],
+            "spanId": span["span_id"],
+            "name": f"{span['kind']} {span['name']}",
+            # SPAN_KIND_INTERNAL, or CLIENT for calls leaving the process
+            "kind": 3 if span["kind"] == "llm" else 1,
+            "startTimeUnixNano": str(start_ns),
+            "endTimeUnixNano": str(start_ns + int(span["duration_ms"] * 1e6)),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in attributes.items()
+                if value is not None
+            ],
+            # STATUS_CODE_OK / STATUS_CODE_ERROR
+            "status": {"code": 2, "message": span["error"]} if "error" in span else {"code": 1},
+        }
+        if span["parent_id"]:
+            otlp_span["parentSpanId"] = span["parent_id"]
+        otlp_spans.append(otlp_span)
+
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [{"key": "service.name", "value": {"stringValue": service}}]
+                },
+                "scopeSpans": [{"scope": {"name": "src.tracing"}, "spans": otlp_spans}],
+            }
+        ]
+    }
+
+
+def write_trace(
+    spans: list[TraceSpan],
+    thread_id: str,
+    trace_dir: str | Path | None = None,
+    fmt: str | None = None,
+) -> Path:
+    """Write a task's spans to a timestamped file.
+
+    Args:
+        spans: Finished spans
+        thread_id: Task's thread ID (part of the file name)
+        trace_dir: Output directory (default from env: TRACE_DIR, .langgraphx/traces)
+        fmt: 'jsonl' (one span per line) or 'otlp' (OTLP/JSON)
+            (default from env: TRACE_FORMAT, jsonl)
+
+    Returns:
+        Path of the written file
+    """
+    fmt = fmt or trace_format()
+    directory = Path(trace_dir or os.getenv("TRACE_DIR", DEFAULT_TRACE_DIR))
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    safe_thread = "".join(c if c.isalnum() or c in "-_" else "_" for c in thread_id)
+
+    if fmt == "otlp":
+        path = directory / f"{stamp}-{safe_thread}.otlp.json"
+        path.write_text(json.dumps(to_otlp(spans), default=str))
+    else:
+        path = directory / f"{stamp}-{safe_thread}.jsonl"
+        path.write_text("".join(json.dumps(span, default=str) + "\n" for span in spans))
+    return path
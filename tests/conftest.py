@@ -1,12 +1,49 @@
 """Test fixtures and utilities."""
 
+import time
+from collections.abc import Callable
+from typing import Any
 from unittest.mock import MagicMock
 
 import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.checkpoint.memory import MemorySaver
 
+from src.config.context import ProjectContextStore, context_ref
 from src.config.projects import ProjectRegistry
+from src.graph.builder import build_graph
 from src.graph.state import MultiProjectState, ProjectContext, ProjectInfo
 from src.llm.proxy_client import LLMClient
+from src.runner import stream_task
+
+
+class FakeModel(BaseChatModel):
+    """Chat model returning canned answers with token usage, after a delay."""
+
+    responses: list[str]
+    delay: float = 0.0
+    calls: int = 0
+    # (start, end) of each call, in time.perf_counter() seconds
+    spans: list[tuple[float, float]] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "FakeModel":
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        start = time.perf_counter()
+        time.sleep(self.delay)
+        content = self.responses[min(self.calls, len(self.responses) - 1)]
+        self.calls += 1
+        self.spans.append((start, time.perf_counter()))
+        usage = {"input_tokens": 10, "output_tokens": 5, "total_tokens": 15}
+        message = AIMessage(content=content, usage_metadata=usage)
+        return ChatResult(generations=[ChatGeneration(message=message)])
 
 
 @pytest.fixture
@@ -80,13 +117,27 @@ def sample_state(sample_project_context: ProjectContext) -> MultiProjectState:
     return MultiProjectState(
         messages=[],
         current_project="test_project",
-        projects={"test_project": sample_project_context["info"]},
-        project_context=sample_project_context,
+        project_ref=context_ref("test_project", sample_project_context),
         next_agent="",
         task="Test task",
     )
 
 
+@pytest.fixture
+def context_store(sample_project_context: ProjectContext) -> ProjectContextStore:
+    """Create a context store holding the sample project context.
+
+    Args:
+        sample_project_context: Sample project context
+
+    Returns:
+        ProjectContextStore with the sample context
+    """
+    store = ProjectContextStore()
+    store.put("test_project", sample_project_context)
+    return store
+
+
 @pytest.fixture
 def temp_project_dir(tmp_path):
     """Create a temporary project directory with config files.
@@ -100,12 +151,16 @@ def temp_project_dir(tmp_path):
     project_dir = tmp_path / "projects" / "test_project"
     project_dir.mkdir(parents=True)
 
+    # Checkout the config points at (registries reject missing paths)
+    source_dir = tmp_path / "test_project_src"
+    source_dir.mkdir()
+
     # Create config.yaml
-    config_content = """
+    config_content = f"""
 name: test_project
 type: python
 description: Test project
-path: /tmp/test_project
+path: {source_dir}
 tech_stack:
   language: python
   version: "3.11"
@@ -143,3 +198,49 @@ def project_registry(temp_project_dir):
         ProjectRegistry instance
     """
     return ProjectRegistry(temp_project_dir)
+
+
+@pytest.fixture
+def run_fake_task(temp_project_dir, mock_llm_client) -> Callable[..., list[dict]]:
+    """Create a runner for whole tasks in test_project on a fresh graph.
+
+    The runner takes the models answering each role (the default model, key
+    None, answers 'unused' unless given), the topology, the task, an optional
+    checkpointer, and further stream_task keyword arguments such as
+    llm_client. It returns the task's events.
+
+    Args:
+        temp_project_dir: Temporary project directory
+        mock_llm_client: Mock LLM client, answering with the given models
+
+    Returns:
+        Task runner
+    """
+
+    def run(
+        models: dict[str | None, BaseChatModel] | None = None,
+        topology: str = "default",
+        task: str = "Check config",
+        checkpointer: Any = None,
+        **kwargs: Any,
+    ) -> list[dict]:
+        if models is not None:
+            by_role = {None: FakeModel(responses=["unused"]), **models}
+
+            def get_chat_model(role=None, overrides=None):
+                return by_role[role]
+
+            mock_llm_client.get_chat_model.side_effect = get_chat_model
+        kwargs.setdefault("llm_client", mock_llm_client)
+        return list(
+            stream_task(
+                task,
+                "test_project",
+                registry=ProjectRegistry(temp_project_dir, use_cache=False),
+                graph=build_graph(checkpointer or MemorySaver(), topology=topology),
+                tools=[],
+                **kwargs,
+            )
+        )
+
+    return run
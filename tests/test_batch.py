@@ -0,0 +1,128 @@
+"""Tests for batch task execution."""
+
+import json
+import time
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langgraph.checkpoint.memory import MemorySaver
+
+from src.batch import load_tasks, run_batch
+from src.config.projects import ProjectRegistry
+from src.graph.builder import build_graph
+from tests.conftest import FakeModel
+
+
+def test_load_tasks_yaml(tmp_path):
+    """Test YAML batch files accept strings and mappings."""
+    batch = tmp_path / "batch.yaml"
+    batch.write_text(
+        "tasks:\n"
+        "  - List files\n"
+        "  - id: check\n"
+        "    project: rssx\n"
+        "    task: Check config\n"
+    )
+
+    tasks = load_tasks(batch)
+
+    assert tasks == [
+        {"task": "List files", "id": "1"},
+        {"task": "Check config", "id": "check", "project": "rssx"},
+    ]
+
+
+def test_load_tasks_jsonl(tmp_path):
+    """Test JSONL batch files hold one task per line."""
+    batch = tmp_path / "batch.jsonl"
+    batch.write_text('{"task": "One"}\n\n{"task": "Two", "project": "enx"}\n')
+
+    tasks = load_tasks(batch)
+
+    assert [t["task"] for t in tasks] == ["One", "Two"]
+    assert tasks[1]["project"] == "enx"
+
+
+@pytest.mark.parametrize(
+    "name,content",
+    [
+        ("batch.txt", "List files"),
+        ("batch.yaml", "tasks: {task: nope}"),
+        ("batch.yaml", "- project: rssx"),
+        ("batch.yaml", "- [unterminated"),
+    ],
+)
+def test_load_tasks_invalid(tmp_path, name, content):
+    """Test malformed batch files are rejected."""
+    batch = tmp_path / name
+    batch.write_text(content)
+
+    with pytest.raises(ValueError):
+        load_tasks(batch)
+
+
+def test_run_batch_writes_results(temp_project_dir, mock_llm_client, tmp_path):
+    """Test each task runs in its own thread and failures are recorded."""
+    mock_llm_client.get_chat_model.side_effect = lambda *_args: FakeListChatModel(responses=["end"])
+    registry = ProjectRegistry(temp_project_dir, use_cache=False)
+    graph = build_graph(MemorySaver())
+    tasks = [
+        {"task": f"Task {i}", "id": str(i), "project": "test_project"} for i in range(5)
+    ] + [{"task": "Lost", "id": "lost", "project": "missing"}]
+    output = tmp_path / "out" / "results.jsonl"
+    seen = []
+
+    results = run_batch(
+        tasks, registry, graph, mock_llm_client, [], output, concurrency=3, on_result=seen.append
+    )
+
+    assert [r["id"] for r in results] == ["0", "1", "2", "3", "4", "lost"]
+    assert len(seen) == 6
+
+    ok = results[:5]
+    assert all(r["status"] == "ok" and r["steps"] == ["supervisor"] for r in ok)
+    assert len({r["thread_id"] for r in ok}) == 5
+
+    assert results[5]["status"] == "error"
+    assert "Project not found" in results[5]["error"]
+
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(line["id"] for line in lines) == ["0", "1", "2", "3", "4", "lost"]
+    assert all(line["duration_s"] >= 0 for line in lines)
+
+
+class SlowTaskModel(FakeModel):
+    """FakeModel that takes long to answer tasks mentioning 'slow'."""
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if any("slow" in str(m.content) for m in messages):
+            time.sleep(2)
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+
+def test_run_batch_interrupt_cancels_running_tasks(temp_project_dir, mock_llm_client, tmp_path):
+    """Test Ctrl-C drops queued tasks and cancels running ones promptly."""
+    mock_llm_client.get_chat_model.side_effect = lambda *_args: SlowTaskModel(responses=["end"])
+    registry = ProjectRegistry(temp_project_dir, use_cache=False)
+    graph = build_graph(MemorySaver())
+    tasks = [{"task": "fast", "id": "fast"}] + [
+        {"task": f"slow {i}", "id": f"slow{i}"} for i in range(4)
+    ]
+    output = tmp_path / "results.jsonl"
+
+    def interrupt(result):
+        if result["id"] == "fast":
+            raise KeyboardInterrupt
+
+    start = time.perf_counter()
+    with pytest.raises(KeyboardInterrupt):
+        run_batch(
+            tasks, registry, graph, mock_llm_client, [], output, concurrency=2, on_result=interrupt
+        )
+
+    assert time.perf_counter() - start < 1.5
+    lines = {line["id"]: line for line in map(json.loads, output.read_text().splitlines())}
+    assert lines.pop("fast")["status"] == "ok"
+    # Running tasks are recorded as cancelled; queued ones never ran
+    assert "slow0" in lines and set(lines) <= {"slow0", "slow1"}
+    assert {line["status"] for line in lines.values()} == {"cancelled"}
@@ -0,0 +1,134 @@
+"""Tests for per-task hop, token and time budgets."""
+
+import time
+
+import pytest
+import yaml
+
+from src.graph.budget import add_usage, budget_limits, check_budget, validate_budget
+from src.graph.builder import route_to_agent
+from tests.conftest import FakeModel
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    """Start every test from the default limits."""
+    for name in ("HOPS", "INPUT_TOKENS", "OUTPUT_TOKENS", "SECONDS"):
+        monkeypatch.delenv(f"TASK_MAX_{name}", raising=False)
+
+
+def _models(supervisor: list[str]) -> dict[str, FakeModel]:
+    return {
+        "supervisor": FakeModel(responses=supervisor),
+        "architect": FakeModel(responses=["Still investigating"]),
+    }
+
+
+def test_check_budget():
+    """Test each limit stops the task once used up, and 0 disables it."""
+    limits = {"max_hops": 2, "max_input_tokens": 100, "max_output_tokens": 0, "max_seconds": 0}
+    usage = {"hops": 2, "input_tokens": 99, "output_tokens": 10**6}
+    state = {"budget": limits, "usage": usage, "started_at": time.time()}
+
+    assert check_budget(state) is None
+    assert check_budget(state, next_hop=True) == "hop budget exhausted (2 hops)"
+
+    usage["input_tokens"] = 100
+    assert check_budget(state) == "input token budget exhausted (100/100)"
+
+    state = {"budget": {"max_seconds": 5}, "usage": {}, "started_at": time.time() - 6}
+    assert check_budget(state) == "time budget exhausted (5s)"
+    assert check_budget({}) is None
+
+
+def test_add_usage_resets_on_none():
+    """Test usage is summed, and reset at the start of a task."""
+    one = {"hops": 1, "input_tokens": 10, "output_tokens": 5}
+    assert add_usage(add_usage(None, one), one) == {
+        "hops": 2,
+        "input_tokens": 20,
+        "output_tokens": 10,
+    }
+    assert add_usage(one, None) == {"hops": 0, "input_tokens": 0, "output_tokens": 0}
+
+
+def test_budget_limits_precedence(monkeypatch, sample_project_info):
+    """Test project limits override env defaults."""
+    monkeypatch.setenv("TASK_MAX_SECONDS", "120")
+    sample_project_info["budget"] = {"max_hops": 4}
+
+    limits = budget_limits(sample_project_info)
+
+    assert limits == {
+        "max_hops": 4,
+        "max_input_tokens": 0,
+        "max_output_tokens": 0,
+        "max_seconds": 120.0,
+    }
+
+
+@pytest.mark.parametrize(
+    ("budget", "message"),
+    [
+        ([3], "must be a mapping"),
+        ({"max_calls": 3}, "Unknown budget limit"),
+        ({"max_hops": -1}, "non-negative int"),
+        ({"max_hops": 2.5}, "non-negative int"),
+        ({"max_seconds": True}, "non-negative float"),
+    ],
+)
+def test_validate_budget_errors(budget, message):
+    """Test malformed budget sections are rejected."""
+    with pytest.raises(ValueError, match=message):
+        validate_budget(budget)
+
+
+def test_route_to_agent_enforces_budget():
+    """Test routing ends the task once the budget is used up."""
+    state = {
+        "next_agent": "developer",
+        "budget": {"max_output_tokens": 50},
+        "usage": {"hops": 1, "input_tokens": 0, "output_tokens": 50},
+    }
+    assert route_to_agent(state) == "__end__"
+
+
+def test_runaway_loop_stops_at_hop_budget(monkeypatch, run_fake_task):
+    """Test a supervisor that never ends is stopped by the hop budget."""
+    monkeypatch.setenv("TASK_MAX_HOPS", "3")
+    models = _models(["architect"])
+
+    events = run_fake_task(models)
+
+    done = events[-1]
+    assert done["stop_reason"] == "hop budget exhausted (3 hops)"
+    assert models["architect"].calls == 3
+    # The fourth routing decision was made without a model call
+    assert models["supervisor"].calls == 3
+    assert done["usage"] == {"hops": 3, "input_tokens": 60, "output_tokens": 30}
+
+
+def test_token_budget_from_project(temp_project_dir, run_fake_task):
+    """Test a project's token budget ends the task at routing."""
+    config_file = temp_project_dir / "test_project" / "config.yaml"
+    config = yaml.safe_load(config_file.read_text())
+    config["budget"] = {"max_output_tokens": 12}
+    config_file.write_text(yaml.dump(config))
+    models = _models(["architect"])
+
+    events = run_fake_task(models)
+
+    done = events[-1]
+    assert done["stop_reason"] == "output token budget exhausted (15/12)"
+    assert done["budget"]["max_output_tokens"] == 12
+    assert models["architect"].calls == 1
+
+
+def test_completed_task_reports_usage(run_fake_task):
+    """Test tasks within budget finish without a stop reason."""
+    events = run_fake_task(_models(["end"]))
+
+    done = events[-1]
+    assert done["stop_reason"] == ""
+    assert done["usage"] == {"hops": 0, "input_tokens": 10, "output_tokens": 5}
+    assert done["elapsed_s"] >= 0
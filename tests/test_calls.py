@@ -0,0 +1,155 @@
+"""Tests for model call deadlines, cancellation and hedging."""
+
+import threading
+import time
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from src.llm.calls import ModelCaller, NodeTimeout, TaskCancelled, node_timeout
+from tests.conftest import FakeModel
+
+MESSAGES = [HumanMessage(content="hi")]
+
+
+class FlakyModel(FakeModel):
+    """Fake model whose first call fails."""
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if not self.calls:
+            self.calls += 1
+            raise ConnectionError("proxy reset")
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+
+class SlowFirstModel(FakeModel):
+    """Fake model whose first call is stuck and later ones answer at once."""
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if not self.calls:
+            self.calls += 1
+            time.sleep(0.5)
+            return ChatResult(generations=[ChatGeneration(message=AIMessage(content="slow"))])
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+
+class CancelledModel(FakeModel):
+    """Fake model standing in for a call that saw its task's cancel event."""
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        raise TaskCancelled("Task cancelled during supervisor call")
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    """Start every test from the default deadlines."""
+    monkeypatch.delenv("NODE_TIMEOUT", raising=False)
+    monkeypatch.delenv("NODE_TIMEOUT_ARCHITECT", raising=False)
+
+
+def _config(cancel: threading.Event | None = None) -> dict:
+    return {"configurable": {"cancel_event": cancel or threading.Event()}}
+
+
+def test_node_timeout_per_role(monkeypatch):
+    """Test role deadlines override the shared one."""
+    assert node_timeout("architect") == 300
+    monkeypatch.setenv("NODE_TIMEOUT", "60")
+    monkeypatch.setenv("NODE_TIMEOUT_ARCHITECT", "600")
+
+    assert node_timeout("architect") == 600
+    assert node_timeout("developer") == 60
+
+
+def test_call_past_deadline_raises(monkeypatch):
+    """Test a stuck call is abandoned at its deadline."""
+    monkeypatch.setenv("NODE_TIMEOUT_ARCHITECT", "0.2")
+    caller = ModelCaller(hedge=False)
+
+    start = time.monotonic()
+    with pytest.raises(NodeTimeout, match="architect"):
+        caller.invoke("architect", _config(), FakeModel(responses=["x"], delay=2), MESSAGES)
+
+    assert time.monotonic() - start < 1
+    assert caller.stats()["timeouts"] == 1
+
+
+def test_cancel_event_stops_waiting_call():
+    """Test setting the cancel event ends a call in flight."""
+    caller = ModelCaller(hedge=False)
+    cancel = threading.Event()
+    threading.Timer(0.1, cancel.set).start()
+
+    start = time.monotonic()
+    with pytest.raises(TaskCancelled):
+        caller.invoke("developer", _config(cancel), FakeModel(responses=["x"], delay=2), MESSAGES)
+
+    assert time.monotonic() - start < 1
+    assert caller.stats()["cancelled"] == 1
+
+
+def test_slow_call_is_hedged():
+    """Test a call outstanding past the role's p95 gets a duplicate that can win."""
+    caller = ModelCaller(hedge=True, min_samples=5)
+    for _ in range(10):
+        caller.record("reviewer", 0.05)
+    model = SlowFirstModel(responses=["fast"])
+
+    start = time.monotonic()
+    response = caller.invoke("reviewer", _config(), model, MESSAGES)
+
+    assert response.content == "fast"
+    assert time.monotonic() - start < 0.45
+    stats = caller.stats()
+    assert (stats["hedged"], stats["hedge_wins"]) == (1, 1)
+
+
+def test_no_hedging_without_samples():
+    """Test calls are not duplicated before enough latencies are observed."""
+    caller = ModelCaller(hedge=True, min_samples=5)
+    caller.record("reviewer", 0.01)
+
+    assert caller.hedge_delay("reviewer") is None
+    caller.invoke("reviewer", _config(), FakeModel(responses=["x"], delay=0.05), MESSAGES)
+    assert caller.stats()["hedged"] == 0
+
+
+def test_failed_started_call_is_reissued():
+    """Test a speculative call that failed is made again instead of failing the node."""
+    caller = ModelCaller(hedge=False)
+    model = FlakyModel(responses=["ok"])
+    started = caller.submit(lambda: model.invoke(MESSAGES))
+
+    response = caller.invoke("tester", _config(), model, MESSAGES, started=started)
+
+    assert response.content == "ok"
+    assert model.calls == 2
+
+
+def test_failed_call_raises():
+    """Test errors of a fresh call propagate."""
+    caller = ModelCaller(hedge=False)
+
+    with pytest.raises(ConnectionError):
+        caller.invoke("tester", _config(), FlakyModel(responses=["ok"]), MESSAGES)
+
+
+def test_stream_task_reports_timeout(monkeypatch, run_fake_task):
+    """Test a node past its deadline fails the task instead of hanging it."""
+    monkeypatch.setenv("NODE_TIMEOUT_ARCHITECT", "0.2")
+    models = {
+        "supervisor": FakeModel(responses=["architect", "end"]),
+        "architect": FakeModel(responses=["Plan"], delay=2),
+    }
+
+    with pytest.raises(NodeTimeout):
+        run_fake_task(models)
+
+
+def test_cancelled_task_yields_cancelled_event(run_fake_task):
+    """Test a cancelled task ends with a 'cancelled' event and keeps its session."""
+    events = run_fake_task({"supervisor": CancelledModel(responses=["architect"])})
+
+    assert [e["event"] for e in events] == ["start", "cancelled"]
+    assert events[-1]["thread_id"] == events[0]["thread_id"]
@@ -0,0 +1,180 @@
+"""Tests for checkpointer backends."""
+
+import os
+from unittest.mock import MagicMock
+
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+
+from src.graph import checkpointer as checkpointer_module
+from src.graph.checkpointer import create_checkpointer, get_backend
+from src.graph.serde import CompactSerializer
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    """Isolate tests from checkpoint settings in the developer's .env."""
+    monkeypatch.delenv("CHECKPOINT_BACKEND", raising=False)
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    yield
+    checkpointer_module._pools.clear()
+    checkpointer_module._setup_done.clear()
+
+
+def test_backend_defaults_to_memory():
+    """Test the in-memory backend is used without a database URL."""
+    assert get_backend() == "memory"
+    saver = create_checkpointer()
+    assert isinstance(saver, MemorySaver)
+    # No content store that would outlive trimmed checkpoints
+    assert not isinstance(saver.serde, CompactSerializer)
+
+
+def test_backend_defaults_to_postgres_with_database_url(monkeypatch):
+    """Test DATABASE_URL selects PostgreSQL when no backend is configured."""
+    monkeypatch.setenv("DATABASE_URL", "postgresql://localhost/test")
+    assert get_backend() == "postgres"
+
+
+def test_backend_invalid(monkeypatch):
+    """Test unknown backends are rejected."""
+    monkeypatch.setenv("CHECKPOINT_BACKEND", "redis")
+    with pytest.raises(ValueError):
+        get_backend()
+
+
+def test_postgres_shares_pool_and_runs_setup_once(monkeypatch):
+    """Test the pool is reused and migrations only run for the first checkpointer."""
+    pytest.importorskip("langgraph.checkpoint.postgres")
+    from src.graph.postgres_saver import PooledPostgresSaver
+
+    monkeypatch.setenv("CHECKPOINT_BACKEND", "postgres")
+    monkeypatch.setenv("DATABASE_URL", "postgresql://localhost/test")
+
+    pool = MagicMock()
+    pool_factory = MagicMock(return_value=pool)
+    setup = MagicMock()
+    monkeypatch.setattr(checkpointer_module, "get_connection_pool", pool_factory)
+    monkeypatch.setattr(PooledPostgresSaver, "setup", setup)
+
+    first = create_checkpointer()
+    second = create_checkpointer()
+
+    assert isinstance(first, PooledPostgresSaver)
+    assert first.conn is pool and second.conn is pool
+    assert setup.call_count == 1
+
+
+def test_connection_check_fails_for_unreachable_database(monkeypatch):
+    """Test the health check reports an unreachable database."""
+    pytest.importorskip("psycopg_pool")
+    monkeypatch.setenv("CHECKPOINT_BACKEND", "postgres")
+    monkeypatch.setenv("DATABASE_URL", "postgresql://user@127.0.0.1:1/none")
+    monkeypatch.setenv("CHECKPOINT_CONNECT_TIMEOUT", "1")
+
+    assert checkpointer_module.test_checkpointer_connection() is False
+
+
+def test_connection_check_memory():
+    """Test the health check passes for the in-memory backend."""
+    assert checkpointer_module.test_checkpointer_connection() is True
+
+
+def test_connection_check_sqlite(monkeypatch, tmp_path):
+    """Test the health check queries the SQLite backend's database."""
+    pytest.importorskip("langgraph.checkpoint.sqlite")
+    monkeypatch.setenv("CHECKPOINT_BACKEND", "sqlite")
+    monkeypatch.setenv("CHECKPOINT_SQLITE_PATH", str(tmp_path / "checkpoints.db"))
+
+    assert checkpointer_module.test_checkpointer_connection() is True
+
+    create_checkpointer().conn.close()
+    assert checkpointer_module.test_checkpointer_connection() is False
+    checkpointer_module._sqlite_savers.clear()
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(not os.getenv("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL not set")
+def test_postgres_roundtrip_and_trim(monkeypatch):
+    """Test checkpoints persist and trim against a real PostgreSQL database."""
+    from langgraph.graph import END, START, StateGraph
+    from typing_extensions import TypedDict
+
+    from src.graph.sessions import SessionManager
+
+    class CounterState(TypedDict):
+        count: int
+
+    monkeypatch.setenv("CHECKPOINT_BACKEND", "postgres")
+    monkeypatch.setenv("DATABASE_URL", os.environ["TEST_DATABASE_URL"])
+    saver = create_checkpointer()
+
+    workflow = StateGraph(CounterState)
+    workflow.add_node("a", lambda state: {"count": state["count"] + 1})
+    workflow.add_node("b", lambda state: {"count": state["count"] + 1})
+    workflow.add_edge(START, "a")
+    workflow.add_edge("a", "b")
+    workflow.add_edge("b", END)
+    graph = workflow.compile(checkpointer=saver)
+
+    sessions = SessionManager(saver, max_checkpoints=1)
+    thread_id = sessions.new_thread_id("itest")
+    config = {"configurable": {"thread_id": thread_id}}
+    try:
+        graph.invoke({"count": 0}, config)
+        assert sessions.trim(thread_id) > 0
+        assert graph.get_state(config).values["count"] == 2
+        assert thread_id in {s["thread_id"] for s in sessions.list_sessions("itest")}
+    finally:
+        sessions.delete(thread_id)
+        checkpointer_module.close_connection_pools()
+
+
+def test_sqlite_backend_shares_saver_and_batches(monkeypatch, tmp_path):
+    """Test the SQLite backend uses one WAL-mode saver per file and defers commits."""
+    pytest.importorskip("langgraph.checkpoint.sqlite")
+    from langgraph.graph import END, START, StateGraph
+    from typing_extensions import TypedDict
+
+    from src.graph.sessions import SessionManager
+
+    class CounterState(TypedDict):
+        count: int
+
+    db_path = tmp_path / "checkpoints.db"
+    monkeypatch.setenv("CHECKPOINT_BACKEND", "sqlite")
+    monkeypatch.setenv("CHECKPOINT_SQLITE_PATH", str(db_path))
+    monkeypatch.setenv("CHECKPOINT_SQLITE_BATCH_SIZE", "100")
+    monkeypatch.setenv("CHECKPOINT_SQLITE_FLUSH_INTERVAL", "60")
+
+    saver = create_checkpointer()
+    assert create_checkpointer() is saver
+    assert saver.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    workflow = StateGraph(CounterState)
+    workflow.add_node("a", lambda state: {"count": state["count"] + 1})
+    workflow.add_node("b", lambda state: {"count": state["count"] + 1})
+    workflow.add_edge(START, "a")
+    workflow.add_edge("a", "b")
+    workflow.add_edge("b", END)
+    graph = workflow.compile(checkpointer=saver)
+
+    config = {"configurable": {"thread_id": "rssx_1"}}
+    graph.invoke({"count": 0}, config)
+    assert saver._pending > 0
+
+    sessions = SessionManager(saver, max_checkpoints=1)
+    assert sessions.finish("rssx_1") > 0
+    assert saver._pending == 0
+
+    # A second connection sees the committed, trimmed thread
+    import sqlite3
+    from contextlib import closing
+
+    with closing(sqlite3.connect(db_path)) as other:
+        rows = other.execute("SELECT count(*) FROM checkpoints WHERE thread_id = 'rssx_1'")
+        assert rows.fetchone()[0] == 1
+    assert graph.get_state(config).values["count"] == 2
+    assert [s["thread_id"] for s in sessions.list_sessions("rssx")] == ["rssx_1"]
+
+    checkpointer_module.close_connection_pools()
@@ -0,0 +1,165 @@
+"""Tests for LLM rate limiting and retries."""
+
+import threading
+import time
+
+import anthropic
+import httpx
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from src.llm import governor as governor_module
+from src.llm.governor import LLMGovernor, TokenBucket, retry_after
+from src.llm.proxy_client import GovernedChatAnthropic
+
+
+def _api_error(status: int, headers: dict[str, str] | None = None) -> anthropic.APIStatusError:
+    request = httpx.Request("POST", "http://localhost:4000/anthropic/v1/messages")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    error_class = anthropic.RateLimitError if status == 429 else anthropic.APIStatusError
+    return error_class(f"HTTP {status}", response=response, body=None)
+
+
+class FakeClock:
+    """Manually advanced clock whose sleep advances time."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_paces_requests():
+    """Test a bucket allows its burst, then waits for refills."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=2.0, clock=clock, sleep=clock.sleep)
+
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == pytest.approx(0.5)
+
+
+def test_token_bucket_oversized_request_goes_negative():
+    """Test requests above capacity proceed and delay later callers."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10.0, capacity=100.0, clock=clock, sleep=clock.sleep)
+
+    assert bucket.acquire(250) == 0
+    # Bucket is at -150; the next small request waits for it to refill past 0
+    assert bucket.acquire(1) == pytest.approx(15.1)
+
+
+def test_retry_after_headers():
+    """Test Retry-After is read in seconds, milliseconds and HTTP-date forms."""
+    assert retry_after(_api_error(429, {"retry-after": "3"})) == 3.0
+    assert retry_after(_api_error(429, {"retry-after-ms": "1500"})) == 1.5
+    future = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() + 60))
+    assert 50 < retry_after(_api_error(503, {"retry-after": future})) <= 60
+    assert retry_after(_api_error(429)) is None
+    assert retry_after(ValueError("no response")) is None
+
+
+def test_call_retries_with_retry_after():
+    """Test rate-limited calls are retried after the requested delay."""
+    sleeps: list[float] = []
+    governor = LLMGovernor(max_retries=3, base_delay=0.2, sleep=sleeps.append)
+    attempts = iter([_api_error(429, {"retry-after": "2"}), _api_error(529), "ok"])
+
+    def flaky() -> str:
+        outcome = next(attempts)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert governor.call(flaky) == "ok"
+    assert 2.0 <= sleeps[0] <= 2.05
+    # Second retry: full jitter within base_delay * 2**1
+    assert 0 <= sleeps[1] <= 0.4
+
+    stats = governor.stats()
+    assert (stats["calls"], stats["attempts"], stats["retries"]) == (1, 3, 2)
+    assert stats["rate_limited"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_call_does_not_retry_client_errors():
+    """Test non-transient errors are raised immediately."""
+    governor = LLMGovernor(sleep=lambda _s: None)
+    calls = []
+
+    def bad_request() -> None:
+        calls.append(1)
+        raise _api_error(400)
+
+    with pytest.raises(anthropic.APIStatusError):
+        governor.call(bad_request)
+    assert len(calls) == 1
+    assert governor.stats()["failures"] == 1
+
+
+def test_call_gives_up_after_max_retries():
+    """Test the last error is raised once retries are exhausted."""
+    governor = LLMGovernor(max_retries=2, sleep=lambda _s: None)
+
+    def overloaded() -> None:
+        raise _api_error(529)
+
+    with pytest.raises(anthropic.APIStatusError):
+        governor.call(overloaded)
+    assert governor.stats()["attempts"] == 3
+
+
+def test_concurrency_limit_and_queue_metrics():
+    """Test no more than max_concurrency calls run at once."""
+    governor = LLMGovernor(max_concurrency=2)
+    lock = threading.Lock()
+    running = peak = 0
+
+    def slow() -> None:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+    threads = [threading.Thread(target=governor.call, args=(slow,)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == 2
+    stats = governor.stats()
+    assert stats["calls"] == 6
+    # Four calls had to queue behind the first two
+    assert stats["queue_wait_max_ms"] >= 40
+
+
+def test_governed_chat_model_retries(monkeypatch):
+    """Test model calls, including tool-bound ones, go through the shared governor."""
+    sleeps: list[float] = []
+    monkeypatch.setattr(governor_module, "_governor", LLMGovernor(sleep=sleeps.append))
+    outcomes = [_api_error(429, {"retry-after": "1"})]
+
+    def fake_generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if outcomes:
+            raise outcomes.pop()
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="end"))])
+
+    monkeypatch.setattr("langchain_anthropic.ChatAnthropic._generate", fake_generate)
+    model = GovernedChatAnthropic(model="claude-test", api_key="dummy", max_retries=0)
+
+    response = model.invoke([HumanMessage(content="Route this task")])
+
+    assert response.content == "end"
+    assert len(sleeps) == 1
+    assert governor_module.get_governor().stats()["attempts"] == 2
@@ -1,10 +1,17 @@
 """Tests for graph builder and workflow."""
 
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from src.graph.builder import build_graph, get_all_tools, route_to_agent
+from src.graph.builder import (
+    build_graph,
+    clear_graph_cache,
+    create_graph,
+    get_all_tools,
+    route_to_agent,
+)
 from src.graph.state import MultiProjectState
 
 
@@ -28,8 +35,7 @@ def test_route_to_agent_valid():
     state = MultiProjectState(
         messages=[],
         current_project="test",
-        projects={},
-        project_context=None,
+        project_ref="",
         next_agent="developer",
         task="test",
     )
@@ -43,8 +49,7 @@ def test_route_to_agent_end():
     state = MultiProjectState(
         messages=[],
         current_project="test",
-        projects={},
-        project_context=None,
+        project_ref="",
         next_agent="end",
         task="test",
     )
@@ -58,8 +63,7 @@ def test_route_to_agent_empty():
     state = MultiProjectState(
         messages=[],
         current_project="test",
-        projects={},
-        project_context=None,
+        project_ref="",
         next_agent="",
         task="test",
     )
@@ -73,8 +77,7 @@ def test_route_to_agent_invalid():
     state = MultiProjectState(
         messages=[],
         current_project="test",
-        projects={},
-        project_context=None,
+        project_ref="",
         next_agent="invalid_agent",
         task="test",
     )
@@ -84,16 +87,107 @@ def test_route_to_agent_invalid():
 
 
 @patch("src.graph.builder.create_checkpointer")
-def test_build_graph(mock_checkpointer, mock_llm_client):
+def test_build_graph(mock_checkpointer):
     """Test graph building and compilation."""
     from langgraph.checkpoint.memory import MemorySaver
 
     # Use a real MemorySaver instead of MagicMock
     mock_checkpointer.return_value = MemorySaver()
 
-    graph = build_graph(mock_llm_client)
+    graph = build_graph()
 
     assert graph is not None
     # Graph should be compiled
     assert hasattr(graph, "invoke")
     assert hasattr(graph, "stream")
+
+
+def test_build_graph_unknown_topology():
+    """Test unknown topologies are rejected."""
+    with pytest.raises(ValueError, match="Unknown graph topology"):
+        build_graph(topology="nope")
+
+
+def test_create_graph_compiles_once():
+    """Test the compiled graph is cached per checkpointer."""
+    from langgraph.checkpoint.memory import MemorySaver
+
+    clear_graph_cache()
+    saver = MemorySaver()
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        graphs = list(pool.map(lambda _: create_graph(saver), range(8)))
+
+    assert all(graph is graphs[0] for graph in graphs)
+    assert graphs[0].checkpointer is saver
+    assert create_graph(MemorySaver()) is not graphs[0]
+    clear_graph_cache()
+
+
+def test_cached_graph_uses_llm_from_config(sample_state, context_store):
+    """Test one compiled graph serves tasks with different runtime LLMs."""
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+    from langgraph.checkpoint.memory import MemorySaver
+
+    graph = build_graph(MemorySaver())
+
+    for index, decision in enumerate(["end", "END"]):
+        llm = FakeListChatModel(responses=[decision])
+        config = {
+            "configurable": {
+                "llm": llm,
+                "tools": [],
+                "project_contexts": context_store,
+                "thread_id": f"task-{index}",
+            }
+        }
+        result = graph.invoke(sample_state, config)
+        assert result["next_agent"] == "end"
+
+
+def test_parallel_topology_fans_out_verifiers(run_fake_task):
+    """Test reviewer and tester run concurrently and join before the supervisor."""
+    from langgraph.checkpoint.memory import MemorySaver
+
+    from tests.conftest import FakeModel
+
+    models = {
+        "supervisor": FakeModel(responses=["developer", "reviewer", "end"]),
+        "developer": FakeModel(responses=["Edited config.yaml"]),
+        "reviewer": FakeModel(responses=["LGTM"], delay=0.1),
+        "tester": FakeModel(responses=["Tests pass"], delay=0.1),
+    }
+    saver = MemorySaver()
+
+    events = run_fake_task(models, topology="parallel", task="Update config", checkpointer=saver)
+
+    nodes = [e["node"] for e in events if e["event"] == "node"]
+    assert nodes[:2] == ["supervisor", "developer"]
+    assert sorted(nodes[3:5]) == ["reviewer", "tester"]
+    assert nodes[5:] == ["join_findings", "supervisor"]
+
+    # Both verifiers' calls overlapped in time
+    (review_start, review_end), (test_start, test_end) = (
+        models["reviewer"].spans[0],
+        models["tester"].spans[0],
+    )
+    assert review_start < test_end and test_start < review_end
+
+    # Both findings were merged into state for the supervisor's final decision
+    config = {"configurable": {"thread_id": events[0]["thread_id"]}}
+    state = build_graph(saver, topology="parallel").get_state(config)
+    contents = [m.content for m in state.values["messages"]]
+    assert {"LGTM", "Tests pass"} <= set(contents)
+    assert models["supervisor"].calls == 3
+
+
+def test_default_topology_from_env(monkeypatch):
+    """Test GRAPH_TOPOLOGY selects the workflow."""
+    from langgraph.checkpoint.memory import MemorySaver
+
+    monkeypatch.setenv("GRAPH_TOPOLOGY", "parallel")
+    assert "join_findings" in build_graph(MemorySaver()).nodes
+
+    monkeypatch.setenv("GRAPH_TOPOLOGY", "nope")
+    with pytest.raises(ValueError, match="Unknown graph topology"):
+        build_graph(MemorySaver())
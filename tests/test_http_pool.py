@@ -0,0 +1,97 @@
+"""Tests for the shared LLM HTTP client and connection warm-up."""
+
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.llm import http_pool
+from src.llm.http_pool import close_http_client, create_http_client, get_http_client, warm_up
+from src.llm.proxy_client import LLMClient
+
+
+@pytest.fixture(autouse=True)
+def fresh_client():
+    """Give every test its own shared client."""
+    close_http_client()
+    yield
+    close_http_client()
+
+
+@pytest.fixture
+def proxy():
+    """Run a keep-alive HTTP server that records client connections."""
+    peers: set[int] = set()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_HEAD(self) -> None:
+            peers.add(self.client_address[1])
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, format, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/anthropic", peers
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_shared_across_llm_clients():
+    """Test all model instances use the one pooled HTTP client."""
+    first = LLMClient().get_chat_model()._client
+    second = LLMClient().get_chat_model()._client
+
+    assert first._client is get_http_client()
+    assert second._client is first._client
+    assert first.max_retries == 0
+
+
+def test_client_settings_from_env(monkeypatch):
+    """Test timeouts come from env and HTTP/2 falls back without h2."""
+    monkeypatch.setenv("LLM_HTTP_CONNECT_TIMEOUT", "2.5")
+    monkeypatch.setenv("LLM_HTTP_READ_TIMEOUT", "90")
+    monkeypatch.setenv("LLM_HTTP2", "1")
+    monkeypatch.setattr(http_pool, "http2_available", lambda: False)
+
+    client = create_http_client()
+
+    assert client.timeout.connect == 2.5
+    assert client.timeout.read == 90
+    client.close()
+
+
+def test_warm_up_opens_reusable_connections(proxy):
+    """Test warm-up connections stay in the pool for later requests."""
+    url, peers = proxy
+
+    warm_up(url, connections=2)
+    opened = set(peers)
+    assert 1 <= len(opened) <= 2
+
+    get_http_client().head(url)
+    assert peers == opened
+
+
+def test_warm_up_disabled_by_default(monkeypatch):
+    """Test warm-up is a no-op unless LLM_WARMUP_CONNECTIONS is set."""
+    monkeypatch.delenv("LLM_WARMUP_CONNECTIONS", raising=False)
+    assert warm_up("http://127.0.0.1:9/anthropic") == 0.0
+
+
+def test_warm_up_unreachable_proxy():
+    """Test an unreachable proxy is reported as a ConnectionError."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    with pytest.raises(ConnectionError, match="Cannot reach vscode-lm-proxy"):
+        warm_up(f"http://127.0.0.1:{port}/anthropic", connections=1)
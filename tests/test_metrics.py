@@ -0,0 +1,208 @@
+"""Tests for the process-wide metrics registry and its instrumentation."""
+
+import threading
+
+import anthropic
+import httpx
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.checkpoint.memory import MemorySaver
+
+from src import metrics as metrics_module
+from src.client import _connect
+from src.config.projects import ProjectRegistry
+from src.graph.builder import build_graph
+from src.graph.checkpointer import create_checkpointer
+from src.graph.sessions import SessionManager
+from src.llm import governor as governor_module
+from src.llm.governor import LLMGovernor
+from src.llm.proxy_client import GovernedChatAnthropic
+from src.metrics import MetricsRegistry, instrument_node, timed_tool
+from src.server import TaskServer, bind
+from tests.conftest import FakeModel
+
+
+@pytest.fixture
+def metrics(monkeypatch) -> MetricsRegistry:
+    """Install an enabled registry as the process-wide one."""
+    registry = MetricsRegistry(enabled=True)
+    monkeypatch.setattr(metrics_module, "_registry", registry)
+    return registry
+
+
+def _models() -> dict[str, FakeModel]:
+    return {
+        "supervisor": FakeModel(responses=["architect", "end"]),
+        "architect": FakeModel(responses=["Plan"]),
+    }
+
+
+def test_render_text_format():
+    """Test counters and histograms render in the Prometheus text format."""
+    registry = MetricsRegistry(enabled=True)
+    registry.inc("langgraphx_tasks_total", project='a"b', outcome="done")
+    registry.inc("langgraphx_tasks_total", 2, project="c", outcome="done")
+    registry.observe("langgraphx_tool_duration_seconds", 0.02, tool="read_file")
+    registry.observe("langgraphx_tool_duration_seconds", 400, tool="read_file")
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE langgraphx_tasks_total counter" in lines
+    assert 'langgraphx_tasks_total{outcome="done",project="a\\"b"} 1' in lines
+    assert 'langgraphx_tasks_total{outcome="done",project="c"} 2' in lines
+    assert "# TYPE langgraphx_tool_duration_seconds histogram" in lines
+    assert 'langgraphx_tool_duration_seconds_bucket{tool="read_file",le="0.01"} 0' in lines
+    assert 'langgraphx_tool_duration_seconds_bucket{tool="read_file",le="0.025"} 1' in lines
+    assert 'langgraphx_tool_duration_seconds_bucket{tool="read_file",le="300"} 1' in lines
+    assert 'langgraphx_tool_duration_seconds_bucket{tool="read_file",le="+Inf"} 2' in lines
+    assert 'langgraphx_tool_duration_seconds_sum{tool="read_file"} 400.02' in lines
+    assert 'langgraphx_tool_duration_seconds_count{tool="read_file"} 2' in lines
+    assert registry.total("langgraphx_tool_duration_seconds", tool="read_file") == 400.02
+    # Metrics without samples are left out
+    assert not any("langgraphx_node" in line for line in lines)
+
+
+def test_disabled_registry_records_nothing(monkeypatch):
+    """Test recording is a no-op and nodes stay unwrapped when metrics are off."""
+    registry = MetricsRegistry(enabled=False)
+    monkeypatch.setattr(metrics_module, "_registry", registry)
+
+    def node(state):
+        return state
+
+    registry.inc("langgraphx_tasks_total", project="a", outcome="done")
+    with registry.timer("langgraphx_tool_duration_seconds", tool="x"):
+        pass
+
+    assert registry.render() == ""
+    assert instrument_node("supervisor", node) is node
+
+
+def test_undeclared_metric_is_rejected():
+    """Test typos in metric names fail loudly."""
+    with pytest.raises(KeyError, match="Undeclared metric"):
+        MetricsRegistry(enabled=True).inc("langgraphx_task_total")
+
+
+def test_dump_replaces_file(tmp_path):
+    """Test dumps write the rendered metrics to the file."""
+    registry = MetricsRegistry(enabled=True)
+    registry.inc("langgraphx_tasks_total", project="a", outcome="done")
+    path = tmp_path / "textfile" / "langgraphx.prom"
+
+    registry.dump(path)
+
+    assert path.read_text() == registry.render()
+    assert [p.name for p in path.parent.iterdir()] == ["langgraphx.prom"]
+
+
+def test_task_records_nodes_and_caches(metrics, run_fake_task):
+    """Test a task counts its outcome, node durations and prompt cache lookups."""
+    run_fake_task(_models())
+    run_fake_task(_models())
+
+    assert metrics.value("langgraphx_tasks_total", project="test_project", outcome="done") == 2
+    assert metrics.value("langgraphx_task_duration_seconds", project="test_project") == 2
+    assert metrics.value("langgraphx_node_duration_seconds", node="supervisor") == 4
+    assert metrics.value("langgraphx_node_duration_seconds", node="architect") == 2
+    assert metrics.value("langgraphx_cache_requests_total", cache="prompt", result="hit") > 0
+
+
+def test_node_errors_are_counted(metrics):
+    """Test a node that raises is timed and counted as an error."""
+
+    def failing(state):
+        raise ValueError("boom")
+
+    node = instrument_node("tester", failing)
+
+    with pytest.raises(ValueError):
+        node({})
+    assert metrics.value("langgraphx_node_errors_total", node="tester") == 1
+    assert metrics.value("langgraphx_node_duration_seconds", node="tester") == 1
+
+
+def test_tool_calls_count_error_results(metrics):
+    """Test tools returning an error dict count as failed calls."""
+
+    @timed_tool
+    def read_config(path: str) -> dict:
+        return {"error": "not found"} if path == "missing" else {"content": "x"}
+
+    read_config("app.yaml")
+    read_config("missing")
+
+    assert metrics.value("langgraphx_tool_calls_total", tool="read_config", outcome="ok") == 1
+    assert metrics.value("langgraphx_tool_calls_total", tool="read_config", outcome="error") == 1
+    assert metrics.value("langgraphx_tool_duration_seconds", tool="read_config") == 2
+
+
+def test_model_calls_record_retries_and_tokens(metrics, monkeypatch):
+    """Test governed model calls count outcomes, retries and tokens by type."""
+    monkeypatch.setattr(governor_module, "_governor", LLMGovernor(sleep=lambda _s: None))
+    request = httpx.Request("POST", "http://localhost:4000/anthropic/v1/messages")
+    response = httpx.Response(429, request=request)
+    outcomes = [anthropic.RateLimitError("HTTP 429", response=response, body=None)]
+    usage = {
+        "input_tokens": 100,
+        "output_tokens": 20,
+        "total_tokens": 120,
+        "input_token_details": {"cache_read": 80},
+    }
+
+    def fake_generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if outcomes:
+            raise outcomes.pop()
+        message = AIMessage(content="end", usage_metadata=usage)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    monkeypatch.setattr("langchain_anthropic.ChatAnthropic._generate", fake_generate)
+    model = GovernedChatAnthropic(model="claude-test", api_key="dummy", max_retries=0)
+
+    model.invoke([HumanMessage(content="Route this task")])
+
+    assert metrics.value("langgraphx_llm_calls_total", model="claude-test", outcome="ok") == 1
+    assert metrics.value("langgraphx_llm_retries_total", error="429") == 1
+    tokens = "langgraphx_llm_tokens_total"
+    assert metrics.value(tokens, model="claude-test", type="input") == 100
+    assert metrics.value(tokens, model="claude-test", type="cache_read") == 80
+
+
+def test_checkpoint_writes_are_timed(metrics, monkeypatch, run_fake_task):
+    """Test checkpointers from create_checkpointer time their writes."""
+    monkeypatch.setenv("CHECKPOINT_BACKEND", "memory")
+
+    run_fake_task({"supervisor": FakeModel(responses=["end"])}, checkpointer=create_checkpointer())
+
+    assert metrics.value("langgraphx_checkpoint_write_duration_seconds", op="put") > 0
+    assert metrics.value("langgraphx_checkpoint_write_duration_seconds", op="put_writes") > 0
+
+
+def test_server_metrics_endpoint(metrics, temp_project_dir, mock_llm_client, tmp_path):
+    """Test the server serves the registry in the text format."""
+    metrics.inc("langgraphx_tasks_total", project="test_project", outcome="done")
+    graph = build_graph(MemorySaver())
+    app = TaskServer(
+        registry=ProjectRegistry(temp_project_dir, use_cache=False),
+        graph=graph,
+        llm_client=mock_llm_client,
+        tools=[],
+        sessions=SessionManager(graph.checkpointer),
+    )
+    address = f"unix:{tmp_path / 's.sock'}"
+    server = bind(app, address)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        conn = _connect(address, timeout=5)
+        conn.request("GET", "/metrics")
+        response = conn.getresponse()
+        body = response.read().decode()
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert response.status == 200
+    assert response.getheader("Content-Type").startswith("text/plain; version=0.0.4")
+    assert 'langgraphx_tasks_total{outcome="done",project="test_project"} 1' in body
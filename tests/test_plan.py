@@ -0,0 +1,108 @@
+"""Tests for map-reduce developer execution over architect plans."""
+
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from src.agents.plan import files_written, find_conflicts, merge_plan_node, parse_plan
+from src.graph.builder import build_graph
+from src.graph.state import PlanResult
+from tests.conftest import FakeModel
+
+PLAN = """Found three independent configs.
+
+```plan
+[
+  {"file": "a.yaml", "instructions": "Bump replicas"},
+  {"file": "b.yaml", "instructions": "Bump replicas"},
+  {"file": "./a.yaml", "instructions": "Add a label"},
+  {"file": "c.yaml", "instructions": "Bump replicas"}
+]
+```
+"""
+
+
+def _result(index: int, file: str, written: list[str]) -> PlanResult:
+    return PlanResult(index=index, file=file, summary="Done", files_written=written)
+
+
+def test_parse_plan():
+    """Test plan blocks are parsed and steps for one file combined."""
+    steps = parse_plan([{"type": "text", "text": PLAN}])
+
+    assert [s["file"] for s in steps] == ["a.yaml", "b.yaml", "c.yaml"]
+    assert steps[0]["instructions"] == "Bump replicas\nAdd a label"
+
+
+def test_parse_plan_ignores_missing_or_malformed_blocks():
+    """Test answers without a valid plan yield no subtasks."""
+    assert parse_plan("Just an answer") == []
+    assert parse_plan("```plan\n[{'file': 'a'}]\n```") == []
+    assert parse_plan('```plan\n{"file": "a", "instructions": "x"}\n```') == []
+    assert parse_plan('```plan\n[{"file": "", "instructions": "x"}, 3]\n```') == []
+
+
+def test_files_written_from_tool_calls():
+    """Test edited files are read from write_file calls."""
+    message = AIMessage(
+        content="",
+        tool_calls=[
+            {"name": "write_file", "args": {"file_path": "./a.yaml"}, "id": "1"},
+            {"name": "read_file", "args": {"file_path": "b.yaml"}, "id": "2"},
+        ],
+    )
+    assert files_written(message) == ["a.yaml"]
+
+
+def test_find_conflicts():
+    """Test files edited by several workers are reported by subtask."""
+    results = [
+        _result(0, "a.yaml", ["a.yaml", "shared.yaml"]),
+        _result(1, "b.yaml", ["b.yaml", "shared.yaml"]),
+        _result(2, "c.yaml", ["a.yaml"]),
+        _result(3, "d.yaml", []),
+    ]
+
+    assert find_conflicts(results) == {"a.yaml": [1, 3], "shared.yaml": [1, 2]}
+
+
+def test_merge_reports_conflicts_and_clears_plan():
+    """Test the merge node summarizes results in plan order."""
+    state = {
+        "plan": [{"file": "a.yaml", "instructions": "x"}],
+        "plan_results": [_result(1, "b.yaml", ["a.yaml"]), _result(0, "a.yaml", ["a.yaml"])],
+    }
+
+    update = merge_plan_node(state)
+
+    content = update["messages"][0].content
+    assert content.index("[1] a.yaml") < content.index("[2] b.yaml")
+    assert "- a.yaml: subtasks 1, 2" in content
+    assert update["plan"] == [] and update["plan_results"] is None
+
+
+def test_plan_dispatches_parallel_workers(monkeypatch, run_fake_task):
+    """Test a multi-file plan runs bounded parallel workers, then merges."""
+    monkeypatch.setenv("GRAPH_MAX_CONCURRENCY", "2")
+    models = {
+        "supervisor": FakeModel(responses=["architect", "developer", "end"]),
+        "architect": FakeModel(responses=[PLAN]),
+        "developer": FakeModel(responses=["Updated the file"], delay=0.1),
+    }
+    saver = MemorySaver()
+
+    events = run_fake_task(models, task="Bump replicas", checkpointer=saver)
+
+    nodes = [e["node"] for e in events if e["event"] == "node"]
+    assert nodes.count("developer_worker") == 3
+    assert "developer" not in nodes
+    assert nodes[-2:] == ["merge_plan", "supervisor"]
+
+    # At most two workers overlapped
+    spans = models["developer"].spans
+    peak = max(sum(1 for s, e in spans if s <= start < e) for start, _ in spans)
+    assert peak == 2
+
+    config = {"configurable": {"thread_id": events[0]["thread_id"]}}
+    state = build_graph(saver).get_state(config).values
+    assert state["plan"] == [] and state["plan_results"] == []
+    assert state["messages"][-1].content.startswith("Developer workers completed 3 subtasks")
@@ -0,0 +1,159 @@
+"""Tests for opt-in node and tool profiling."""
+
+import cProfile
+import pstats
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src import profiling
+from src.agents.plan import parse_plan
+from src.profiling import Profiler, profile_node
+from src.tools.file_tools import read_file
+from tests.conftest import FakeModel
+
+PLAN = '```plan\n[{"file": "a.yaml", "instructions": "Bump replicas"}]\n```'
+
+
+@pytest.fixture(autouse=True)
+def stop_tracemalloc():
+    """Stop tracing started by a profiler, which would slow down later tests."""
+    yield
+    tracemalloc.stop()
+
+
+def allocate_and_wait() -> list[bytes]:
+    """Hold on to about 1 MB, then block like a network wait."""
+    blocks = [bytes(1024) for _ in range(1024)]
+    time.sleep(0.05)
+    return blocks
+
+
+def test_profile_splits_src_library_and_wait(tmp_path):
+    """Test the report attributes time to our code, waiting and allocations."""
+    profiler = Profiler(enabled=True, memory=True, profile_dir=tmp_path)
+
+    kept = profiler.call("node", "architect", allocate_and_wait)
+    for _ in range(2):
+        profiler.call("node", "developer", lambda: [parse_plan(PLAN) for _ in range(200)])
+    out, rows = profiler.finish("test_project_1")
+
+    by_name = {row["name"]: row for row in rows}
+    assert by_name["architect"]["wait_ms"] >= 40
+    assert by_name["architect"]["alloc_kb"] >= 1024
+    assert by_name["developer"]["calls"] == 2
+    assert by_name["developer"]["src_ms"] > 0
+    assert len(kept) == 1024
+
+    stats = pstats.Stats(str(out / "node-developer.prof"))
+    assert any(func[2] == "parse_plan" for func in stats.stats)
+    report = (out / "report.txt").read_text()
+    assert "=== node architect (1 calls" in report
+    assert "test_profiling.py:" in report
+    # Records are cleared once reported
+    assert profiler.finish("again") is None
+
+
+def test_nested_calls_are_part_of_the_outer_profile(tmp_path):
+    """Test a tool called inside a profiled node is not profiled separately."""
+    profiler = Profiler(enabled=True, memory=False, profile_dir=tmp_path)
+
+    profiler.call("node", "developer", lambda: profiler.call("tool", "read_file", sum, [1, 2]))
+    _out, rows = profiler.finish("nested")
+
+    assert [(row["kind"], row["name"]) for row in rows] == [("node", "developer")]
+
+
+def test_concurrent_nodes_run_while_one_is_profiled(tmp_path):
+    """Test a node starting during another thread's profiled node runs unprofiled."""
+    profiler = Profiler(enabled=True, memory=False, profile_dir=tmp_path)
+    started = threading.Event()
+
+    def first() -> str:
+        started.set()
+        time.sleep(0.1)
+        return "first"
+
+    def second() -> str:
+        started.wait()
+        return profiler.call("node", "developer", lambda: "second")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = [pool.submit(profiler.call, "node", "architect", first), pool.submit(second)]
+        assert [future.result() for future in results] == ["first", "second"]
+
+    out, rows = profiler.finish("parallel")
+    by_name = {row["name"]: row for row in rows}
+    assert (by_name["architect"]["calls"], by_name["architect"]["profiled"]) == (1, 1)
+    assert (by_name["developer"]["calls"], by_name["developer"]["profiled"]) == (1, 0)
+    assert not (out / "node-developer.prof").exists()
+    assert "Not profiled" in (out / "report.txt").read_text()
+
+
+def test_runs_unprofiled_when_another_profiler_is_active(tmp_path):
+    """Test a profiler started outside this module does not make nodes fail."""
+    profiler = Profiler(enabled=True, memory=False, profile_dir=tmp_path)
+    enabled, done = threading.Event(), threading.Event()
+
+    def outside() -> None:
+        other = cProfile.Profile()
+        other.enable()
+        enabled.set()
+        done.wait()
+        other.disable()
+
+    thread = threading.Thread(target=outside)
+    thread.start()
+    enabled.wait()
+    try:
+        assert profiler.call("node", "supervisor", sum, [1, 2]) == 3
+    finally:
+        done.set()
+        thread.join()
+
+    _out, [row] = profiler.finish("outside")
+    assert (row["calls"], row["profiled"]) == (1, 0)
+    # The slot is free again for the next call
+    profiler.call("node", "supervisor", sum, [1, 2])
+    assert profiler.finish("again")[1][0]["profiled"] == 1
+
+
+def test_disabled_profiler_leaves_nodes_alone(monkeypatch):
+    """Test nodes are not wrapped when profiling is off."""
+    monkeypatch.setattr(profiling, "_profiler", Profiler(enabled=False))
+
+    def node(state):
+        return state
+
+    assert profile_node("supervisor", node) is node
+
+
+def test_tools_are_profiled(monkeypatch, tmp_path):
+    """Test tool calls get their own profile outside nodes."""
+    profiler = Profiler(enabled=True, memory=False, profile_dir=tmp_path / "profiles")
+    monkeypatch.setattr(profiling, "_profiler", profiler)
+    (tmp_path / "app.yaml").write_text("replicas: 3\n")
+
+    result = read_file.invoke({"file_path": "app.yaml", "project_path": str(tmp_path)})
+
+    assert result["content"] == "replicas: 3\n"
+    _out, rows = profiler.finish("tools")
+    assert (rows[0]["kind"], rows[0]["name"]) == ("tool", "read_file")
+
+
+def test_task_reports_profile(monkeypatch, tmp_path, run_fake_task):
+    """Test a profiled task reports model waits in the calling node."""
+    profiler = Profiler(enabled=True, memory=False, profile_dir=tmp_path / "profiles")
+    monkeypatch.setattr(profiling, "_profiler", profiler)
+
+    events = run_fake_task({"supervisor": FakeModel(responses=["end"], delay=0.05)})
+
+    done = events[-1]
+    [row] = done["profile"]
+    assert (row["kind"], row["name"], row["calls"]) == ("node", "supervisor", 1)
+    # The model call runs on a worker thread; the node waits for it
+    assert row["wait_ms"] >= 40
+    assert list((tmp_path / "profiles").glob("*/node-supervisor.prof"))
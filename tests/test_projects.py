@@ -4,6 +4,7 @@ from pathlib import Path
 
 import pytest
 
+from src.config.context import ProjectContextStore, get_project_context
 from src.config.projects import ProjectRegistry
 
 
@@ -63,3 +64,110 @@ def test_detect_type_unknown(tmp_path):
     registry = ProjectRegistry(tmp_path)
     project_type = registry.detect_type(str(project_dir))
     assert project_type == ""
+
+
+def test_context_ref_stable_and_config_sensitive(sample_project_context):
+    """Test references depend only on project name and config content."""
+    store = ProjectContextStore()
+
+    ref = store.put("test_project", sample_project_context)
+    assert ref.startswith("test_project@")
+    assert store.put("test_project", dict(sample_project_context)) == ref
+
+    changed = {**sample_project_context, "examples": {}}
+    new_ref = store.put("test_project", changed)
+    assert new_ref != ref
+    # Runs started on the old config keep resolving it
+    assert store.get(ref) == sample_project_context
+    assert store.get(new_ref) == changed
+
+
+def test_get_project_context_from_config(sample_state, context_store, sample_project_context):
+    """Test agents resolve the project context through the runtime config."""
+    config = {"configurable": {"project_contexts": context_store}}
+
+    assert get_project_context(sample_state, config) == sample_project_context
+    assert get_project_context(sample_state, {"configurable": {}}) is None
+
+
+def test_agent_uses_shared_context(sample_state, context_store):
+    """Test an agent builds its prompt from the shared context store."""
+    from unittest.mock import MagicMock
+
+    from src.agents.architect import architect_node
+
+    llm = MagicMock()
+    config = {"configurable": {"llm": llm, "tools": [], "project_contexts": context_store}}
+
+    architect_node(sample_state, config)
+
+    prompt = llm.bind_tools.return_value.invoke.call_args[0][0][0].content
+    assert "test_project" in prompt
+    assert "/tmp/test_project" in prompt
+
+
+def test_invalid_project_reported_not_fatal(temp_project_dir):
+    """Test a broken project does not prevent others from loading."""
+    broken_dir = temp_project_dir / "broken"
+    broken_dir.mkdir()
+    (broken_dir / "config.yaml").write_text(
+        "name: broken\ntype: go\ndescription: x\npath: /nonexistent/broken\n"
+        "tech_stack: {}\ntools: {}\n"
+    )
+
+    registry = ProjectRegistry(temp_project_dir)
+
+    assert set(registry.list_names()) == {"broken", "test_project"}
+    assert registry.get("test_project")["name"] == "test_project"
+    assert "Project path does not exist" in registry.errors()["broken"]
+    assert [p["name"] for p in registry.list()] == ["test_project"]
+    with pytest.raises(ValueError):
+        registry.get("broken")
+
+
+def test_projects_loaded_lazily(temp_project_dir, monkeypatch):
+    """Test configs are not parsed until a project is accessed."""
+    calls = []
+    original = ProjectRegistry._load_project
+    monkeypatch.setattr(
+        ProjectRegistry,
+        "_load_project",
+        lambda self, name: calls.append(name) or original(self, name),
+    )
+
+    registry = ProjectRegistry(temp_project_dir, use_cache=False)
+    assert registry.list_names() == ["test_project"]
+    assert calls == []
+
+    registry.get("test_project")
+    registry.get("test_project")
+    assert calls == ["test_project"]
+
+
+def test_snapshot_skips_yaml_on_warm_start(temp_project_dir, tmp_path, monkeypatch):
+    """Test a warm registry reads configs from the snapshot instead of YAML."""
+    import yaml
+
+    cache_path = tmp_path / "cache.json"
+    cold = ProjectRegistry(temp_project_dir, cache_path=cache_path)
+    cold_context = cold.load_context("test_project")
+    assert cache_path.exists()
+
+    def fail_yaml(*args, **kwargs):
+        raise AssertionError("YAML parsed on warm start")
+
+    monkeypatch.setattr(yaml, "load", fail_yaml)
+    warm = ProjectRegistry(temp_project_dir, cache_path=cache_path)
+    assert warm.load_context("test_project") == cold_context
+
+
+def test_snapshot_invalidated_on_change(temp_project_dir, tmp_path):
+    """Test edited config files are re-parsed despite the snapshot."""
+    cache_path = tmp_path / "cache.json"
+    ProjectRegistry(temp_project_dir, cache_path=cache_path).get("test_project")
+
+    config_file = temp_project_dir / "test_project" / "config.yaml"
+    config_file.write_text(config_file.read_text().replace("Test project", "Edited project!"))
+
+    registry = ProjectRegistry(temp_project_dir, cache_path=cache_path)
+    assert registry.get("test_project")["description"] == "Edited project!"
@@ -0,0 +1,110 @@
+"""Tests for recording runs and replaying them offline."""
+
+import gzip
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from src import recording
+from src.llm.proxy_client import LLMClient
+from src.recording import Replayer, ReplayMismatch, RunRecorder, request_key
+from src.tools.file_tools import read_file
+
+# Supervisor, architect, supervisor: the default model answers every role
+ANSWERS = ["architect", "Split the config into base and overlay.", "end"]
+TASK = "Restructure the config"
+
+
+@pytest.fixture
+def proxy(monkeypatch):
+    """Answer proxy calls in order, recording how many were made."""
+    answers = list(ANSWERS)
+    calls: list[int] = []
+
+    def fake_generate(self, messages, stop=None, run_manager=None, **kwargs):
+        calls.append(1)
+        usage = {"input_tokens": 20, "output_tokens": 4, "total_tokens": 24}
+        message = AIMessage(content=answers.pop(0), usage_metadata=usage)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    monkeypatch.setattr("langchain_anthropic.ChatAnthropic._generate", fake_generate)
+    return calls
+
+
+def _record(monkeypatch, tmp_path, run_fake_task) -> tuple[list[dict], str]:
+    path = tmp_path / "run.rec"
+    monkeypatch.setattr(recording, "_recorder", RunRecorder(path))
+    events = run_fake_task(task=TASK, llm_client=LLMClient(proxy_url="http://127.0.0.1:9"))
+    monkeypatch.setattr(recording, "_recorder", None)
+    return events, str(path)
+
+
+def _messages(events: list[dict]) -> list[tuple[str, str]]:
+    return [(e["node"], e.get("message")) for e in events if e["event"] == "node"]
+
+
+def test_replay_reproduces_recorded_run(monkeypatch, tmp_path, run_fake_task, proxy):
+    """Test a replayed run takes the recorded route without calling the proxy."""
+    recorded, path = _record(monkeypatch, tmp_path, run_fake_task)
+    assert recorded[-1]["recording"] == path
+    with gzip.open(path, "rt") as f:
+        assert '"version":1' in f.read()
+
+    replayer = Replayer.load(path, strict=True)
+    assert [t["task"] for t in replayer.recording.tasks] == [TASK]
+    monkeypatch.setattr(recording, "_replayer", replayer)
+    proxy.clear()
+
+    replayed = run_fake_task(task=TASK, llm_client=LLMClient(proxy_url="http://127.0.0.1:9"))
+
+    assert proxy == []
+    assert _messages(replayed) == _messages(recorded)
+    assert replayed[-1]["usage"] == recorded[-1]["usage"]
+    assert replayed[-1]["replay"] == {
+        "calls": 3, "matched": 3, "fallback": 0, "tool_calls": 0, "unused": 0
+    }
+
+
+def test_changed_prompts_replay_in_recorded_order(monkeypatch, tmp_path, run_fake_task, proxy):
+    """Test requests missing from the recording get the node's next recorded answer."""
+    recorded, path = _record(monkeypatch, tmp_path, run_fake_task)
+    replayer = Replayer.load(path, strict=False)
+    monkeypatch.setattr(recording, "_replayer", replayer)
+
+    replayed = run_fake_task(task=f"{TASK} files", llm_client=LLMClient())
+
+    assert _messages(replayed) == _messages(recorded)
+    assert replayed[-1]["replay"]["fallback"] == 3
+
+    replayer.strict = True
+    replayer.reset()
+    with pytest.raises(ReplayMismatch):
+        run_fake_task(task=f"{TASK} files", llm_client=LLMClient())
+
+
+def test_request_key_ignores_message_ids():
+    """Test the same conversation matches across runs despite new message IDs."""
+    first = [HumanMessage(content="Fix it", id="a"), AIMessage(content="architect", id="b")]
+    second = [HumanMessage(content="Fix it", id="c"), AIMessage(content="architect", id="d")]
+
+    assert request_key(first) == request_key(second)
+    assert request_key(first) != request_key(first[:1])
+
+
+def test_tool_results_are_replayed(monkeypatch, tmp_path):
+    """Test tools answer from the recording when replaying, without touching files."""
+    (tmp_path / "app.yaml").write_text("replicas: 3\n")
+    recorder = RunRecorder(tmp_path / "tools.rec")
+    monkeypatch.setattr(recording, "_recorder", recorder)
+    args = {"file_path": "app.yaml", "project_path": str(tmp_path)}
+    assert read_file.invoke(args)["content"] == "replicas: 3\n"
+    recorder.save()
+    monkeypatch.setattr(recording, "_recorder", None)
+
+    (tmp_path / "app.yaml").unlink()
+    monkeypatch.setattr(recording, "_replayer", Replayer.load(tmp_path / "tools.rec"))
+
+    assert read_file.invoke(args)["content"] == "replicas: 3\n"
+    missing = read_file.invoke({**args, "file_path": "other.yaml"})
+    assert missing["error"] == "No recorded result for read_file"
@@ -0,0 +1,100 @@
+"""Tests for per-role model tiering."""
+
+import pytest
+import yaml
+
+from src.config.projects import ProjectRegistry
+from src.llm.proxy_client import LLMClient
+from src.llm.roles import get_role_llm, role_settings, validate_models
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    """Clear role env settings so tests start from the defaults."""
+    monkeypatch.setenv("MODEL_NAME", "claude-sonnet-4.5")
+    for name in ("MODEL", "MAX_TOKENS", "TEMPERATURE"):
+        for role in ("SUPERVISOR", "ARCHITECT", "DEVELOPER", "REVIEWER", "TESTER"):
+            monkeypatch.delenv(f"{name}_{role}", raising=False)
+
+
+def test_role_settings_precedence(monkeypatch):
+    """Test defaults < role defaults < env < project overrides."""
+    assert role_settings("developer") == {
+        "model": "claude-sonnet-4.5",
+        "max_tokens": 4096,
+        "temperature": 0.7,
+    }
+    assert role_settings("supervisor")["max_tokens"] == 16
+    assert role_settings("supervisor")["temperature"] == 0.0
+
+    monkeypatch.setenv("MODEL_SUPERVISOR", "claude-haiku-4.5")
+    monkeypatch.setenv("MAX_TOKENS_SUPERVISOR", "8")
+    assert role_settings("supervisor")["model"] == "claude-haiku-4.5"
+    assert role_settings("supervisor")["max_tokens"] == 8
+
+    overridden = role_settings("supervisor", {"model": "claude-opus-4"})
+    assert overridden["model"] == "claude-opus-4"
+    assert overridden["max_tokens"] == 8
+
+
+@pytest.mark.parametrize(
+    ("models", "message"),
+    [
+        ([], "must be a mapping"),
+        ({"manager": {}}, "Unknown agent role"),
+        ({"developer": "haiku"}, "models.developer must be a mapping"),
+        ({"developer": {"top_p": 0.9}}, "Unknown model setting"),
+        ({"developer": {"max_tokens": "many"}}, "must be int"),
+    ],
+)
+def test_validate_models_errors(models, message):
+    """Test malformed models sections are rejected."""
+    with pytest.raises(ValueError, match=message):
+        validate_models(models)
+
+
+def test_registry_reports_invalid_models(temp_project_dir):
+    """Test a project with a bad models section fails to load with a clear error."""
+    config_file = temp_project_dir / "test_project" / "config.yaml"
+    config = yaml.safe_load(config_file.read_text())
+    config["models"] = {"supervisor": {"temperature": "low"}}
+    config_file.write_text(yaml.dump(config))
+
+    registry = ProjectRegistry(temp_project_dir, use_cache=False)
+
+    with pytest.raises(ValueError, match="models.supervisor.temperature"):
+        registry.get("test_project")
+
+
+def test_get_role_llm_uses_project_overrides(mock_llm_client, sample_project_context):
+    """Test agents ask the client for their role's tier with project overrides."""
+    sample_project_context["info"]["models"] = {"architect": {"model": "claude-haiku-4.5"}}
+    config = {"configurable": {"llm": "default", "llm_client": mock_llm_client}}
+
+    get_role_llm(config, "architect", sample_project_context)
+    get_role_llm(config, "tester", sample_project_context)
+
+    calls = mock_llm_client.get_chat_model.call_args_list
+    assert calls[0].args == ("architect", {"model": "claude-haiku-4.5"})
+    assert calls[1].args == ("tester", None)
+
+
+def test_get_role_llm_falls_back_to_single_model():
+    """Test the single 'llm' model is used when no client is configured."""
+    config = {"configurable": {"llm": "default"}}
+    assert get_role_llm(config, "supervisor") == "default"
+
+
+def test_client_caches_models_per_settings(monkeypatch):
+    """Test roles sharing settings share one model instance."""
+    monkeypatch.setenv("MODEL_ARCHITECT", "claude-haiku-4.5")
+    client = LLMClient()
+
+    supervisor = client.get_chat_model("supervisor")
+    architect = client.get_chat_model("architect")
+
+    assert (supervisor.max_tokens, supervisor.temperature) == (16, 0.0)
+    assert architect.model == "claude-haiku-4.5"
+    assert client.get_chat_model("developer") is client.get_chat_model()
+    assert client.get_chat_model("supervisor") is supervisor
+    assert client.role_models()["architect"] == "claude-haiku-4.5"
@@ -0,0 +1,181 @@
+"""Tests for compact checkpoint serialization."""
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from src.graph.serde import COMPACT_TYPE, CompactSerializer, MemoryBlobStore
+
+
+@pytest.fixture
+def store() -> MemoryBlobStore:
+    """Create an empty in-memory blob store."""
+    return MemoryBlobStore()
+
+
+@pytest.mark.parametrize("compression", ["zstd", "zlib", "none"])
+def test_messages_roundtrip(store, compression):
+    """Test message lists survive a round trip with every codec."""
+    serde = CompactSerializer(store, compression=compression)
+    messages = [HumanMessage(content="task", id="1"), AIMessage(content="done", id="2")]
+
+    type_, data = serde.dumps_typed(messages)
+
+    assert type_ == COMPACT_TYPE
+    assert serde.loads_typed((type_, data)) == messages
+
+
+def test_appending_message_stores_only_new_message(store):
+    """Test growing message histories only add the new messages to the store."""
+    serde = CompactSerializer(store)
+    history = [HumanMessage(content="task " * 100, id=str(i)) for i in range(10)]
+
+    serde.dumps_typed(history)
+    assert len(store) == 10
+
+    serde.dumps_typed([*history, AIMessage(content="reply", id="10")])
+    assert len(store) == 11
+
+
+def test_large_static_values_deduplicated(store, sample_project_context):
+    """Test large values such as project context are stored once."""
+    serde = CompactSerializer(store, min_ref_size=64)
+
+    first = serde.dumps_typed(sample_project_context)
+    second = serde.dumps_typed(dict(sample_project_context))
+
+    assert first == second
+    assert len(store) == 1
+    assert serde.loads_typed(first) == sample_project_context
+
+
+def test_small_values_use_inner_serializer(store):
+    """Test small values bypass the store entirely."""
+    serde = CompactSerializer(store)
+
+    data = serde.dumps_typed("architect")
+
+    assert data[0] != COMPACT_TYPE
+    assert serde.loads_typed(data) == "architect"
+    assert len(store) == 0
+
+
+def test_whole_checkpoint_roundtrip(store, sample_project_context):
+    """Test full checkpoints (as written by SQLite) encode channel values by reference."""
+    serde = CompactSerializer(store, min_ref_size=64)
+    checkpoint = {
+        "v": 1,
+        "id": "abc",
+        "ts": "2025-01-01T00:00:00",
+        "channel_values": {
+            "messages": [HumanMessage(content="task", id="1")],
+            "project_context": sample_project_context,
+            "next_agent": "developer",
+        },
+        "channel_versions": {"messages": 1},
+        "versions_seen": {},
+    }
+
+    assert serde.loads_typed(serde.dumps_typed(checkpoint)) == checkpoint
+
+
+def test_reads_plain_serialized_values(store):
+    """Test values written before compact serialization remain readable."""
+    plain = JsonPlusSerializer().dumps_typed([HumanMessage(content="old", id="1")])
+    serde = CompactSerializer(store)
+
+    assert serde.loads_typed(plain)[0].content == "old"
+
+
+def test_missing_content_raises(store):
+    """Test a reference to content absent from the store is reported."""
+    writer = CompactSerializer(store)
+    data = writer.dumps_typed([HumanMessage(content="task", id="1")])
+
+    reader = CompactSerializer(MemoryBlobStore())
+    with pytest.raises(KeyError):
+        reader.loads_typed(data)
+
+
+def test_sweep_keeps_referenced_and_recent_content(store):
+    """Test sweeps delete only old records that no payload references."""
+    serde = CompactSerializer(store, grace=0)
+    kept = serde.dumps_typed([HumanMessage(content="kept", id="1")])
+    serde.dumps_typed([HumanMessage(content="dropped", id="2")])
+
+    assert serde.sweep([kept]) == 1
+    assert len(store) == 1
+    assert serde.loads_typed(kept)[0].content == "kept"
+
+    recent = CompactSerializer(store)
+    recent.dumps_typed([HumanMessage(content="new", id="3")])
+    assert recent.sweep([]) == 0
+
+
+def test_swept_content_is_stored_again(store):
+    """Test the serializer's cache does not skip storing content a sweep removed."""
+    serde = CompactSerializer(store, grace=0)
+    messages = [HumanMessage(content="task", id="1")]
+    serde.dumps_typed(messages)
+    serde.sweep([])
+    assert len(store) == 0
+
+    data = serde.dumps_typed(messages)
+
+    assert len(store) == 1
+    assert CompactSerializer(store).loads_typed(data) == messages
+
+
+def test_graph_state_with_compact_serializer(sample_state):
+    """Test a graph checkpointed with CompactSerializer restores identical state."""
+    from langgraph.graph import END, START, StateGraph
+
+    from src.graph.state import MultiProjectState
+
+    saver = MemorySaver(serde=CompactSerializer(MemoryBlobStore()))
+    workflow = StateGraph(MultiProjectState)
+    workflow.add_node("agent", lambda state: {"messages": [AIMessage(content="ok")]})
+    workflow.add_edge(START, "agent")
+    workflow.add_edge("agent", END)
+    graph = workflow.compile(checkpointer=saver)
+
+    config = {"configurable": {"thread_id": "test_project_1"}}
+    sample_state["messages"] = [HumanMessage(content="task")]
+    graph.invoke(sample_state, config)
+
+    values = graph.get_state(config).values
+    assert [m.content for m in values["messages"]] == ["task", "ok"]
+    assert values["project_ref"] == sample_state["project_ref"]
+
+
+def test_sqlite_store_shares_saver_lock_across_threads(tmp_path):
+    """Test blob reads and writes from many threads serialize with checkpoint writes."""
+    pytest.importorskip("langgraph.checkpoint.sqlite")
+    from concurrent.futures import ThreadPoolExecutor
+
+    from src.graph.sqlite_saver import BatchedSqliteSaver
+
+    saver = BatchedSqliteSaver.from_path(tmp_path / "checkpoints.db", batch_size=3, compact=True)
+    store = saver.serde.store
+    assert store.lock is saver.lock
+
+    def work(worker: int) -> int:
+        config = {
+            "configurable": {"thread_id": f"t_{worker}", "checkpoint_ns": "", "checkpoint_id": "1"}
+        }
+        for i in range(50):
+            records = {f"{worker}-{i}": f"record {worker} {i}".encode()}
+            store.put_many(records)
+            assert store.get_many(list(records)) == records
+            message = HumanMessage(content=f"step {worker} {i}", id=f"{worker}-{i}")
+            saver.put_writes(config, [("messages", [message])], task_id=str(i))
+        return worker
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert sorted(pool.map(work, range(8))) == list(range(8))
+    saver.flush()
+
+    keys = [f"{worker}-{i}" for worker in range(8) for i in range(50)]
+    assert len(store.get_many(keys)) == len(keys)
+    saver.conn.close()
@@ -0,0 +1,95 @@
+"""Tests for the task server and its client."""
+
+import threading
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langgraph.checkpoint.memory import MemorySaver
+
+from src.client import is_server_running, parse_address, submit_task
+from src.config.projects import ProjectRegistry
+from src.graph.builder import build_graph
+from src.graph.sessions import SessionManager
+from src.server import TaskServer, bind
+
+
+@pytest.fixture
+def task_server(temp_project_dir, mock_llm_client) -> TaskServer:
+    """Create a task server whose supervisor ends every task immediately."""
+    mock_llm_client.get_chat_model.side_effect = lambda *_args: FakeListChatModel(responses=["end"])
+    graph = build_graph(MemorySaver())
+    return TaskServer(
+        registry=ProjectRegistry(temp_project_dir, use_cache=False),
+        graph=graph,
+        llm_client=mock_llm_client,
+        tools=[],
+        sessions=SessionManager(graph.checkpointer),
+        max_workers=1,
+    )
+
+
+@pytest.fixture
+def address(task_server, tmp_path):
+    """Serve the task server on a Unix socket for the duration of a test."""
+    address = f"unix:{tmp_path / 's.sock'}"
+    server = bind(task_server, address)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield address
+    server.shutdown()
+    server.server_close()
+
+
+def test_parse_address():
+    """Test Unix socket and HTTP addresses are parsed."""
+    assert parse_address("unix:/tmp/x.sock") == ("unix", "/tmp/x.sock")
+    assert parse_address("unix:///tmp/x.sock") == ("unix", "/tmp/x.sock")
+    assert parse_address("http://127.0.0.1:8765") == ("http", ("127.0.0.1", 8765))
+    with pytest.raises(ValueError):
+        parse_address("tcp://host")
+
+
+def test_submit_task_streams_events(address):
+    """Test a submitted task streams start, node and done events."""
+    assert is_server_running(address)
+
+    events = list(submit_task("Check config", "test_project", address=address))
+
+    assert [e["event"] for e in events] == ["start", "node", "done"]
+    assert events[0]["project"] == "test_project"
+    assert events[1] == {"event": "node", "node": "supervisor", "next_agent": "end"}
+    assert events[2]["thread_id"] == events[0]["thread_id"]
+
+
+def test_submit_task_rejects_unknown_project(address):
+    """Test invalid requests are rejected before running."""
+    with pytest.raises(RuntimeError, match="Project not found"):
+        list(submit_task("Check config", "missing", address=address))
+
+
+def test_server_not_running(tmp_path):
+    """Test a missing socket is reported as not running."""
+    assert not is_server_running(f"unix:{tmp_path / 'none.sock'}")
+
+
+def test_bind_refuses_running_server(task_server, address):
+    """Test a second server cannot take over a live socket."""
+    with pytest.raises(RuntimeError, match="already running"):
+        bind(task_server, address)
+
+
+def test_tasks_beyond_worker_limit_queue(task_server):
+    """Test tasks wait for a free worker slot."""
+    first = task_server.run({"task": "one", "project": "test_project"})
+    assert next(first)["event"] == "start"
+    assert task_server.health()["active"] == 1
+
+    second = task_server.run({"task": "two", "project": "test_project"})
+    assert next(second)["event"] == "queued"
+    assert task_server.health()["queued"] == 1
+
+    # Finishing the first task frees the slot for the second
+    assert [e["event"] for e in first] == ["node", "done"]
+    assert [e["event"] for e in second] == ["start", "node", "done"]
+    health = task_server.health()
+    assert (health["active"], health["queued"]) == (0, 0)
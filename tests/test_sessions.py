@@ -0,0 +1,150 @@
+"""Tests for session (checkpoint thread) management."""
+
+from typing import Annotated, Any
+
+import pytest
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+from typing_extensions import TypedDict
+
+from src.graph.sessions import SessionManager
+
+
+class CounterState(TypedDict):
+    """Minimal state for exercising the checkpointer."""
+
+    count: int
+
+
+def _build_counter_graph(checkpointer: MemorySaver) -> Any:
+    """Build a three-step graph that increments a counter."""
+    workflow = StateGraph(CounterState)
+    for name in ("a", "b", "c"):
+        workflow.add_node(name, lambda state: {"count": state["count"] + 1})
+    workflow.add_edge(START, "a")
+    workflow.add_edge("a", "b")
+    workflow.add_edge("b", "c")
+    workflow.add_edge("c", END)
+    return workflow.compile(checkpointer=checkpointer)
+
+
+def _run(graph: Any, thread_id: str) -> None:
+    graph.invoke({"count": 0}, {"configurable": {"thread_id": thread_id}})
+
+
+def test_new_thread_per_task():
+    """Test that each task gets a distinct thread ID unless a session is given."""
+    sessions = SessionManager(MemorySaver())
+
+    first = sessions.resolve("rssx")
+    second = sessions.resolve("rssx")
+
+    assert first != second
+    assert first.startswith("rssx_")
+    assert sessions.resolve("rssx", "rssx_existing") == "rssx_existing"
+
+
+def test_list_sessions_filters_by_project():
+    """Test listing threads grouped and filtered by project."""
+    saver = MemorySaver()
+    graph = _build_counter_graph(saver)
+    sessions = SessionManager(saver)
+
+    _run(graph, "rssx_1")
+    _run(graph, "w10n-config_1")
+
+    listed = sessions.list_sessions()
+    assert {s["thread_id"] for s in listed} == {"rssx_1", "w10n-config_1"}
+
+    rssx_only = sessions.list_sessions("rssx")
+    assert [s["thread_id"] for s in rssx_only] == ["rssx_1"]
+    assert rssx_only[0]["checkpoints"] > 1
+
+
+def test_prune_keeps_most_recent():
+    """Test pruning old threads per project."""
+    saver = MemorySaver()
+    graph = _build_counter_graph(saver)
+    sessions = SessionManager(saver)
+
+    for i in range(3):
+        _run(graph, f"rssx_{i}")
+
+    deleted = sessions.prune(keep=1)
+
+    assert sorted(deleted) == ["rssx_0", "rssx_1"]
+    assert [s["thread_id"] for s in sessions.list_sessions()] == ["rssx_2"]
+
+
+def test_trim_caps_checkpoints_and_keeps_latest_state():
+    """Test the per-thread checkpoint cap preserves the latest state."""
+    saver = MemorySaver()
+    graph = _build_counter_graph(saver)
+    sessions = SessionManager(saver, max_checkpoints=2)
+    config = {"configurable": {"thread_id": "rssx_1"}}
+
+    _run(graph, "rssx_1")
+    removed = sessions.trim("rssx_1")
+
+    assert removed > 0
+    assert len(list(saver.list(config))) == 2
+    assert graph.get_state(config).values["count"] == 3
+
+
+def test_trim_disabled():
+    """Test that a cap of zero disables trimming."""
+    saver = MemorySaver()
+    graph = _build_counter_graph(saver)
+    sessions = SessionManager(saver, max_checkpoints=0)
+
+    _run(graph, "rssx_1")
+
+    assert sessions.trim("rssx_1") == 0
+
+
+class ChatState(TypedDict):
+    """State whose messages CompactSerializer stores by reference."""
+
+    messages: Annotated[list[AnyMessage], add_messages]
+
+
+def test_prune_releases_compact_content(tmp_path):
+    """Test pruning threads deletes content records only they referenced."""
+    pytest.importorskip("langgraph.checkpoint.sqlite")
+    from src.graph.sqlite_saver import BatchedSqliteSaver
+
+    saver = BatchedSqliteSaver.from_path(tmp_path / "checkpoints.db", compact=True)
+    saver.serde.grace = 0
+    workflow = StateGraph(ChatState)
+    workflow.add_node("agent", lambda state: {"messages": [AIMessage(content="done " * 50)]})
+    workflow.add_edge(START, "agent")
+    workflow.add_edge("agent", END)
+    graph = workflow.compile(checkpointer=saver)
+    sessions = SessionManager(saver)
+
+    def run(thread_id: str) -> None:
+        task = HumanMessage(content=f"task for {thread_id} " * 50)
+        graph.invoke({"messages": [task]}, {"configurable": {"thread_id": thread_id}})
+        sessions.finish(thread_id)
+
+    def content_rows() -> int:
+        return saver.conn.execute("SELECT count(*) FROM checkpoint_content").fetchone()[0]
+
+    for i in range(3):
+        run(f"rssx_{i}")
+    before = content_rows()
+
+    assert sorted(sessions.prune(keep=1)) == ["rssx_0", "rssx_1"]
+    assert content_rows() < before
+
+    # Content shared with the surviving thread is kept and stored again when reused
+    config = {"configurable": {"thread_id": "rssx_2"}}
+    assert len(graph.get_state(config).values["messages"]) == 2
+    run("rssx_2")
+    assert len(graph.get_state(config).values["messages"]) == 4
+
+    sessions.prune(keep=0)
+    assert content_rows() == 0
+    saver.conn.close()
@@ -0,0 +1,109 @@
+"""Tests for speculative prefetch of the next agent's model call."""
+
+import pytest
+
+from src.agents import speculation
+from src.agents.speculation import Speculator
+from tests.conftest import FakeModel
+
+
+@pytest.fixture
+def speculator(monkeypatch) -> Speculator:
+    """Install an enabled speculator for the test."""
+    instance = Speculator(enabled=True)
+    monkeypatch.setattr(speculation, "_speculator", instance)
+    return instance
+
+
+def test_predicted_agent_call_is_reused(speculator, run_fake_task):
+    """Test a correctly predicted agent takes the prefetched response."""
+    models = {
+        "supervisor": FakeModel(responses=["architect", "end"]),
+        "architect": FakeModel(responses=["Found config.yaml"]),
+        "developer": FakeModel(responses=["Edited config.yaml"]),
+    }
+
+    events = run_fake_task(models)
+
+    assert [e.get("node") for e in events[1:-1]] == ["supervisor", "architect", "supervisor"]
+    assert events[2]["message"] == "Found config.yaml"
+    # The architect's call ran once, during routing; the developer call predicted
+    # after the architect was discarded when the supervisor ended the task
+    assert models["architect"].calls == 1
+    stats = speculator.stats()
+    assert (stats["started"], stats["hits"], stats["misses"]) == (2, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+class MetadataModel(FakeModel):
+    """FakeModel that keeps the run metadata of each call."""
+
+    metadata_seen: list[dict] = []
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.metadata_seen.append(dict(getattr(run_manager, "metadata", None) or {}))
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+
+def test_speculative_call_reports_predicted_node(speculator, run_fake_task):
+    """Test the prefetched call runs with the predicted node's callbacks and metadata."""
+    models = {
+        "supervisor": FakeModel(responses=["architect", "end"]),
+        "architect": MetadataModel(responses=["Found config.yaml"]),
+        "developer": FakeModel(responses=["Edited config.yaml"]),
+    }
+
+    run_fake_task(models)
+
+    [metadata] = models["architect"].metadata_seen
+    assert metadata["langgraph_node"] == "architect"
+    assert metadata["speculative"] is True
+    assert metadata["thread_id"].startswith("test_project")
+
+
+def test_mispredicted_call_is_discarded(speculator, run_fake_task):
+    """Test a mispredicted call is dropped and its tokens counted as wasted."""
+    models = {
+        "supervisor": FakeModel(responses=["tester", "end"], delay=0.05),
+        "architect": FakeModel(responses=["Investigated"]),
+        "tester": FakeModel(responses=["Tests pass"]),
+    }
+
+    events = run_fake_task(models)
+
+    assert events[2] == {"event": "node", "node": "tester", "message": "Tests pass"}
+    speculator._executor.shutdown(wait=True)
+    stats = speculator.stats()
+    assert (stats["hits"], stats["misses"]) == (0, 1)
+    assert stats["wasted_tokens"] == 15
+    assert models["tester"].calls == 1
+
+
+def test_disabled_by_default(monkeypatch, run_fake_task):
+    """Test no speculative calls are made unless enabled."""
+    monkeypatch.delenv("SPECULATIVE_ROUTING", raising=False)
+    monkeypatch.setattr(speculation, "_speculator", None)
+    models = {
+        "supervisor": FakeModel(responses=["end"]),
+        "architect": FakeModel(responses=["Investigated"]),
+    }
+
+    run_fake_task(models)
+
+    assert models["architect"].calls == 0
+    assert speculation.get_speculator().stats()["started"] == 0
+
+
+def test_predictions_learn_from_transitions():
+    """Test observed transitions replace the rules once there are enough samples."""
+    speculator = Speculator(enabled=True, min_samples=2)
+    assert speculator.predict("") == "architect"
+    assert speculator.predict("architect") == "developer"
+
+    for thread_id in ("a", "b"):
+        config = {"configurable": {"thread_id": thread_id}}
+        speculator.resolve(config, "architect")
+        speculator.resolve(config, "tester")
+
+    assert speculator.predict("architect") == "tester"
+    assert speculator.predict("") == "architect"
@@ -0,0 +1,163 @@
+"""Tests for per-task tracing."""
+
+import json
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.tools import tool
+
+from src.tracing import TraceRecorder, format_summary, summarize, to_otlp, write_trace
+from tests.conftest import FakeModel
+
+
+@tool
+def read_config(file_path: str) -> str:
+    """Read a config file."""
+    return "replicas: 3\n"
+
+
+def _span(kind: str, name: str, duration: float, **attributes) -> dict:
+    return {
+        "trace_id": "0" * 32,
+        "span_id": f"{len(name):016x}",
+        "parent_id": None,
+        "kind": kind,
+        "name": name,
+        "start": 1_700_000_000.0,
+        "duration_ms": duration,
+        "attributes": attributes,
+    }
+
+
+def test_task_trace_nests_nodes_and_model_calls(monkeypatch, tmp_path, run_fake_task):
+    """Test a traced task writes node and model spans under one task span."""
+    monkeypatch.setenv("TRACE", "1")
+    monkeypatch.setenv("TRACE_DIR", str(tmp_path / "traces"))
+    models = {
+        "supervisor": FakeModel(responses=["architect", "reviewer", "end"]),
+        "architect": FakeModel(responses=["Plan"]),
+        "reviewer": FakeModel(responses=["Looks good"]),
+        "tester": FakeModel(responses=["Tests pass"]),
+    }
+
+    events = run_fake_task(models, topology="parallel")
+
+    done = events[-1]
+    lines = (tmp_path / "traces").glob("*.jsonl")
+    spans = [json.loads(line) for line in next(lines).read_text().splitlines()]
+    assert done["trace_file"].endswith(".jsonl")
+
+    by_id = {span["span_id"]: span for span in spans}
+    assert len(by_id) == len(spans)
+    assert {span["trace_id"] for span in spans} == {spans[0]["trace_id"]}
+
+    [task] = [span for span in spans if span["kind"] == "task"]
+    nodes = [span for span in spans if span["kind"] == "node"]
+    calls = [span for span in spans if span["kind"] == "llm"]
+    assert all(node["parent_id"] == task["span_id"] for node in nodes)
+    # Each model call belongs to the node of the same agent
+    assert all(by_id[call["parent_id"]]["name"] == call["name"] for call in calls)
+    assert sorted(call["name"] for call in calls) == [
+        "architect",
+        "reviewer",
+        "supervisor",
+        "supervisor",
+        "supervisor",
+        "tester",
+    ]
+    assert calls[0]["attributes"]["input_tokens"] == 10
+
+    rows = {(row["kind"], row["name"]): row for row in done["trace"]}
+    assert rows[("node", "supervisor")]["count"] == 3
+    assert rows[("llm", "supervisor")]["output_tokens"] == 15
+
+
+def test_untraced_by_default(monkeypatch, tmp_path, run_fake_task):
+    """Test tasks record no spans unless tracing is on."""
+    monkeypatch.delenv("TRACE", raising=False)
+    monkeypatch.setenv("TRACE_DIR", str(tmp_path / "traces"))
+
+    events = run_fake_task({"supervisor": FakeModel(responses=["end"])})
+
+    assert "trace" not in events[-1]
+    assert not (tmp_path / "traces").exists()
+
+
+def test_tool_spans_record_bytes():
+    """Test tool calls are timed with their input and output sizes."""
+    recorder = TraceRecorder()
+
+    read_config.invoke({"file_path": "app.yaml"}, config={"callbacks": [recorder]})
+
+    [span] = recorder.spans()
+    assert (span["kind"], span["name"]) == ("tool", "read_config")
+    assert span["attributes"]["bytes_out"] == len("replicas: 3\n")
+    assert span["attributes"]["bytes_in"] > 0
+
+
+def test_streamed_model_call_records_ttft():
+    """Test time to first token is recorded for streamed calls."""
+    recorder = TraceRecorder()
+    model = FakeListChatModel(responses=["streamed answer"])
+
+    chunks = list(model.stream("hi", config={"callbacks": [recorder]}))
+
+    [span] = recorder.spans()
+    assert len(chunks) > 1
+    assert 0 <= span["attributes"]["ttft_ms"] <= span["duration_ms"]
+
+
+def test_summarize_and_format():
+    """Test spans aggregate per kind and name, slowest first."""
+    spans = [
+        _span("llm", "developer", 30.0, input_tokens=100, output_tokens=10),
+        _span("node", "developer", 40.0),
+        _span("llm", "developer", 50.0, input_tokens=200, cache_read_tokens=150),
+        _span("llm", "supervisor", 90.0, input_tokens=5),
+    ]
+    spans[0]["error"] = "TimeoutError: slow"
+
+    rows = summarize(spans)
+
+    assert [(row["kind"], row["name"]) for row in rows] == [
+        ("node", "developer"),
+        ("llm", "supervisor"),
+        ("llm", "developer"),
+    ]
+    developer = rows[2]
+    assert (developer["count"], developer["total_ms"], developer["mean_ms"]) == (2, 80.0, 40.0)
+    assert (developer["input_tokens"], developer["cache_read_tokens"]) == (300, 150)
+    assert developer["errors"] == 1
+
+    table = format_summary(rows)
+    assert table.splitlines()[0].startswith("kind  name")
+    assert "(1 failed)" in table.splitlines()[-1]
+
+
+def test_otlp_export(tmp_path):
+    """Test spans convert to OTLP/JSON with parents, times and error status."""
+    parent = _span("node", "tester", 10.0)
+    child = _span("llm", "tester-call", 5.0, input_tokens=7, model="sonnet")
+    child["parent_id"] = parent["span_id"]
+    child["error"] = "NodeTimeout: deadline"
+
+    path = write_trace([parent, child], "thread/1", trace_dir=tmp_path, fmt="otlp")
+
+    assert path.name.endswith("-thread_1.otlp.json")
+    exported = json.loads(path.read_text())
+    [node, call] = exported["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert "parentSpanId" not in node and call["parentSpanId"] == node["spanId"]
+    assert int(call["endTimeUnixNano"]) - int(call["startTimeUnixNano"]) == 5_000_000
+    assert {"key": "input_tokens", "value": {"intValue": "7"}} in call["attributes"]
+    assert call["status"] == {"code": 2, "message": "NodeTimeout: deadline"}
+    assert to_otlp([parent])["resourceSpans"][0]["scopeSpans"][0]["spans"][0]["status"] == {
+        "code": 1
+    }
+
+
+def test_unknown_trace_format(monkeypatch, tmp_path):
+    """Test an unknown TRACE_FORMAT is rejected."""
+    monkeypatch.setenv("TRACE_FORMAT", "xml")
+
+    with pytest.raises(ValueError, match="Unknown TRACE_FORMAT"):
+        write_trace([], "thread", trace_dir=tmp_path)
@@ -0,0 +1,83 @@
+"""Tests for project hot reload."""
+
+from src.agents.prompt_cache import PromptCache
+from src.config.projects import ProjectRegistry
+from src.config.watcher import ProjectWatcher
+
+
+def _edit_description(project_dir, description):
+    config_file = project_dir / "config.yaml"
+    text = config_file.read_text()
+    current = next(line for line in text.splitlines() if line.startswith("description:"))
+    config_file.write_text(text.replace(current, f"description: {description}"))
+
+
+def test_poll_reloads_only_changed_project(temp_project_dir):
+    """Test a config edit reloads that project and notifies listeners."""
+    registry = ProjectRegistry(temp_project_dir, use_cache=False)
+    old_ref = registry.context_ref("test_project")
+    reloaded = []
+    registry.add_reload_listener(reloaded.append)
+
+    watcher = ProjectWatcher(registry)
+    watcher._fingerprints = watcher._scan()
+    assert watcher.poll() == set()
+
+    _edit_description(temp_project_dir / "test_project", "Changed description!")
+
+    assert watcher.poll() == {"test_project"}
+    assert reloaded == ["test_project"]
+    assert registry.get("test_project")["description"] == "Changed description!"
+    # In-flight runs keep their original context
+    assert registry.context_ref("test_project") != old_ref
+    assert registry.contexts.get(old_ref)["info"]["description"] == "Test project"
+
+
+def test_poll_picks_up_new_and_removed_projects(temp_project_dir):
+    """Test projects added or deleted while running are reflected."""
+    registry = ProjectRegistry(temp_project_dir, use_cache=False)
+    watcher = ProjectWatcher(registry)
+    watcher._fingerprints = watcher._scan()
+
+    new_dir = temp_project_dir / "other"
+    new_dir.mkdir()
+    config = (temp_project_dir / "test_project" / "config.yaml").read_text()
+    (new_dir / "config.yaml").write_text(config.replace("name: test_project", "name: other"))
+
+    watcher.poll()
+    assert registry.get("other")["name"] == "other"
+
+    (new_dir / "config.yaml").unlink()
+    watcher.poll()
+    assert "other" not in registry.list_names()
+
+
+def test_broken_edit_reported_then_recovered(temp_project_dir):
+    """Test an invalid edit is reported while the last good config keeps serving."""
+    registry = ProjectRegistry(temp_project_dir, use_cache=False)
+    config_file = temp_project_dir / "test_project" / "config.yaml"
+    good = config_file.read_text()
+    loaded = registry.get("test_project")
+
+    config_file.write_text("name: [unterminated")
+    registry.reload_project("test_project")
+    assert "test_project" in registry.errors()
+    assert registry.get("test_project") is loaded
+    assert registry.list() == [loaded]
+
+    config_file.write_text(good)
+    registry.reload_project("test_project")
+    assert registry.errors() == {}
+    assert registry.get("test_project")["name"] == "test_project"
+
+
+def test_prompt_cache_invalidated_per_project():
+    """Test prompt invalidation only drops the reloaded project's prompts."""
+    cache = PromptCache()
+    cache.get_or_build("developer", "rssx@aaa", lambda: "rssx prompt")
+    cache.get_or_build("developer", "enx@bbb", lambda: "enx prompt")
+
+    cache.invalidate_project("rssx")
+
+    assert len(cache) == 1
+    assert cache.get_or_build("developer", "enx@bbb", lambda: "rebuilt") == "enx prompt"